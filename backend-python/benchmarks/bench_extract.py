@@ -0,0 +1,91 @@
+"""
+Micro-benchmark - per-profile parse cost of profile_extract vs the old multi-scan extractor
+
+Usage (from backend-python/):
+    python benchmarks/bench_extract.py [--repeat 50] [--pad-kb 1500]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profile_extract import extract_profile, parse_count  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Filler resembling the bulk of a real profile page: inlined JS bundles and preloaded JSON
+_FILLER = (
+    '<script type="text/javascript">__d("PolarisApp",["React","ReactDOM","PolarisRouter"],'
+    'function(a,b,c,d,e,f){"use strict";var g={route:"/",params:{},data:[1,2,3,4,5,6,7,8]};'
+    'f.exports=function(){return b.createElement("div",{className:"x1n2onr6 x1vjfegm"},g)}},1);</script>\n'
+)
+
+
+def legacy_extract(page_source: str) -> dict:
+    """The pre-profile_extract followers logic: up to three uncompiled scans of the page"""
+    profile = {'followers': 0}
+    for match_str in re.findall(r'<script type="application/ld\+json">({.*?})</script>', page_source, re.DOTALL):
+        try:
+            data = json.loads(match_str)
+            for stat in data.get('interactionStatistic', []):
+                if stat.get('@type') == 'InteractionCounter' and 'FollowAction' in stat.get('interactionType', ''):
+                    profile['followers'] = int(stat.get('userInteractionCount', 0))
+                    break
+        except Exception:
+            continue
+    if profile['followers'] == 0:
+        match = re.search(r'content="([\d,\.KMB]+)\s+Followers', page_source)
+        if match:
+            profile['followers'] = parse_count(match.group(1))
+    if profile['followers'] == 0:
+        match = re.search(r'"edge_followed_by":\s*\{\s*"count":\s*(\d+)', page_source)
+        if match:
+            profile['followers'] = int(match.group(1))
+    return profile
+
+
+def load_fixture(name: str, pad_kb: int) -> str:
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        html = f.read()
+    if pad_kb:
+        filler = _FILLER * max(1, (pad_kb * 1024) // len(_FILLER))
+        html = html.replace('</body>', filler + '</body>')
+    return html
+
+
+def bench(fn, html: str, repeat: int) -> float:
+    """Best-of-3 mean milliseconds per call"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(html)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--pad-kb', type=int, default=1500, help='filler added to each fixture to mimic real page size')
+    args = parser.parse_args()
+
+    print(f"{'fixture':<26}{'size':>9}{'legacy ms':>11}{'single ms':>11}{'speedup':>9}  fields")
+    for name in sorted(os.listdir(FIXTURES)):
+        if not name.endswith('.html'):
+            continue
+        html = load_fixture(name, args.pad_kb)
+        legacy_ms = bench(legacy_extract, html, args.repeat)
+        single_ms = bench(extract_profile, html, args.repeat)
+        fields = extract_profile(html)
+        print(f"{name:<26}{len(html) // 1024:>7}KB{legacy_ms:>11.3f}{single_ms:>11.3f}"
+              f"{legacy_ms / single_ms if single_ms else 0:>8.1f}x  {len(fields)}: {', '.join(sorted(fields))}")
+
+
+if __name__ == '__main__':
+    main()
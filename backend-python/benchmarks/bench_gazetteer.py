@@ -0,0 +1,70 @@
+"""
+Micro-benchmark - gazetteer compile time and country classification throughput
+
+Usage (from backend-python/):
+    python benchmarks/bench_gazetteer.py [--count 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gazetteer import Gazetteer  # noqa: E402
+
+# Bio-like strings: real locations mixed with text that must not match ("business", "la vida")
+_SAMPLES = (
+    '📍 Los Angeles, CA | small business owner',
+    'Account based in United Kingdom',
+    'coffee ☕ travel ✈️ based in São Paulo',
+    'Chef 👨‍🍳 Amman, Jordan',
+    'la vida loca | us against the world',
+    'Toronto 🇨🇦 → NYC',
+    'mom of 3, fitness & wellness coach',
+    'Lagos | Accra | London',
+    'Dubai based content creator',
+    'Kuala Lumpur 🇲🇾 food blogger',
+    'Melbourne FL',
+    'Perth, WA',
+)
+# Country filter values as people type them
+_FILTERS = ('uk', 'UK', 'usa', 'United States', 'jordan', 'Brasil')
+_FILLER = ' lorem ipsum dolor sit amet, consectetur adipiscing elit'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    gazetteer = Gazetteer()
+    print(f"compile: {(time.perf_counter() - start) * 1000:.1f} ms, {len(gazetteer._goto)} automaton states")
+
+    rng = random.Random(0)
+    texts = [rng.choice(_SAMPLES) + _FILLER * rng.randint(0, 3) for _ in range(args.count)]
+
+    start = time.perf_counter()
+    single = [gazetteer.normalize(t) for t in texts]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = gazetteer.classify(texts)
+    batch_s = time.perf_counter() - start
+
+    assert single == batch
+    matched = sum(1 for code in batch if code)
+    print(f"normalize x{args.count}: {single_s * 1000:.1f} ms ({single_s / args.count * 1e6:.1f} us each)")
+    print(f"classify batch of {args.count}: {batch_s * 1000:.1f} ms, {matched} located")
+    for sample in _SAMPLES:
+        print(f"  {gazetteer.normalize(sample) or '--':<4}{sample}")
+    print("filter values:")
+    for value in _FILTERS:
+        print(f"  {gazetteer.resolve(value) or '--':<4}{value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Benchmark - End-to-end search_tags against the local stand-in site, timed per phase
+
+Runs a real (headless) Chrome through InstagramScraper pointed at
+benchmarks/standin.py, so no Instagram account or network is involved.
+Reports wall time per phase (browser start, login, tag load, username read,
+next post, profile analysis, basic fields, country, engagement) and profiles per minute.
+Results can be saved as a named baseline and later runs compared against it.
+--browsing both runs normal and lean browsing back to back and reports the
+bytes and page-load time lean mode saves per profile.
+
+Usage (from backend-python/):
+    python benchmarks/bench_search.py [--tags fitness,travel] [--max-profiles 10] [--mode harvest] [--runs 3]
+    python benchmarks/bench_search.py --save before
+    python benchmarks/bench_search.py --compare before [--tolerance 0.15]
+    python benchmarks/bench_search.py --browsing both
+"""
+
+import argparse
+import json
+import os
+import pickle
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin import StandIn, serve  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+# Phases in the order a search goes through them
+PHASES = ('browser_start', 'login', 'tag_load', 'username_read', 'next_post', 'profile_analysis', 'profile_open',
+          'basic', 'country', 'engagement')
+# Changes smaller than this (seconds) are noise, whatever the percentage
+NOISE_FLOOR = 0.005
+
+
+def run_once(args, base_url: str, cookies_file: str, site: StandIn, lean: bool) -> Dict:
+    from instagram_scraper import InstagramScraper
+
+    scraper = InstagramScraper(headless=not args.headed, http_extract=args.http, crawl_mode=args.mode,
+                               base_url=base_url, cookies_file=cookies_file, lean=lean)
+    served = dict(site.stats['bytes'])
+    filters = {'min_followers': args.min_followers, 'max_followers': args.max_followers,
+               'gender': 'both', 'country': args.country, 'min_engagement': 0}
+    try:
+        if not scraper.start_browser():
+            raise SystemExit("[ERROR] Chrome did not start (is chromedriver available?)")
+        if not scraper.login():
+            raise SystemExit(f"[ERROR] Login against the stand-in at {base_url} failed")
+        found, errors = 0, []
+        started = time.perf_counter()
+        for event in scraper.search_tags(args.tags.split(','), filters, args.max_profiles):
+            if event['type'] == 'profile':
+                found += 1
+            elif event['type'] == 'error':
+                errors.append(event['data'])
+        seconds = time.perf_counter() - started
+    finally:
+        scraper.close()
+    return {'search_seconds': seconds, 'profiles': found, 'errors': errors,
+            'phases': {phase: dict(s) for phase, s in scraper.phase_stats.items()},
+            'pages': dict(scraper.page_stats),
+            'served_bytes': sum(site.stats['bytes'].values()) - sum(served.values())}
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    """Median search time and throughput over runs; phase means pooled over every sample"""
+    seconds = statistics.median(r['search_seconds'] for r in runs)
+    profiles = statistics.median(r['profiles'] for r in runs)
+    phases = {}
+    for phase in sorted({p for r in runs for p in r['phases']}, key=lambda p: (PHASES + (p,)).index(p)):
+        samples = [r['phases'][phase] for r in runs if phase in r['phases']]
+        count = sum(s['count'] for s in samples)
+        total = sum(s['total'] for s in samples)
+        phases[phase] = {'count': count / len(runs), 'total': total / len(runs),
+                         'mean': total / count if count else 0, 'max': max(s['max'] for s in samples)}
+    pages = sum(r['pages']['pages'] for r in runs)
+    checked = sum(r['phases'].get('profile_analysis', {}).get('count', 0) for r in runs)
+    return {
+        'runs': len(runs),
+        # Resource Timing transfer per opened profile page, as the browser saw it
+        'page_kb': sum(r['pages']['bytes'] for r in runs) / pages / 1024 if pages else 0,
+        'dom_ready_ms': sum(r['pages']['dom_ready_ms'] for r in runs) / pages if pages else 0,
+        # Everything the stand-in served during the search, per profile checked
+        'served_kb_per_profile': sum(r['served_bytes'] for r in runs) / checked / 1024 if checked else 0,
+        'search_seconds': seconds,
+        'profiles': profiles,
+        'profiles_per_minute': profiles / seconds * 60 if seconds else 0,
+        'errors': sum(len(r['errors']) for r in runs),
+        'phases': phases,
+    }
+
+
+def report(summary: Dict):
+    print(f"\n{'phase':<18}{'count':>8}{'total s':>10}{'mean ms':>10}{'max ms':>10}{'share':>8}")
+    for phase, s in summary['phases'].items():
+        # Share of search time; browser start and login happen before the search
+        share = '' if phase in ('browser_start', 'login') else f"{s['total'] / summary['search_seconds']:.0%}"
+        print(f"{phase:<18}{s['count']:>8.1f}{s['total']:>10.2f}{s['mean'] * 1000:>10.1f}{s['max'] * 1000:>10.1f}{share:>8}")
+    print(f"\nsearch: {summary['search_seconds']:.1f}s for {summary['profiles']:.0f} profiles "
+          f"-> {summary['profiles_per_minute']:.1f} profiles/min (median of {summary['runs']} run(s)), "
+          f"{summary['errors']} error event(s)")
+    print(f"profile pages: {summary['page_kb']:.0f} KB each, DOM ready after {summary['dom_ready_ms']:.0f} ms; "
+          f"stand-in served {summary['served_kb_per_profile']:.0f} KB per profile checked")
+
+
+def traffic(site: StandIn):
+    counts = ', '.join(f"{kind} {n} ({site.stats['bytes'][kind] / 1024:.0f} KB)"
+                       for kind, n in sorted(site.stats['requests'].items()))
+    print(f"stand-in traffic (all runs): {counts}")
+
+
+def compare_browsing(normal: Dict, lean: Dict):
+    """What lean browsing saves per profile against normal browsing"""
+    open_ms = lambda s: s['phases'].get('profile_open', {}).get('mean', 0) * 1000
+    rows = [('page KB (Resource Timing)', normal['page_kb'], lean['page_kb']),
+            ('served KB per profile', normal['served_kb_per_profile'], lean['served_kb_per_profile']),
+            ('profile_open ms', open_ms(normal), open_ms(lean)),
+            ('DOM ready ms', normal['dom_ready_ms'], lean['dom_ready_ms']),
+            ('profiles/min', normal['profiles_per_minute'], lean['profiles_per_minute'])]
+    print(f"\n{'per profile':<28}{'normal':>10}{'lean':>10}{'saved':>10}")
+    for name, old, new in rows:
+        # Fewer bytes / ms is a saving; for throughput, more is
+        delta = (new - old) if name == 'profiles/min' else (old - new)
+        saved = delta / old if old else 0
+        print(f"{name:<28}{old:>10.1f}{new:>10.1f}{saved:>+10.0%}")
+
+
+def compare(summary: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Print current vs baseline; returns the metrics that regressed by more than `tolerance`"""
+    base = baseline['summary']
+    rows = [('profiles_per_minute', base['profiles_per_minute'], summary['profiles_per_minute'], True),
+            ('search_seconds', base['search_seconds'], summary['search_seconds'], False)]
+    for phase, s in summary['phases'].items():
+        if phase in base['phases']:
+            rows.append((f'{phase} mean', base['phases'][phase]['mean'], s['mean'], False))
+
+    regressions = []
+    print(f"\n{'metric':<24}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, old, new, higher_is_better in rows:
+        change = (new - old) / old if old else 0
+        worse = -change if higher_is_better else change
+        flag = ''
+        if worse > tolerance and (higher_is_better or new - old > NOISE_FLOOR):
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif worse < -tolerance:
+            flag = '  faster'
+        print(f"{name:<24}{old:>12.3f}{new:>12.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tags', default='fitness,travel')
+    parser.add_argument('--max-profiles', type=int, default=10)
+    parser.add_argument('--min-followers', type=int, default=1000)
+    parser.add_argument('--max-followers', type=int, default=1000000)
+    parser.add_argument('--country', default='')
+    parser.add_argument('--mode', choices=('harvest', 'modal'), default='harvest')
+    parser.add_argument('--http', action='store_true', help='HTTP profile extraction (HTTP_EXTRACT=true)')
+    parser.add_argument('--browsing', choices=('lean', 'normal', 'both'), default='lean',
+                        help='LEAN_BROWSING on, off, or both compared (--save/--compare then use the lean run)')
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--latency-ms', type=float, default=30, help='delay the stand-in adds to every request')
+    parser.add_argument('--pace', type=float, default=0, help='DELAY_MIN/MAX_SECONDS for the run')
+    parser.add_argument('--posts-per-tag', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--headed', action='store_true', help='show the browser')
+    parser.add_argument('--save', metavar='NAME', help='store the result as benchmarks/baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='compare against a saved baseline; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown before flagging (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    os.environ['DELAY_MIN_SECONDS'] = os.environ['DELAY_MAX_SECONDS'] = str(args.pace)
+    site = StandIn(posts_per_tag=args.posts_per_tag, latency=args.latency_ms / 1000, seed=args.seed)
+    httpd, base_url = serve(site)
+    cookies = tempfile.NamedTemporaryFile(suffix='.pkl', delete=False)
+    pickle.dump([], cookies)
+    cookies.close()
+    modes = ('normal', 'lean') if args.browsing == 'both' else (args.browsing,)
+    config = {k: v for k, v in vars(args).items() if k not in ('save', 'compare', 'tolerance', 'headed', 'runs')}
+    # Baselines describe the run they were saved from
+    config['browsing'] = modes[-1]
+    print(f"[INFO] Stand-in at {base_url}; config {json.dumps(config)}")
+
+    summaries = {}
+    try:
+        for mode in modes:
+            runs = []
+            for i in range(args.runs):
+                runs.append(run_once(args, base_url, cookies.name, site, lean=mode == 'lean'))
+                print(f"[INFO] {mode} run {i + 1}/{args.runs}: {runs[-1]['profiles']} profiles "
+                      f"in {runs[-1]['search_seconds']:.1f}s")
+            summaries[mode] = summarize(runs)
+    finally:
+        httpd.shutdown()
+        os.remove(cookies.name)
+
+    summary = summaries[modes[-1]]
+    for mode in modes:
+        if len(modes) > 1:
+            print(f"\n== {mode} browsing")
+        report(summaries[mode])
+    traffic(site)
+    if len(modes) > 1:
+        compare_browsing(summaries['normal'], summaries['lean'])
+
+    if args.save:
+        os.makedirs(BASELINES, exist_ok=True)
+        path = os.path.join(BASELINES, f'{args.save}.json')
+        with open(path, 'w') as f:
+            json.dump({'config': config, 'summary': summary, 'saved': time.time()}, f, indent=2)
+        print(f"\n[INFO] Baseline saved to {path}")
+
+    if args.compare:
+        with open(os.path.join(BASELINES, f'{args.compare}.json')) as f:
+            baseline = json.load(f)
+        if baseline['config'] != config:
+            print(f"[WARN] Baseline was recorded with a different config: {json.dumps(baseline['config'])}")
+        regressions = compare(summary, baseline, args.tolerance)
+        if regressions:
+            print(f"\n[ERROR] {len(regressions)} metric(s) regressed more than {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\n[INFO] No regressions beyond {args.tolerance:.0%} against '{args.compare}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Micro-benchmark - seen filter memory, false-positive rate and lookup throughput
+
+Usage (from backend-python/):
+    python benchmarks/bench_seen_filter.py [--count 1000000] [--error-rate 0.001]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from seen_filter import SeenFilter  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    parser.add_argument('--capacity', type=int, default=100000)
+    args = parser.parse_args()
+
+    seen = SeenFilter(error_rate=args.error_rate, capacity=args.capacity)
+    scope = '{"min_followers": 1000.0}'
+
+    start = time.perf_counter()
+    for i in range(args.count):
+        seen.add(scope, f'user_{i}')
+    added = time.perf_counter() - start
+
+    probes = min(args.count, 200000)
+    start = time.perf_counter()
+    false_positives = sum(seen.seen(scope, f'other_{i}') for i in range(probes))
+    looked_up = time.perf_counter() - start
+    missed = sum(not seen.seen(scope, f'user_{i}') for i in range(0, args.count, max(1, args.count // 10000)))
+
+    stats = seen.stats()
+    print(f"items:           {stats['items']:,} in {stats['slices']} slice(s)")
+    print(f"memory:          {stats['bytes'] / 1e6:.2f} MB ({stats['bytes'] * 8 / max(1, stats['items']):.1f} bits/item)")
+    print(f"false positives: {false_positives / probes:.4%} (target {args.error_rate:.4%})")
+    print(f"false negatives: {missed}")
+    print(f"add:             {added / args.count * 1e6:.1f} us/item")
+    print(f"lookup:          {looked_up / probes * 1e6:.1f} us/item")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+"""
+Load Test - Concurrent /api/stream clients against server.py backed by the stand-in site
+
+Starts benchmarks/standin.py in-process and server.py as a child process
+pointed at it (or targets a running server with --url), then ramps the
+number of simultaneous SSE searches. For each level it records per-client
+time to first event, events/sec and failures, and samples the server's
+RSS (including its Chrome / chromedriver children), CPU and thread count.
+Ends with a capacity report for instance sizing.
+
+Usage (from backend-python/):
+    python benchmarks/load_sse.py [--levels 1,2,4,8] [--max-profiles 5] [--report load.json]
+    python benchmarks/load_sse.py --env DRIVER_POOL_SIZE=4 --env ANALYSIS_WORKERS=1
+    python benchmarks/load_sse.py --url http://localhost:5000 --pid <server pid>
+"""
+
+import argparse
+import json
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin import StandIn, serve  # noqa: E402
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def _proc_tree(pid: int) -> List[int]:
+    """`pid` and all its descendants, from /proc"""
+    parents: Dict[int, List[int]] = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(name))
+    tree, todo = [], [pid]
+    while todo:
+        p = todo.pop()
+        tree.append(p)
+        todo.extend(parents.get(p, []))
+    return tree
+
+
+def _proc_sample(pid: int) -> Optional[Dict]:
+    """rss (bytes), threads, cpu ticks and name of one process, from /proc"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            status = dict(line.split(':', 1) for line in f if ':' in line)
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    return {
+        'rss': int(status.get('VmRSS', '0 kB').split()[0]) * 1024,
+        'threads': int(status.get('Threads', '0')),
+        'cpu': (int(fields[11]) + int(fields[12])) / _CLK_TCK,
+        'name': status.get('Name', '').strip(),
+    }
+
+
+def sample_tree(pid: int) -> Optional[Dict]:
+    """Totals for the server process and its children (psutil when installed, /proc otherwise)"""
+    procs = []
+    if psutil:
+        try:
+            root = psutil.Process(pid)
+            for p in [root] + root.children(recursive=True):
+                try:
+                    times = p.cpu_times()
+                    procs.append({'pid': p.pid, 'rss': p.memory_info().rss, 'threads': p.num_threads(),
+                                  'cpu': times.user + times.system, 'name': p.name()})
+                except psutil.Error:
+                    continue
+        except psutil.Error:
+            return None
+    else:
+        for p in _proc_tree(pid):
+            sample = _proc_sample(p)
+            if sample:
+                procs.append({'pid': p, **sample})
+    if not procs or procs[0]['pid'] != pid:
+        return None
+    return {
+        'rss': sum(p['rss'] for p in procs),
+        'server_rss': procs[0]['rss'],
+        'threads': procs[0]['threads'],
+        'processes': len(procs),
+        'chrome': sum(1 for p in procs if 'chrom' in p['name'].lower()),
+        'cpu': sum(p['cpu'] for p in procs),
+    }
+
+
+class Sampler:
+    """Samples the server's process tree every `interval` seconds on a background thread"""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampler', daemon=True)
+
+    def start(self):
+        if self.pid:
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def sample(self):
+        sample = sample_tree(self.pid) if self.pid else None
+        if sample:
+            sample['at'] = time.time()
+            self.samples.append(sample)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def window(self, start: float, end: float) -> Dict:
+        """Peaks between `start` and `end`, plus average CPU (cores busy) over the window"""
+        samples = [s for s in self.samples if start <= s['at'] <= end]
+        if not samples:
+            return {}
+        span = samples[-1]['at'] - samples[0]['at']
+        return {
+            'peak_rss_mb': max(s['rss'] for s in samples) / 2 ** 20,
+            'peak_server_rss_mb': max(s['server_rss'] for s in samples) / 2 ** 20,
+            'peak_threads': max(s['threads'] for s in samples),
+            'peak_chrome': max(s['chrome'] for s in samples),
+            'peak_processes': max(s['processes'] for s in samples),
+            'cpu_cores': (samples[-1]['cpu'] - samples[0]['cpu']) / span if span > 0 else 0,
+        }
+
+
+def client(url: str, params: Dict, timeout: float) -> Dict:
+    """One EventSource-like client: reads the stream until 'complete', an HTTP failure or `timeout`"""
+    result = {'ok': False, 'ttfe': None, 'events': 0, 'profiles': 0, 'errors': 0, 'seconds': 0.0, 'error': None}
+    started = time.perf_counter()
+    first = None
+    try:
+        with requests.get(f'{url}/api/stream', params=params, stream=True, timeout=(10, 60)) as resp:
+            if resp.status_code != 200:
+                result['error'] = f'HTTP {resp.status_code}'
+                return result
+            for line in resp.iter_lines(decode_unicode=True):
+                now = time.perf_counter()
+                if now - started > timeout:
+                    result['error'] = 'timeout'
+                    break
+                if not line or not line.startswith('data:'):
+                    continue
+                if first is None:
+                    first = now
+                    result['ttfe'] = now - started
+                result['events'] += 1
+                event = json.loads(line[5:])
+                if event.get('type') == 'profile':
+                    result['profiles'] += 1
+                elif event.get('type') == 'error':
+                    result['errors'] += 1
+                    result['last_error'] = str(event.get('data'))[:80]
+                elif event.get('type') == 'complete':
+                    result['ok'] = True
+                    break
+            else:
+                result['error'] = result['error'] or result.get('last_error') or 'stream ended without complete'
+    except (requests.RequestException, ValueError) as e:
+        result['error'] = type(e).__name__
+    end = time.perf_counter()
+    result['seconds'] = end - started
+    if first is not None and end > first:
+        result['events_per_sec'] = result['events'] / (end - first)
+    return result
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def run_level(n: int, args, url: str, sampler: Sampler) -> Dict:
+    """n simultaneous searches (started over --stagger seconds); waits for all of them"""
+    def one(i: int) -> Dict:
+        time.sleep(args.stagger * i / max(1, n))
+        tags = args.tags if args.shared else ','.join(f'{t}{n}x{i}' for t in args.tags.split(','))
+        return client(url, {'tags': tags, 'max_profiles': args.max_profiles,
+                            'min_followers': args.min_followers, 'max_followers': 1000000000}, args.timeout)
+
+    start = time.time()
+    sampler.sample()
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        results = list(pool.map(one, range(n)))
+    sampler.sample()
+    end = time.time()
+    ttfe = [r['ttfe'] for r in results if r['ttfe'] is not None]
+    rates = [r['events_per_sec'] for r in results if r.get('events_per_sec')]
+    failures = [r['error'] for r in results if not r['ok']]
+    return {
+        'clients': n,
+        'wall_seconds': end - start,
+        'failures': len(failures),
+        'failure_rate': len(failures) / n,
+        'failure_reasons': sorted(set(failures)),
+        'ttfe_p50': percentile(ttfe, 0.5),
+        'ttfe_p95': percentile(ttfe, 0.95),
+        'ttfe_max': max(ttfe) if ttfe else None,
+        'events_per_sec': sum(rates) / len(rates) if rates else 0,
+        'search_p50': percentile([r['seconds'] for r in results if r['ok']], 0.5),
+        'profiles': sum(r['profiles'] for r in results),
+        **sampler.window(start, end),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(args, base_url: str, cookies_file: str, log) -> subprocess.Popen:
+    """server.py in a child process, against the stand-in, with state that would skew repeat runs turned off"""
+    env = dict(os.environ,
+               PORT=str(args.port), INSTAGRAM_BASE_URL=base_url, COOKIES_FILE=cookies_file, HEADLESS='true',
+               DELAY_MIN_SECONDS='0', DELAY_MAX_SECONDS='0', FAST_BOOT='true', DRIVER_POOL_SIZE='0',
+               PROFILE_CACHE_PATH='', SEEN_FILTER_PATH='', JOURNAL_DIR='', CHECKPOINT_DIR='')
+    for item in args.env:
+        key, _, value = item.partition('=')
+        env[key] = value
+    return subprocess.Popen([sys.executable, 'server.py'], cwd=BACKEND, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_healthy(url: str, timeout: float = 60) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f'{url}/api/health', timeout=2).ok:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def fmt(value, spec: str = '.1f', missing: str = '-') -> str:
+    return missing if value is None else format(value, spec)
+
+
+def capacity(levels: List[Dict], max_failure: float, ttfe_slo: float) -> Dict:
+    """Highest healthy level and a linear memory model (base + per search) fitted over all levels"""
+    healthy = [l for l in levels if l['failure_rate'] <= max_failure
+               and l['ttfe_p95'] is not None and l['ttfe_p95'] <= ttfe_slo]
+    report = {'sustained_clients': max((l['clients'] for l in healthy), default=0)}
+    points = [(l['clients'], l['peak_rss_mb']) for l in levels if l.get('peak_rss_mb')]
+    if len(points) >= 2:
+        n = len(points)
+        mx = sum(x for x, _ in points) / n
+        my = sum(y for _, y in points) / n
+        var = sum((x - mx) ** 2 for x, _ in points)
+        slope = sum((x - mx) * (y - my) for x, y in points) / var if var else 0
+        report['rss_per_search_mb'] = slope
+        report['rss_base_mb'] = my - slope * mx
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--levels', default='1,2,4,8', help='concurrent clients per step of the ramp')
+    parser.add_argument('--tags', default='fitness')
+    parser.add_argument('--shared', action='store_true', help='every client runs the same search (exercises coalescing)')
+    parser.add_argument('--max-profiles', type=int, default=5)
+    parser.add_argument('--min-followers', type=int, default=1000)
+    parser.add_argument('--timeout', type=float, default=600, help='seconds before a client gives up')
+    parser.add_argument('--stagger', type=float, default=1.0, help='seconds over which a level\'s clients connect')
+    parser.add_argument('--cooldown', type=float, default=5, help='seconds between levels')
+    parser.add_argument('--latency-ms', type=float, default=30)
+    parser.add_argument('--url', help='test a running server instead of starting one')
+    parser.add_argument('--pid', type=int, help='process to sample with --url')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help='extra server settings')
+    parser.add_argument('--max-failure', type=float, default=0.05, help='failure rate a level may have and still count')
+    parser.add_argument('--ttfe-slo', type=float, default=30, help='p95 seconds to first event a level must meet')
+    parser.add_argument('--report', help='write the full results as JSON')
+    args = parser.parse_args()
+
+    httpd = server = cookies = None
+    url, pid = args.url, args.pid
+    if not url:
+        site = StandIn(latency=args.latency_ms / 1000)
+        httpd, base_url = serve(site)
+        cookies = tempfile.NamedTemporaryFile(suffix='.pkl', delete=False)
+        pickle.dump([], cookies)
+        cookies.close()
+        args.port = args.port or free_port()
+        log = tempfile.NamedTemporaryFile(prefix='load_server_', suffix='.log', delete=False)
+        server = spawn_server(args, base_url, cookies.name, log)
+        url, pid = f'http://127.0.0.1:{args.port}', server.pid
+        print(f"[INFO] Stand-in at {base_url}, server pid {pid} at {url} (log: {log.name})")
+        if not wait_healthy(url):
+            server.kill()
+            raise SystemExit("[ERROR] Server did not become healthy")
+
+    sampler = Sampler(pid)
+    sampler.start()
+    idle = sample_tree(pid) if pid else None
+    levels = []
+    try:
+        for n in [int(x) for x in args.levels.split(',')]:
+            print(f"[INFO] {n} concurrent client(s)...")
+            level = run_level(n, args, url, sampler)
+            levels.append(level)
+            print(f"  ttfe p50 {fmt(level['ttfe_p50'])}s p95 {fmt(level['ttfe_p95'])}s, "
+                  f"{level['events_per_sec']:.1f} events/s per client, {level['failures']}/{n} failed, "
+                  f"peak rss {fmt(level.get('peak_rss_mb'), '.0f')} MB")
+            if level['failure_rate'] > 0.5:
+                print(f"[WARN] Most clients failed ({', '.join(level['failure_reasons'])}); stopping the ramp")
+                break
+            time.sleep(args.cooldown)
+    finally:
+        sampler.stop()
+        if server:
+            server.terminate()
+            try:
+                server.wait(10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if httpd:
+            httpd.shutdown()
+        if cookies:
+            os.remove(cookies.name)
+
+    print(f"\n{'clients':>8}{'fail':>7}{'ttfe p50':>10}{'ttfe p95':>10}{'ev/s':>8}{'search s':>10}"
+          f"{'rss MB':>9}{'server':>8}{'chrome':>8}{'threads':>9}{'cpu':>6}")
+    for l in levels:
+        print(f"{l['clients']:>8}{l['failure_rate']:>7.0%}{fmt(l['ttfe_p50']):>10}{fmt(l['ttfe_p95']):>10}"
+              f"{l['events_per_sec']:>8.1f}{fmt(l['search_p50']):>10}{fmt(l.get('peak_rss_mb'), '.0f'):>9}"
+              f"{fmt(l.get('peak_server_rss_mb'), '.0f'):>8}{fmt(l.get('peak_chrome'), 'd'):>8}"
+              f"{fmt(l.get('peak_threads'), 'd'):>9}{fmt(l.get('cpu_cores')):>6}")
+
+    summary = capacity(levels, args.max_failure, args.ttfe_slo)
+    print(f"\nSustained: {summary['sustained_clients']} concurrent search(es) with <= {args.max_failure:.0%} failures "
+          f"and p95 time to first event <= {args.ttfe_slo:.0f}s")
+    if idle:
+        print(f"Idle server: {idle['rss'] / 2 ** 20:.0f} MB RSS, {idle['threads']} threads")
+    if 'rss_per_search_mb' in summary:
+        per, base = summary['rss_per_search_mb'], summary['rss_base_mb']
+        print(f"Memory: ~{base:.0f} MB + {per:.0f} MB per concurrent search (Chrome included)")
+        if per > 0:
+            fits = ', '.join(f"{gb} GB -> {max(0, int((gb * 1024 * 0.8 - base) / per))}" for gb in (2, 4, 8, 16))
+            print(f"Searches per instance at 80% memory: {fits}")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'config': vars(args), 'idle': idle, 'levels': levels, 'capacity': summary}, f, indent=2)
+        print(f"[INFO] Report written to {args.report}")
+
+
+if __name__ == '__main__':
+    main()
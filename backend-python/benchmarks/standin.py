@@ -0,0 +1,298 @@
+"""
+Stand-in Site - Local, deterministic imitation of the Instagram pages the scraper reads
+
+Serves tag grids (with infinite scroll and partly embedded owner data), post
+pages with a Next button, profile pages (meta, JSON-LD, embedded counters,
+grid overlays) and the Options -> "About this account" dialog, generated from
+a seed. Every request can be delayed to imitate network latency.
+
+Usage (from backend-python/):
+    python benchmarks/standin.py [--port 8765] [--latency-ms 30]
+    INSTAGRAM_BASE_URL=http://127.0.0.1:8765 python server.py
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+_BIOS = (
+    'Personal trainer | DM for coaching',
+    'coffee, travel and everything in between',
+    'mom of 3, fitness & wellness coach',
+    'Chef | recipes every sunday',
+    'Photographer. Brand collabs: see link',
+    'Yoga teacher and plant lover',
+)
+_LOCATIONS = ('Austin, TX', 'London', 'Toronto', 'Dubai', 'Lagos', 'Sydney', 'Berlin', 'Sao Paulo')
+_COUNTRIES = ('United States', 'United Kingdom', 'Canada', 'United Arab Emirates', 'Nigeria', 'Australia',
+              'Germany', 'Brazil')
+# 1x1 transparent GIF; padded to the configured media size
+_GIF = bytes.fromhex('47494638396101000100800000000000ffffff21f90401000000002c00000000010001000002024401003b')
+
+_PROFILE_SCRIPT = r"""
+const options = document.getElementById('options');
+options.addEventListener('click', () => {
+    if (document.getElementById('dialog')) return;
+    const dialog = document.createElement('div');
+    dialog.id = 'dialog';
+    dialog.setAttribute('role', 'dialog');
+    dialog.innerHTML = '<button id="about">About this account</button><button>Cancel</button>';
+    document.body.appendChild(dialog);
+    document.getElementById('about').addEventListener('click', () => {
+        setTimeout(() => { dialog.innerHTML = ABOUT; }, 50);
+    });
+});
+document.addEventListener('keydown', e => {
+    const dialog = document.getElementById('dialog');
+    if (e.key === 'Escape' && dialog) dialog.remove();
+});
+"""
+
+_GRID_SCRIPT = r"""
+let shown = 0;
+function more(n) {
+    const grid = document.getElementById('grid');
+    for (const code of POSTS.slice(shown, shown + n)) {
+        const a = document.createElement('a');
+        a.href = '/p/' + code + '/';
+        a.className = 'tile';
+        a.innerHTML = '<img src="/media/' + code + '.jpg">';
+        grid.appendChild(a);
+    }
+    shown += n;
+}
+more(FIRST_PAGE);
+window.addEventListener('scroll', () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 50) setTimeout(() => more(PAGE), 100);
+});
+"""
+
+_STYLE = '<style>.tile{display:inline-block;width:300px;height:300px}.tile img{width:100%;height:100%}</style>'
+
+
+def _format_count(n: int) -> str:
+    for suffix, size in (('M', 1000000), ('K', 1000)):
+        if n >= size:
+            return f"{n / size:.1f}".rstrip('0').rstrip('.') + suffix
+    return str(n)
+
+
+def _code(*parts) -> str:
+    return hashlib.blake2b('/'.join(map(str, parts)).encode(), digest_size=8).hexdigest()[:11]
+
+
+class StandIn:
+    """
+    A synthetic site: `accounts` creators posting under any tag asked for,
+    `posts_per_tag` posts per tag grid (the first `first_page` loaded, `page`
+    more per scroll), a share `embedded` of grid owners present in the page
+    data. Everything derives from `seed`, so runs are comparable.
+    """
+
+    def __init__(self, accounts: int = 300, posts_per_tag: int = 60, embedded: float = 0.5,
+                 latency: float = 0.0, media_kb: int = 16, first_page: int = 24, page: int = 12, seed: int = 0):
+        self.accounts = accounts
+        self.posts_per_tag = posts_per_tag
+        self.embedded = embedded
+        self.latency = latency
+        self.media_kb = media_kb
+        self.first_page = first_page
+        self.page = page
+        self.seed = seed
+        self.stats = {'requests': {}, 'bytes': {}}
+        self._posts: Dict[str, Tuple[str, Optional[str], int]] = {}
+        self._tags: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def account(self, username: str) -> Optional[Dict]:
+        m = re.fullmatch(r'creator_(\d{4})', username)
+        if not m or int(m.group(1)) >= self.accounts:
+            return None
+        rng = random.Random(f'{self.seed}/{username}')
+        followers = int(10 ** rng.uniform(2.5, 6.5))
+        where = rng.random()
+        location = rng.randrange(len(_LOCATIONS))
+        bio = rng.choice(_BIOS)
+        if where < 0.35:
+            bio += f' | 📍 {_LOCATIONS[location]}'
+        rate = rng.uniform(0.005, 0.08)
+        posts = []
+        for i in range(12):
+            likes = max(1, int(followers * rate * rng.uniform(0.5, 1.5)))
+            posts.append((_code(username, i), likes, max(0, int(likes * rng.uniform(0.01, 0.05)))))
+        with self._lock:
+            for code, _, _ in posts:
+                self._posts[code] = (username, None, 0)
+        return {
+            'username': username,
+            'full_name': f"Creator {m.group(1)}",
+            'followers': followers,
+            'following': rng.randint(50, 2000),
+            'posts_count': rng.randint(20, 3000),
+            'bio': bio,
+            # About modal country for most accounts, nothing for the rest
+            'country': _COUNTRIES[location] if where < 0.85 else '',
+            'verified': rng.random() < 0.05,
+            'posts': posts,
+        }
+
+    def tag(self, tag: str) -> List[str]:
+        """Post codes of a tag grid, in grid order"""
+        with self._lock:
+            if tag not in self._tags:
+                rng = random.Random(f'{self.seed}/#{tag}')
+                codes = []
+                for i in range(self.posts_per_tag):
+                    code = _code(tag, i)
+                    owner = f"creator_{rng.randrange(self.accounts):04d}"
+                    self._posts[code] = (owner, tag, i)
+                    codes.append(code)
+                self._tags[tag] = codes
+            return self._tags[tag]
+
+    def post(self, code: str) -> Optional[Tuple[str, Optional[str], int]]:
+        with self._lock:
+            return self._posts.get(code)
+
+    def render(self, path: str) -> Tuple[int, str, bytes, str]:
+        """(status, content type, body, kind) for a request path"""
+        parts = [p for p in path.split('?')[0].split('/') if p]
+        if not parts:
+            return 200, 'text/html', b'<html><head><title>Instagram</title></head><body><main>Home</main></body></html>', 'home'
+        if parts == ['accounts', 'edit']:
+            # Session probe target (session_store.SessionStore.PROBE_PATH); every visitor counts as logged in
+            return 200, 'text/html', b'<html><head><title>Edit profile</title></head><body><main>Settings</main></body></html>', 'home'
+        if parts[0] == 'media':
+            pad = max(0, self.media_kb * 1024 - len(_GIF))
+            return 200, 'image/gif', _GIF + b'\0' * pad, 'media'
+        if parts[:2] == ['explore', 'tags'] and len(parts) == 3:
+            return 200, 'text/html; charset=utf-8', self._tag_page(parts[2].lower()).encode(), 'tag'
+        if parts[0] in ('p', 'reel') and len(parts) == 2:
+            page = self._post_page(parts[1])
+            return (200, 'text/html; charset=utf-8', page.encode(), 'post') if page else (404, 'text/html', b'', 'post')
+        if len(parts) == 1:
+            page = self._profile_page(parts[0])
+            return (200, 'text/html; charset=utf-8', page.encode(), 'profile') if page else (404, 'text/html', b'', 'profile')
+        return 404, 'text/html', b'', 'other'
+
+    def _tag_page(self, tag: str) -> str:
+        codes = self.tag(tag)
+        rng = random.Random(f'{self.seed}/embedded/{tag}')
+        nodes = [{'node': {'shortcode': c, 'owner': {'username': self.post(c)[0]}}}
+                 for c in codes[:self.first_page] if rng.random() < self.embedded]
+        script = (_GRID_SCRIPT.replace('POSTS', json.dumps(codes))
+                  .replace('FIRST_PAGE', str(self.first_page)).replace('PAGE', str(self.page)))
+        return (f'<!DOCTYPE html><html><head><title>#{html.escape(tag)} hashtag on Instagram</title>{_STYLE}</head>'
+                f'<body><main><header><h1>#{html.escape(tag)}</h1></header><article><div id="grid"></div></article></main>'
+                f'<script type="application/json">{json.dumps({"top": {"sections": nodes}})}</script>'
+                f'<script>{script}</script></body></html>')
+
+    def _post_page(self, code: str) -> Optional[str]:
+        post = self.post(code)
+        if not post:
+            return None
+        owner, tag, index = post
+        rng = random.Random(f'{self.seed}/post/{code}')
+        likes, comments = rng.randint(20, 20000), rng.randint(0, 400)
+        description = f"{likes:,} likes, {comments:,} comments - {owner} on March 3, 2024: a post"
+        codes = self.tag(tag) if tag else []
+        nxt = (f'<button aria-label="Next" onclick="location.href=\'/p/{codes[index + 1]}/\'">Next</button>'
+               if index + 1 < len(codes) else '')
+        return (f'<!DOCTYPE html><html><head><meta property="og:description" content="{html.escape(description)}" />'
+                f'<title>{owner} on Instagram</title></head><body><main><article>'
+                f'<header><a href="/{owner}/">{owner}</a></header><img src="/media/{code}.jpg">'
+                f'<section><span><span>{likes:,}</span> likes</span></section></article>{nxt}</main></body></html>')
+
+    def _profile_page(self, username: str) -> Optional[str]:
+        a = self.account(username)
+        if not a:
+            return None
+        counts = f"{_format_count(a['followers'])} Followers, {a['following']:,} Following, {a['posts_count']:,} Posts"
+        description = f"{counts} - See Instagram photos and videos from {a['full_name']} (@{username})"
+        ld = {'@context': 'https://schema.org', '@type': 'ProfilePage', 'mainEntity': {
+            '@type': 'Person', 'name': a['full_name'], 'alternateName': f'@{username}', 'description': a['bio'],
+            'interactionStatistic': [{'@type': 'InteractionCounter', 'interactionType': 'https://schema.org/FollowAction',
+                                      'userInteractionCount': a['followers']}]}}
+        embedded = {'user': {'edge_followed_by': {'count': a['followers']}, 'is_verified': a['verified'],
+                             'edge_owner_to_timeline_media': {'count': a['posts_count'], 'edges': [
+                                 {'node': {'shortcode': c, 'edge_liked_by': {'count': l},
+                                           'edge_media_to_comment': {'count': n}}} for c, l, n in a['posts']]}}}
+        tiles = ''.join(f'<a href="/p/{c}/" class="tile"><img src="/media/{c}.jpg"><ul><li>{l:,}</li><li>{n:,}</li></ul></a>'
+                        for c, l, n in a['posts'])
+        country = (f'<div aria-label="Account based in">Account based in<br>{a["country"]}</div>' if a['country'] else '')
+        about = f'<div>About this account</div>{country}<div>Date joined<br>March 2019</div>'
+        verified = '<svg aria-label="Verified" width="12" height="12"></svg>' if a['verified'] else ''
+        return (f'<!DOCTYPE html><html><head>'
+                f'<meta property="og:description" content="{html.escape(description)}" />'
+                f'<meta property="og:title" content="{html.escape(a["full_name"])} (@{username}) &#x2022; Instagram photos and videos" />'
+                f'<meta property="og:image" content="/media/{username}_pic.jpg" />'
+                f'<script type="application/ld+json">{json.dumps(ld)}</script>{_STYLE}</head>'
+                f'<body><main><header><img src="/media/{username}_pic.jpg"><h1>{username}</h1>{verified}'
+                f'<div role="button" id="options"><svg aria-label="Options" width="24" height="24"></svg>...</div>'
+                f'<a href="/{username}/followers/"><span title="{a["followers"]:,}">{_format_count(a["followers"])}</span> followers</a>'
+                f'<div dir="auto">{html.escape(a["bio"])}</div></header><article>{tiles}</article></main>'
+                f'<script type="application/json">{json.dumps(embedded)}</script>'
+                f'<script>const ABOUT = {json.dumps(about)};{_PROFILE_SCRIPT}</script></body></html>')
+
+    def count(self, kind: str, size: int):
+        with self._lock:
+            self.stats['requests'][kind] = self.stats['requests'].get(kind, 0) + 1
+            self.stats['bytes'][kind] = self.stats['bytes'].get(kind, 0) + size
+
+
+def serve(site: StandIn, host: str = '127.0.0.1', port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start `site` on a background thread; returns the server and its base URL"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if site.latency:
+                time.sleep(site.latency)
+            status, content_type, body, kind = site.render(self.path)
+            site.count(kind, len(body))
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name='standin', daemon=True).start()
+    return httpd, f'http://{host}:{httpd.server_address[1]}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=30)
+    parser.add_argument('--accounts', type=int, default=300)
+    parser.add_argument('--posts-per-tag', type=int, default=60)
+    parser.add_argument('--media-kb', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    site = StandIn(accounts=args.accounts, posts_per_tag=args.posts_per_tag, latency=args.latency_ms / 1000,
+                   media_kb=args.media_kb, seed=args.seed)
+    httpd, base_url = serve(site, port=args.port)
+    print(f"[INFO] Stand-in site at {base_url} (set INSTAGRAM_BASE_URL={base_url}); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        httpd.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Boot - Cached chromedriver resolution & startup timing report
+"""
+
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import logs
+
+log = logs.get_logger('boot')
+
+_PROCESS_START = time.perf_counter()
+_DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.chromedriver_path')
+
+_lock = threading.Lock()
+_driver_path: Optional[str] = None
+_driver_source = ''
+_timings: Dict[str, Dict] = {}
+
+
+def elapsed() -> float:
+    """Seconds since this module (the first thing server.py imports) was loaded"""
+    return time.perf_counter() - _PROCESS_START
+
+
+def record(name: str, seconds: float, **info):
+    """Record one sample of a startup phase"""
+    with _lock:
+        t = _timings.setdefault(name, {'count': 0, 'first': None, 'last': None, 'total': 0.0})
+        t['count'] += 1
+        t['last'] = round(seconds, 3)
+        t['total'] = round(t['total'] + seconds, 3)
+        if t['first'] is None:
+            t['first'] = round(seconds, 3)
+            t['at'] = round(time.perf_counter() - _PROCESS_START, 3)
+        t.update(info)
+
+
+@contextmanager
+def phase(name: str, **info):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, **info)
+
+
+def _cache_file() -> str:
+    return os.getenv('DRIVER_CACHE_FILE', _DEFAULT_CACHE_FILE)
+
+
+def _read_cache() -> Optional[str]:
+    try:
+        with open(_cache_file()) as f:
+            path = f.read().strip()
+        return path if path and os.path.isfile(path) else None
+    except OSError:
+        return None
+
+
+def _write_cache(path: str):
+    try:
+        with open(_cache_file(), 'w') as f:
+            f.write(path)
+    except OSError as e:
+        log.warning("Could not write driver cache %s: %s", _cache_file(), e)
+
+
+def resolve_driver_path() -> str:
+    """
+    Resolve the chromedriver binary once per process.
+    Order: CHROMEDRIVER_PATH -> on-disk cache -> chromedriver on PATH (offline only)
+    -> webdriver_manager download. DRIVER_OFFLINE=true never touches the network.
+    """
+    global _driver_path, _driver_source
+    with _lock:
+        if _driver_path:
+            return _driver_path
+
+    start = time.perf_counter()
+    pinned = os.getenv('CHROMEDRIVER_PATH', '')
+    offline = os.getenv('DRIVER_OFFLINE', 'false').lower() == 'true'
+    source = ''
+    path = None
+    if pinned:
+        path, source = pinned, 'pinned'
+    if not path:
+        path = _read_cache()
+        source = 'cache' if path else ''
+    if not path and offline:
+        path = shutil.which('chromedriver')
+        if not path:
+            raise RuntimeError('DRIVER_OFFLINE is set but no chromedriver found (set CHROMEDRIVER_PATH)')
+        source = 'path'
+    if not path:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path, source = ChromeDriverManager().install(), 'webdriver_manager'
+        _write_cache(path)
+
+    record('driver_resolution', time.perf_counter() - start, source=source)
+    with _lock:
+        _driver_path, _driver_source = path, source
+    return path
+
+
+def report() -> Dict:
+    """Startup timing breakdown (seconds) since process start"""
+    with _lock:
+        phases = {name: dict(t) for name, t in _timings.items()}
+        return {
+            'uptime': round(elapsed(), 3),
+            'driver_path': _driver_path,
+            'driver_source': _driver_source,
+            'phases': phases,
+        }
@@ -0,0 +1,244 @@
+"""
+Crawl Checkpoints - Periodic snapshots of search progress for resume after a crash
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import logs
+
+log = logs.get_logger('checkpoint')
+
+
+class CrawlInterrupted(RuntimeError):
+    """The browser died or its session expired mid-search; resume from the checkpoint with a new one"""
+
+
+class CrawlState:
+    """
+    Everything needed to continue a search elsewhere: tags finished, the
+    post position reached in each tag, usernames already seen, candidates
+    found but never checked (the backlog), profiles already emitted (with
+    their enrichment merged in) and hence the remaining budget. Shared by
+    the crawler and analysis workers.
+    """
+
+    def __init__(self, params: Dict, data: Optional[Dict] = None):
+        data = data or {}
+        self.params = params
+        self.tags_done: List[str] = list(data.get('tags_done', []))
+        self.positions: Dict[str, int] = dict(data.get('positions', {}))
+        self.seen = set(data.get('seen', []))
+        self.backlog: List[List[str]] = [list(item) for item in data.get('backlog', [])]
+        # Extra tags a not-yet-emitted account turned up under
+        self.sightings: Dict[str, List[str]] = dict(data.get('sightings', {}))
+        self.profiles: 'OrderedDict[str, Dict]' = OrderedDict((p['username'], p) for p in data.get('profiles', []))
+        self.finished = bool(data.get('finished', False))
+        self.restarts = int(data.get('restarts', 0))
+        self.on_change = None
+        self._lock = threading.RLock()
+
+    @property
+    def found(self) -> int:
+        return len(self.profiles)
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.params['max_profiles'] - self.found)
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.seen or self.tags_done or self.backlog)
+
+    def position(self, tag: str) -> int:
+        with self._lock:
+            return self.positions.get(tag, 0)
+
+    def advance(self, tag: str, posts: int):
+        with self._lock:
+            self.positions[tag] = max(posts, self.positions.get(tag, 0))
+        self._changed()
+
+    def tag_done(self, tag: str):
+        with self._lock:
+            if tag not in self.tags_done:
+                self.tags_done.append(tag)
+        self._changed(force=True)
+
+    def claim_seen(self, username: str) -> bool:
+        """False if the username was already handled in this search (before or after a restart)"""
+        with self._lock:
+            if username in self.seen:
+                return False
+            self.seen.add(username)
+        self._changed()
+        return True
+
+    def add_sighting(self, username: str, tag: str) -> Optional[Dict]:
+        """
+        `username` turned up again under `tag`. Returns the profile_update
+        to emit when the account already matched; otherwise the tag is kept
+        for merge_tags().
+        """
+        with self._lock:
+            profile = self.profiles.get(username)
+            if profile is None:
+                tags = self.sightings.setdefault(username, [])
+                if tag not in tags:
+                    tags.append(tag)
+                return None
+            tags = profile.setdefault('tags_matched', [])
+            if tag in tags:
+                return None
+            tags.append(tag)
+            return {'username': username, 'tags_matched': list(tags)}
+
+    def merge_tags(self, profile: Dict):
+        """Fold tags seen while the account was being checked into its tags_matched"""
+        with self._lock:
+            extra = self.sightings.pop(profile['username'], [])
+        if extra:
+            profile['tags_matched'] = list(dict.fromkeys((profile.get('tags_matched') or []) + extra))
+
+    def defer(self, username: str, tag: str):
+        """A claimed username whose check never ran or was cut short: check it first on resume"""
+        with self._lock:
+            self.seen.discard(username)
+            self.backlog.append([username, tag])
+        self._changed(force=True)
+
+    def take_backlog(self) -> List[List[str]]:
+        with self._lock:
+            backlog, self.backlog = self.backlog, []
+            return backlog
+
+    def observe(self, event: Dict):
+        """Track emitted profiles and their progressive updates from the event stream"""
+        kind, data = event.get('type'), event.get('data')
+        with self._lock:
+            if kind == 'profile':
+                self.profiles[data['username']] = dict(data)
+            elif kind == 'profile_update' and data.get('username') in self.profiles:
+                self.profiles[data['username']].update(data)
+            elif kind == 'complete':
+                self.finished = True
+            else:
+                return
+        self._changed(force=kind != 'profile_update')
+
+    def _changed(self, force: bool = False):
+        if self.on_change:
+            self.on_change(self, force)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'params': self.params,
+                'tags_done': list(self.tags_done),
+                'positions': dict(self.positions),
+                'seen': sorted(self.seen),
+                'backlog': [list(item) for item in self.backlog],
+                'sightings': {u: list(t) for u, t in self.sightings.items()},
+                'profiles': [dict(p) for p in self.profiles.values()],
+                'finished': self.finished,
+                'restarts': self.restarts,
+                'saved': time.time(),
+            }
+
+
+class CheckpointStore:
+    """
+    One JSON file per search under `directory`, rewritten atomically at
+    most every `interval` seconds (immediately for emitted profiles and
+    finished tags). Files older than `retention` seconds are pruned.
+    """
+
+    def __init__(self, directory: Optional[str], interval: float = 5, retention: float = 24 * 3600):
+        self.directory = directory
+        self.interval = interval
+        self.retention = retention
+        self._last: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.prune()
+
+    def _path(self, search_id: str) -> Optional[str]:
+        if not self.directory or not search_id or not search_id.isalnum():
+            return None
+        return os.path.join(self.directory, f'{search_id}.json')
+
+    def track(self, search_id: str, state: CrawlState) -> CrawlState:
+        """Checkpoint `state` under `search_id` as it changes"""
+        state.on_change = lambda s, force: self.save(search_id, s, force)
+        self.save(search_id, state, force=True)
+        return state
+
+    def save(self, search_id: str, state: CrawlState, force: bool = False):
+        path = self._path(search_id)
+        if not path:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last.get(search_id, 0) < self.interval:
+                return
+            self._last[search_id] = now
+            try:
+                tmp = f'{path}.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(state.to_dict(), f, separators=(',', ':'))
+                os.replace(tmp, path)
+            except (OSError, TypeError, ValueError) as e:
+                log.warning("Checkpoint write failed for %s: %s", search_id, e)
+
+    def load(self, search_id: str) -> Optional[CrawlState]:
+        path = self._path(search_id)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Checkpoint unreadable for %s: %s", search_id, e)
+            return None
+        return CrawlState(data['params'], data)
+
+    def list(self) -> List[Dict]:
+        """Summary of every checkpoint on disk, newest first"""
+        if not self.directory:
+            return []
+        items = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            state = self.load(name[:-5])
+            if state:
+                items.append({
+                    'id': name[:-5],
+                    'params': state.params,
+                    'finished': state.finished,
+                    'profiles_found': state.found,
+                    'seen': len(state.seen),
+                    'tags_done': state.tags_done,
+                    'saved': os.path.getmtime(os.path.join(self.directory, name)),
+                })
+        return sorted(items, key=lambda i: i['saved'], reverse=True)
+
+    def prune(self) -> int:
+        if not self.directory:
+            return 0
+        cutoff = time.time() - self.retention
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith('.json') and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,153 @@
+"""
+Search Coalescing - Share one running crawl between identical or narrower searches
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from filters import GROUPS, GROUP_FIELDS, FilterPlan
+from gazetteer import get_gazetteer
+
+
+def _number(value, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize(params: Dict) -> Dict:
+    """Canonical form of a search: tag set, filter values with defaults applied, profile budget"""
+    filters = params.get('filters') or {}
+    gender = (filters.get('gender') or 'both').lower()
+    country = (filters.get('country') or '').strip()
+    return {
+        'tags': sorted({t.strip().lstrip('#').lower() for t in params.get('tags') or [] if t.strip()}),
+        'gender': gender if gender in ('male', 'female') else 'both',
+        'country': (get_gazetteer().resolve(country) or country.lower()) if country else '',
+        'min_followers': _number(filters.get('min_followers'), 0),
+        'max_followers': _number(filters.get('max_followers'), 1000000000),
+        'min_engagement': _number(filters.get('min_engagement'), 0),
+        'max_profiles': int(params.get('max_profiles') or 20),
+        'recheck': bool(filters.get('recheck')),
+    }
+
+
+def search_key(params: Dict) -> str:
+    return json.dumps(normalize(params), sort_keys=True)
+
+
+def covers(crawl: Dict, params: Dict) -> bool:
+    """
+    True when every profile `params` would accept also passes the crawl's
+    filters (same tags, filters at most as strict, budget at least as large),
+    so the narrower search can be answered from the crawl's events.
+    """
+    a, b = normalize(crawl), normalize(params)
+    return (a['tags'] == b['tags']
+            and a['gender'] in ('both', b['gender'])
+            and a['country'] in ('', b['country'])
+            and a['min_followers'] <= b['min_followers']
+            and a['max_followers'] >= b['max_followers']
+            and a['min_engagement'] <= b['min_engagement']
+            and a['max_profiles'] >= b['max_profiles']
+            and a['recheck'] >= b['recheck'])
+
+
+class FilteredView:
+    """
+    One subscriber's view of a shared crawl. Profiles are re-checked against
+    the subscriber's own filters; a profile still enriching progressively
+    is held back until the fields its filters need arrive in profile_update
+    events, then forwarded (or dropped). Stops at the subscriber's own
+    max_profiles with its own 'complete' event.
+    """
+
+    def __init__(self, params: Dict):
+        self.plan = FilterPlan(params['filters'])
+        self.max_profiles = params['max_profiles']
+        self.sent = set()
+        self.held: Dict[str, tuple] = {}
+        self.finished: Optional[Dict] = None
+
+    def _decide(self, profile: Dict, check) -> Optional[bool]:
+        """True forward, False drop, None wait for more fields"""
+        pending = profile.get('pending') or ()
+        for group in GROUPS:
+            if group not in pending:
+                check.add(GROUP_FIELDS[group])
+        if check.run():
+            return False
+        if len(check.passed) == len(self.plan.predicates):
+            return True
+        return None if pending else False
+
+    def _forward(self, profile: Dict) -> Iterator[Dict]:
+        self.sent.add(profile['username'])
+        yield {'type': 'profile', 'data': profile}
+        if len(self.sent) >= self.max_profiles:
+            yield from self._complete()
+
+    def _complete(self, event: Optional[Dict] = None) -> Iterator[Dict]:
+        self.held.clear()
+        yield {'type': 'log', 'data': self.plan.stats.summary()}
+        self.finished = dict(event or {'type': 'complete'})
+        self.finished['data'] = f"Search finished. Found {len(self.sent)} profiles."
+        if len(self.sent) < self.max_profiles:
+            # The shared crawl hit its own budget (or ran out of tags) first; a search of its own could find more
+            self.finished['data'] += " The shared crawl it joined ended before this search's max_profiles."
+            self.finished['shortfall'] = self.max_profiles - len(self.sent)
+        self.finished['filters'] = self.plan.stats.report()
+        yield self.finished
+
+    def feed(self, event: Dict) -> Iterator[Dict]:
+        """Events this subscriber should see for one event of the crawl"""
+        if self.finished:
+            return
+        kind, data = event.get('type'), event.get('data')
+        if kind == 'profile':
+            profile = dict(data)
+            check = self.plan.start(profile)
+            verdict = self._decide(profile, check)
+            if verdict:
+                yield from self._forward(profile)
+            elif verdict is None:
+                self.held[profile['username']] = (profile, check)
+        elif kind == 'profile_update':
+            username = data.get('username')
+            if username in self.sent:
+                yield event
+            elif username in self.held:
+                profile, check = self.held[username]
+                profile.update(data)
+                verdict = self._decide(profile, check)
+                if verdict is not None:
+                    del self.held[username]
+                if verdict:
+                    yield from self._forward(profile)
+        elif kind == 'complete':
+            yield from self._complete(event)
+        else:
+            yield event
+
+    def filter(self, frames: Iterable[Optional[Tuple[str, Dict]]], after: int = 0) -> Iterator[Optional[Tuple[str, Dict]]]:
+        """
+        Apply the view to a journal tail from seq 0. Frames up to `after` only
+        rebuild the view's state (a reconnect); later ones are emitted with
+        the crawl's event id. Ends after the subscriber's 'complete', which
+        is repeated if the view already ended before `after` (it may have
+        shared its id with a frame the client did receive).
+        """
+        for frame in frames:
+            if frame is None:
+                yield None
+                continue
+            event_id, event = frame
+            replayed = int(event_id.rpartition(':')[2]) <= after
+            for out in self.feed(event):
+                if not replayed:
+                    yield event_id, out
+            if self.finished:
+                if replayed:
+                    yield event_id, self.finished
+                return
@@ -0,0 +1,9 @@
+"""
+Pytest configuration - unit tests only; the older test_*.py scripts drive a live browser and are run by hand
+"""
+
+collect_ignore = [
+    'test_aria_label.py', 'test_cookie_login.py', 'test_country_debug.py', 'test_country_extraction.py',
+    'test_enhanced_debug.py', 'test_final.py', 'test_followers_first.py', 'test_login.py',
+    'test_no_gender_filter.py', 'test_setup.py', 'test_visual_debug.py',
+]
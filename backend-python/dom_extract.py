@@ -0,0 +1,116 @@
+"""
+DOM Extract - Everything a profile analysis needs in one execute_script round trip
+"""
+
+import threading
+from typing import Dict, Optional
+
+import logs
+from profile_extract import extract_from_parts, parse_count, strip_account_based_in
+
+log = logs.get_logger('dom_extract')
+
+# Runs in the page; returns a small JSON object instead of the serialized DOM
+PROFILE_SCRIPT = r"""
+const text = el => (el && (el.innerText || el.textContent) || '').trim();
+const meta = {};
+for (const name of ['og:description', 'description', 'og:title', 'og:image']) {
+    const el = document.querySelector(`meta[property="${name}"], meta[name="${name}"]`);
+    if (el) meta[name] = el.getAttribute('content') || '';
+}
+const ld = [...document.querySelectorAll('script[type="application/ld+json"]')].map(s => s.textContent);
+
+// Follower link: exact count lives in the title attribute, abbreviated count in the text
+const fl = document.querySelector('a[href$="/followers/"]');
+const flTitle = fl && fl.querySelector('[title]');
+
+let bio = '';
+for (const el of document.querySelectorAll('header div[dir="auto"]')) {
+    if (text(el).length > 3) { bio = text(el); break; }
+}
+if (!bio) {
+    const h1 = document.querySelector('h1');
+    const sib = h1 && h1.nextElementSibling;
+    if (sib && sib.tagName === 'DIV') bio = text(sib);
+}
+
+const img = document.querySelector('header img');
+const country = document.querySelector('[aria-label="Account based in"]');
+const posts = [...document.querySelectorAll('article a[href*="/p/"]')].slice(0, 12).map(a => a.href);
+
+// Bytes transferred so far (Resource Timing) and when the DOM was ready; cross-origin
+// responses without Timing-Allow-Origin report 0 bytes
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const res = performance.getEntriesByType('resource');
+
+return {
+    meta: meta,
+    ld: ld,
+    followers_title: flTitle ? flTitle.getAttribute('title') : '',
+    followers_text: text(fl),
+    bio: bio,
+    pic: img ? img.getAttribute('src') || '' : '',
+    country: country ? text(country) : '',
+    post_links: posts,
+    verified: !!document.querySelector('header svg[aria-label="Verified"]'),
+    weight: {
+        bytes: (nav.transferSize || 0) + res.reduce((n, r) => n + (r.transferSize || 0), 0),
+        resources: res.length,
+        dom_ready_ms: nav.domContentLoadedEventEnd || 0
+    }
+};
+"""
+
+
+def snapshot_profile(driver) -> Optional[Dict]:
+    """
+    One round trip. Returns {'fields': {...basic profile fields...},
+    'country': str, 'post_links': [...], 'bio': str, 'weight': {'bytes',
+    'resources', 'dom_ready_ms'}} or None if the script failed.
+    """
+    try:
+        raw = driver.execute_script(PROFILE_SCRIPT)
+    except Exception as e:
+        log.debug("DOM snapshot failed: %s", e)
+        return None
+    if not isinstance(raw, dict):
+        return None
+
+    fields = extract_from_parts(raw.get('meta') or {}, raw.get('ld') or [])
+    if not fields.get('followers'):
+        count = parse_count(raw.get('followers_title') or '') or parse_count((raw.get('followers_text') or '').split(' ')[0])
+        if count:
+            fields['followers'] = count
+    if raw.get('bio'):
+        fields['biography'] = raw['bio']
+    if raw.get('pic'):
+        fields['profile_pic_url'] = raw['pic']
+    if raw.get('verified'):
+        fields['is_verified'] = True
+
+    return {
+        'fields': fields,
+        'bio': raw.get('bio') or '',
+        'country': strip_account_based_in(raw.get('country') or ''),
+        'post_links': raw.get('post_links') or [],
+        'weight': raw.get('weight') or {},
+    }
+
+
+class CommandCounter:
+    """
+    Counts WebDriver commands (HTTP round trips to chromedriver) by wrapping
+    driver.execute, which every driver and WebElement call goes through.
+    """
+
+    def __init__(self, driver):
+        self.count = 0
+        self._lock = threading.Lock()
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            with self._lock:
+                self.count += 1
+            return original(driver_command, params)
+
+        driver.execute = execute
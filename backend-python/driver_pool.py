@@ -0,0 +1,180 @@
+"""
+Driver Pool - Warm, logged-in browsers leased per search
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import logs
+
+if TYPE_CHECKING:
+    # Selenium is only imported once the first browser is created
+    from instagram_scraper import InstagramScraper
+
+log = logs.get_logger('driver_pool')
+
+
+class DriverPool:
+    """
+    Keeps `size` started + cookie-authenticated scrapers ready so a search
+    does not pay for Chrome launch and login. Grows up to `max_size` under
+    load; drivers that fail the health check on return are discarded and
+    replaced in the background.
+    """
+
+    def __init__(self, factory: Callable[[], 'InstagramScraper'], size: int = 2,
+                 max_size: Optional[int] = None, lease_timeout: float = 60):
+        self.factory = factory
+        self.size = size
+        self.max_size = max(max_size or size, size)
+        self.lease_timeout = lease_timeout
+        self._idle: List['InstagramScraper'] = []
+        self._leased = set()
+        self._starting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._counters = {'created': 0, 'failed_starts': 0, 'discarded': 0, 'leases': 0, 'lease_timeouts': 0}
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._leased) + self._starting
+
+    def _create(self) -> Optional['InstagramScraper']:
+        """Start and log in a new scraper, or None on failure (an exception counts as one)"""
+        scraper = None
+        try:
+            scraper = self.factory()
+            if scraper.start_browser() and scraper.login():
+                with self._cond:
+                    self._counters['created'] += 1
+                return scraper
+        except Exception as e:
+            log.warning("Browser start failed: %s", e)
+        if scraper:
+            try:
+                scraper.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._counters['failed_starts'] += 1
+        return None
+
+    def _discard(self, scraper: 'InstagramScraper'):
+        scraper.close()
+        with self._cond:
+            self._counters['discarded'] += 1
+
+    def warm(self):
+        """Start drivers until the pool holds `size` of them"""
+        while True:
+            with self._cond:
+                if self._closed or self._total() >= self.size:
+                    return
+                self._starting += 1
+            scraper = self._create()
+            with self._cond:
+                self._starting -= 1
+                if scraper and not self._closed:
+                    self._idle.append(scraper)
+                    self._cond.notify()
+                    continue
+                self._cond.notify()
+            if scraper:
+                scraper.close()
+            # Give up on this round rather than looping on a broken login
+            return
+
+    def warm_async(self):
+        threading.Thread(target=self.warm, name='driver-pool-warm', daemon=True).start()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional['InstagramScraper']:
+        """
+        Lease a healthy scraper. Waits for one to be returned when the pool
+        is at `max_size`; returns None if none became available in time.
+        """
+        timeout = self.lease_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            scraper = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError('Driver pool is closed')
+                    if self._idle:
+                        scraper = self._idle.pop()
+                        self._leased.add(scraper)
+                        break
+                    if self._total() < self.max_size:
+                        self._starting += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters['lease_timeouts'] += 1
+                        return None
+                    self._cond.wait(remaining)
+
+            if scraper is None:
+                scraper = self._create()
+                with self._cond:
+                    self._starting -= 1
+                    if scraper:
+                        self._leased.add(scraper)
+                    self._cond.notify()
+                if scraper is None:
+                    return None
+            elif not scraper.is_alive():
+                # Idle driver died or its session expired - replace it
+                with self._cond:
+                    self._leased.discard(scraper)
+                    self._cond.notify()
+                self._discard(scraper)
+                continue
+
+            with self._cond:
+                self._counters['leases'] += 1
+            return scraper
+
+    def release(self, scraper: 'InstagramScraper'):
+        """Reset a leased scraper and return it to the pool (or discard it)"""
+        healthy = not self._closed and scraper.reset()
+        with self._cond:
+            self._leased.discard(scraper)
+            keep = healthy and not self._closed and len(self._idle) < self.size
+            if keep:
+                self._idle.append(scraper)
+            self._cond.notify()
+        if not keep:
+            self._discard(scraper)
+            if not self._closed:
+                self.warm_async()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        scraper = self.acquire(timeout)
+        try:
+            yield scraper
+        finally:
+            if scraper:
+                self.release(scraper)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                'size': self.size,
+                'max_size': self.max_size,
+                'total': self._total(),
+                'idle': len(self._idle),
+                'leased': len(self._leased),
+                'starting': self._starting,
+                **self._counters,
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for scraper in idle:
+            scraper.close()
@@ -0,0 +1,137 @@
+"""
+Engagement Engine - Likes / comments for recent posts without opening post modals
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import logs
+from profile_extract import parse_count
+
+log = logs.get_logger('engagement')
+
+# Embedded post nodes: old GraphQL edges and newer flat counters
+_LIKES = re.compile(r'"(?:edge_liked_by|edge_media_preview_like)":\s*\{\s*"count":\s*(\d+)|"like_count":\s*(\d+)')
+_COMMENTS = re.compile(r'"edge_media_to_comment":\s*\{\s*"count":\s*(\d+)|"comment_count":\s*(\d+)')
+_PAIR_WINDOW = 600
+# '},{' between two counters means they sit in different post nodes
+_NODE_BREAK = re.compile(r'\}\s*\]?\s*,\s*\{')
+
+# Post page meta: "1,234 likes, 56 comments - user on March 3, 2024: ..."
+_POST_META = re.compile(r'([\d,.]+[KMB]?)\s+likes?,\s*([\d,.]+[KMB]?)\s+comments?', re.IGNORECASE)
+
+# Hover every grid tile so its like/comment overlay renders, then read all of them in one round trip
+GRID_SCRIPT = r"""
+const limit = arguments[0], done = arguments[arguments.length - 1];
+const links = [...document.querySelectorAll('main a[href*="/p/"], main a[href*="/reel/"], article a[href*="/p/"]')].slice(0, limit);
+for (const a of links) {
+    for (const type of ['mouseover', 'mouseenter']) a.dispatchEvent(new MouseEvent(type, {bubbles: true}));
+}
+setTimeout(() => done(links.map(a => ({
+    href: a.href,
+    counts: [...a.querySelectorAll('li, span')]
+        .map(e => (e.innerText || '').trim())
+        .filter(t => /^[\d.,]+[KMB]?$/.test(t))
+}))), 400);
+"""
+
+Counts = List[Tuple[int, int]]
+
+
+def counts_from_html(html: str, limit: int = 12) -> Counts:
+    """(likes, comments) per post from data embedded in profile HTML"""
+    posts = []
+    prev_end = None
+    for m in _LIKES.finditer(html):
+        # GraphQL nodes carry both edge_liked_by and edge_media_preview_like: one post, one count
+        if prev_end is not None and not _NODE_BREAK.search(html, prev_end, m.start()):
+            continue
+        prev_end = m.end()
+        likes = int(m.group(1) or m.group(2))
+        # The closest comment counter not separated from it by a post boundary
+        c, best = None, _PAIR_WINDOW + 1
+        for cm in _COMMENTS.finditer(html, max(0, m.start() - _PAIR_WINDOW), m.end() + _PAIR_WINDOW):
+            lo, hi = (m.end(), cm.start()) if cm.start() >= m.end() else (cm.end(), m.start())
+            if hi - lo < best and not _NODE_BREAK.search(html, lo, hi):
+                c, best = cm, hi - lo
+        comments = int(c.group(1) or c.group(2)) if c else 0
+        posts.append((likes, comments))
+        if len(posts) >= limit:
+            break
+    return posts
+
+
+def counts_from_post_page(html: str) -> Optional[Tuple[int, int]]:
+    m = _POST_META.search(html)
+    if m:
+        return parse_count(m.group(1)), parse_count(m.group(2))
+    embedded = counts_from_html(html, limit=1)
+    return embedded[0] if embedded else None
+
+
+def summarize(posts: Counts, followers: int) -> Dict:
+    """avg_likes, avg_comments and engagement_rate ((likes + comments) / followers, %) in one pass"""
+    total_likes = total_comments = 0
+    for likes, comments in posts:
+        total_likes += likes
+        total_comments += comments
+    n = len(posts)
+    avg_likes = int(total_likes / n) if n else 0
+    avg_comments = int(total_comments / n) if n else 0
+    rate = round((avg_likes + avg_comments) / followers * 100, 2) if n and followers > 0 else 0
+    return {'avg_likes': avg_likes, 'avg_comments': avg_comments, 'engagement_rate': rate}
+
+
+class EngagementEngine:
+    """
+    Tries, cheapest first: counts embedded in already-fetched profile HTML,
+    grid hover overlays (one async script), then post pages fetched
+    concurrently over the shared HTTP session. Returns None when every bulk
+    source comes up empty so the caller can fall back to clicking modals.
+    """
+
+    def __init__(self, fetcher=None, pacer=None, concurrency: int = 4, max_posts: int = 12):
+        self.fetcher = fetcher
+        self.pacer = pacer
+        self.concurrency = concurrency
+        self.max_posts = max_posts
+
+    def from_grid(self, driver) -> Counts:
+        try:
+            tiles = driver.execute_async_script(GRID_SCRIPT, self.max_posts) or []
+        except Exception as e:
+            log.debug("Grid overlay read failed: %s", e)
+            return []
+        posts = [(parse_count(t['counts'][0]), parse_count(t['counts'][1])) for t in tiles if len(t.get('counts') or []) >= 2]
+        # Overlays that rendered for only a few tiles are not a representative sample
+        return posts if tiles and len(posts) * 2 >= len(tiles) else []
+
+    def from_post_pages(self, links: List[str]) -> Counts:
+        if not self.fetcher or not links:
+            return []
+        paths = []
+        for link in links[:self.max_posts]:
+            m = re.search(r'/(p|reel)/([^/?#]+)', link)
+            if m:
+                paths.append(f'{m.group(1)}/{m.group(2)}/')
+        if self.pacer:
+            # One paced burst: the batch counts as a single request slot
+            self.pacer.wait()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pages = list(pool.map(self.fetcher.get, paths))
+        return [c for c in (counts_from_post_page(p) for p in pages if p) if c]
+
+    def compute(self, profile: Dict, html: Optional[str] = None, driver=None,
+                post_links: Optional[List[str]] = None) -> Optional[str]:
+        """Fill engagement fields on `profile`; returns the source used or None"""
+        for source, fetch in (
+            ('embedded', lambda: counts_from_html(html, self.max_posts) if html else []),
+            ('grid', lambda: self.from_grid(driver) if driver else []),
+            ('post_pages', lambda: self.from_post_pages(post_links or [])),
+        ):
+            posts = fetch()
+            if posts:
+                profile.update(summarize(posts, profile.get('followers', 0)))
+                return source
+        return None
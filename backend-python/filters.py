@@ -0,0 +1,291 @@
+"""
+Filters - Cost-ordered profile predicates with early rejection
+"""
+
+import json
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from gazetteer import get_gazetteer
+from profile_cache import BASIC_FIELDS, COUNTRY_FIELDS, ENGAGEMENT_FIELDS, field_group
+
+# Every group a fully analyzed profile ends up loading, in load order
+GROUP_FIELDS = {'basic': BASIC_FIELDS, 'country': COUNTRY_FIELDS, 'engagement': ENGAGEMENT_FIELDS}
+GROUPS = tuple(GROUP_FIELDS)
+
+# Seconds to obtain each field group in the browser; refined from observed timings
+DEFAULT_GROUP_COSTS = {'basic': 3.0, 'country': 6.0, 'engagement': 4.0}
+
+_MALE_BIO = re.compile(r"\b(?:dad|father|husband|guy|man|boy|he/him|mr\.)(?!\w)", re.IGNORECASE)
+_FEMALE_BIO = re.compile(r"\b(?:mom|mother|wife|girl|woman|lady|she/her|ms\.|mrs\.)(?!\w)", re.IGNORECASE)
+_MALE_TAG = re.compile(r'boy|mens?\b|male', re.IGNORECASE)
+_FEMALE_TAG = re.compile(r'girl|women|female|lady', re.IGNORECASE)
+
+
+def infer_gender(bio: str, tags: List[str]) -> str:
+    """'male' / 'female' from bio keywords, then from the source tags; 'unknown' otherwise"""
+    if _MALE_BIO.search(bio or ''):
+        return 'male'
+    if _FEMALE_BIO.search(bio or ''):
+        return 'female'
+    for tag in tags:
+        # 'female' contains 'male' and 'women' contains 'men': check the female side first
+        if _FEMALE_TAG.search(tag):
+            return 'female'
+        if _MALE_TAG.search(tag):
+            return 'male'
+    return 'unknown'
+
+
+class Predicate:
+    """A filter over profile fields. `cost` is the check itself; loading `fields` is priced separately."""
+    name = ''
+    fields: tuple = ()
+    # Filter values the outcome depends on (see FilterPlan.signature)
+    params: tuple = ()
+    # Whether the outcome also depends on the tag the account was found under
+    uses_tags = False
+    cost = 0.0
+
+    def active(self, filters: Dict) -> bool:
+        return True
+
+    def reject(self, profile: Dict, filters: Dict) -> Optional[str]:
+        """Rejection reason, or None when the profile passes"""
+        raise NotImplementedError
+
+
+class FollowerRange(Predicate):
+    name = 'followers'
+    fields = ('followers',)
+    params = ('min_followers', 'max_followers')
+
+    def reject(self, profile, filters):
+        min_f = int(filters.get('min_followers') or 0)
+        max_f = int(filters.get('max_followers') or 1000000000)
+        if not (min_f <= profile['followers'] <= max_f):
+            return f"Followers ({profile['followers']}) not in range {min_f}-{max_f}"
+        return None
+
+
+class Gender(Predicate):
+    """Bio / tag keywords; only a clear mismatch rejects, 'unknown' passes"""
+    name = 'gender'
+    fields = ('biography',)
+    params = ('gender',)
+    uses_tags = True
+
+    def active(self, filters):
+        return filters.get('gender', 'both') in ('male', 'female')
+
+    def reject(self, profile, filters):
+        gender = infer_gender(profile.get('biography', ''), profile.get('tags_matched') or [])
+        if gender != 'unknown' and gender != filters['gender']:
+            return f"Gender looks {gender}, wanted {filters['gender']}"
+        return None
+
+
+class Country(Predicate):
+    name = 'country'
+    fields = ('country_code',)
+    params = ('country_code',)
+
+    def active(self, filters):
+        return bool(filters.get('country'))
+
+    def reject(self, profile, filters):
+        wanted = filters.get('country_code')
+        if not profile.get('country_code'):
+            return f"Country unknown, wanted {filters['country']}"
+        if profile['country_code'] != wanted:
+            return f"Country {profile['country_code']} not {wanted or filters['country']}"
+        return None
+
+
+class MinEngagement(Predicate):
+    name = 'engagement'
+    fields = ('engagement_rate',)
+    params = ('min_engagement',)
+
+    def active(self, filters):
+        return float(filters.get('min_engagement') or 0) > 0
+
+    def reject(self, profile, filters):
+        minimum = float(filters['min_engagement'])
+        if profile.get('engagement_rate', 0) < minimum:
+            return f"Engagement {profile.get('engagement_rate', 0)}% below {minimum}%"
+        return None
+
+
+PREDICATES = (FollowerRange(), Gender(), Country(), MinEngagement())
+
+
+class GroupCosts:
+    """Moving average of how long each field group takes to load, shared process-wide"""
+
+    def __init__(self, seeds: Dict[str, float] = DEFAULT_GROUP_COSTS, alpha: float = 0.2):
+        self.costs = dict(seeds)
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def observe(self, group: str, seconds: float):
+        with self._lock:
+            old = self.costs.get(group, seconds)
+            self.costs[group] = old + self.alpha * (seconds - old)
+
+    def get(self, group: str) -> float:
+        with self._lock:
+            return self.costs.get(group, 0.0)
+
+
+_group_costs = GroupCosts()
+
+
+def default_costs() -> GroupCosts:
+    return _group_costs
+
+
+class FilterStats:
+    """Per-search counters shared by every scraper working on the search"""
+
+    def __init__(self, names: List[str]):
+        self._lock = threading.Lock()
+        self.checked = {n: 0 for n in names}
+        self.rejected = {n: 0 for n in names}
+        self.saved = {n: 0.0 for n in names}
+
+    def record(self, name: str, rejected: bool, saved: float = 0.0):
+        with self._lock:
+            self.checked[name] += 1
+            if rejected:
+                self.rejected[name] += 1
+                self.saved[name] += saved
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                'predicates': {
+                    n: {'checked': self.checked[n], 'rejected': self.rejected[n], 'seconds_saved': round(self.saved[n], 1)}
+                    for n in self.checked
+                },
+                'rejected': sum(self.rejected.values()),
+                'seconds_saved': round(sum(self.saved.values()), 1),
+            }
+
+    def summary(self) -> str:
+        report = self.report()
+        if not report['predicates']:
+            return "Filters: none active"
+        parts = [f"{n} rejected {v['rejected']}/{v['checked']}" for n, v in report['predicates'].items()]
+        return f"Filters: {', '.join(parts)} (~{report['seconds_saved']:.0f}s of browser work skipped)"
+
+
+class FilterPlan:
+    """
+    One search's active predicates. A profile is checked cheapest-first,
+    where a predicate's price is its own cost plus loading whatever field
+    groups it needs that are not available yet, and the first rejection
+    stops the analysis. Time saved is the estimated cost of the groups a
+    rejected profile never had to load.
+    """
+
+    def __init__(self, filters: Dict, predicates=PREDICATES, costs: Optional[GroupCosts] = None):
+        self.filters = dict(filters)
+        if self.filters.get('country'):
+            self.filters['country_code'] = get_gazetteer().resolve(self.filters['country'])
+        self.predicates = [p for p in predicates if p.active(self.filters)]
+        self.costs = costs or default_costs()
+        self.stats = FilterStats([p.name for p in self.predicates])
+        self.signature = self._signature()
+        self.uses_tags = any(p.uses_tags for p in self.predicates)
+
+    def _signature(self) -> str:
+        """Same string for any two plans that reject exactly the same profiles"""
+        values = {}
+        for p in self.predicates:
+            for param in p.params:
+                value = self.filters.get(param)
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    value = str(value or '').lower()
+                values[param] = value
+        return json.dumps(values, sort_keys=True)
+
+    def signature_for(self, tags: List[str]) -> str:
+        """The signature, plus the tags when a predicate reads them (gender falls back to tag keywords)"""
+        if not self.uses_tags:
+            return self.signature
+        return self.signature + json.dumps(sorted({t.lower().lstrip('#') for t in tags}))
+
+    def start(self, profile: Dict) -> 'ProfileCheck':
+        return ProfileCheck(self, profile)
+
+
+class ProfileCheck:
+    """Filter state for one profile: which fields are available and which predicates already passed"""
+
+    def __init__(self, plan: FilterPlan, profile: Dict):
+        self.plan = plan
+        self.profile = profile
+        self.available: Set[str] = set()
+        self.passed: Set[str] = set()
+        # Fields left at their defaults because a load came back empty
+        self.unread: Set[str] = set()
+        self.reason: Optional[str] = None
+        self.rejected_by: Optional[Predicate] = None
+
+    def add(self, fields, read: bool = True):
+        self.available.update(fields)
+        if not read:
+            self.unread.update(fields)
+
+    def _missing_groups(self, predicate: Predicate) -> Set[str]:
+        return {field_group(f) for f in predicate.fields if f not in self.available}
+
+    def _price(self, predicate: Predicate) -> float:
+        return predicate.cost + sum(self.plan.costs.get(g) for g in self._missing_groups(predicate))
+
+    def run(self, load: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """
+        Evaluate pending predicates cheapest-first. Without `load` only those
+        whose fields are already available run; with it, missing groups are
+        loaded on demand; `load(group)` returns False when it could not read
+        the group. Returns the first rejection reason, or None.
+        """
+        pending = [p for p in self.plan.predicates if p.name not in self.passed]
+        for predicate in sorted(pending, key=self._price):
+            missing = self._missing_groups(predicate)
+            if missing and not load:
+                continue
+            for group in sorted(missing, key=GROUPS.index):
+                self.add(GROUP_FIELDS[group], read=load(group) is not False)
+            reason = predicate.reject(self.profile, self.plan.filters)
+            if reason:
+                self.reason = reason
+                self.rejected_by = predicate
+                self.plan.stats.record(predicate.name, True, self.seconds_saved())
+                return reason
+            self.passed.add(predicate.name)
+            self.plan.stats.record(predicate.name, False)
+        return None
+
+    def groups_needed(self) -> Set[str]:
+        """Groups the predicates that have not run yet still need loaded"""
+        needed: Set[str] = set()
+        for predicate in self.plan.predicates:
+            if predicate.name not in self.passed:
+                needed |= self._missing_groups(predicate)
+        return needed
+
+    def conclusive(self) -> bool:
+        """Whether the rejection rests on fields that were read, not on the defaults of a failed read"""
+        return bool(self.rejected_by) and not self.unread.intersection(self.rejected_by.fields)
+
+    def group_ready(self, group: str) -> bool:
+        return self.available.issuperset(GROUP_FIELDS[group])
+
+    def seconds_saved(self) -> float:
+        """Estimated load time of every group this profile will now skip"""
+        return sum(self.plan.costs.get(g) for g in GROUPS if not self.group_ready(g))
@@ -0,0 +1,270 @@
+"""
+Gazetteer - Location text to ISO country code with a compiled Aho-Corasick automaton
+"""
+
+import bisect
+import re
+import threading
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from gazetteer_data import CASE_SENSITIVE, CITIES, COUNTRIES, REGIONS, SUBDIVISION_CODES
+
+# A country name outweighs a region, which outweighs a city ("London, Ontario" -> CA).
+# Case-sensitive aliases are ambiguous (people named Chad or Jordan) and only weigh as a city.
+# A trailing state / province code weighs as a region, so it beats a same-named city elsewhere ("Melbourne, FL" -> US).
+WEIGHTS = {'flag': 4, 'country': 3, 'region': 2, 'code': 2, 'city': 1}
+_AMBIGUOUS_WEIGHT = 1
+_KIND_ORDER = ('country', 'region', 'city')
+
+# "[,] XX" at the end of a line (comma, abbreviation); the word before it is checked separately
+_TRAILING_CODE = re.compile(r'(,?)[ \t]+([A-Z]{2,3})\.?[ \t]*$', re.MULTILINE)
+_LAST_WORD = re.compile(r"[^\W\d_][\w.'’]*$")
+# 🇺🇸 = REGIONAL INDICATOR U + REGIONAL INDICATOR S
+_FLAG = re.compile('[\U0001F1E6-\U0001F1FF]{2}')
+_SEPARATORS = {'-': ' ', '_': ' ', '’': "'", ' ': ' '}
+
+
+class Match(NamedTuple):
+    code: str
+    kind: str
+    alias: str
+    start: int
+    end: int
+    weight: int
+
+
+def _fold_char(ch: str) -> str:
+    """Lowercase, accent-free, one character in -> one character out (keeps offsets aligned)"""
+    if ch in _SEPARATORS:
+        return _SEPARATORS[ch]
+    low = ch.lower()
+    if len(low) != 1:
+        return ch
+    if low.isascii():
+        return low
+    base = ''.join(c for c in unicodedata.normalize('NFKD', low) if not unicodedata.combining(c))
+    return base if len(base) == 1 else low
+
+
+class _FoldTable(dict):
+    """str.translate table that folds each distinct character once, on first sight"""
+
+    def __missing__(self, code: int) -> str:
+        folded = self[code] = _fold_char(chr(code))
+        return folded
+
+
+_FOLD = _FoldTable()
+
+
+def fold(text: str) -> str:
+    return text.translate(_FOLD)
+
+
+def _flag_code(flag: str) -> str:
+    return ''.join(chr(ord(c) - 0x1F1E6 + ord('A')) for c in flag)
+
+
+class Gazetteer:
+    """
+    Every country name / alias, region and city is compiled once into a
+    single Aho-Corasick automaton over case- and accent-folded text, so a
+    location string (or a whole batch of them) is classified in one linear
+    scan. Matches must sit on word boundaries; aliases in CASE_SENSITIVE
+    ("US", "LA", "Chad") only count with their exact capitalization. A
+    state / province abbreviation ending the text ("Melbourne, FL") points
+    to the country a place named before it shares, else to the first
+    country using it.
+    """
+
+    def __init__(self, countries: Dict = COUNTRIES, regions: Dict = REGIONS, cities: Dict = CITIES,
+                 case_sensitive=CASE_SENSITIVE, subdivisions: Dict = SUBDIVISION_CODES):
+        self.names = {code: names[0] for code, names in countries.items()}
+        # Filter values are typed by people: any country alias, in any case, standing alone
+        self._country_keys: Dict[str, str] = {}
+        for code, aliases in countries.items():
+            for alias in aliases:
+                self._country_keys.setdefault(fold(alias), code)
+        # Abbreviation -> countries using it (ISO codes themselves come last: "Mumbai, IN")
+        self._subdivisions: Dict[str, List[str]] = {}
+        for code, abbrevs in subdivisions.items():
+            for abbrev in abbrevs:
+                self._subdivisions.setdefault(abbrev, []).append(code)
+        for code in self.names:
+            self._subdivisions.setdefault(code, []).append(code)
+        # Automaton: goto transitions, failure links, pattern ids ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        # Pattern id -> candidate entries (alias, code, kind, case_sensitive), strongest kind first
+        self._patterns: List[List[tuple]] = []
+        self._lengths: List[int] = []
+
+        by_key: Dict[str, int] = {}
+        for kind, table in zip(_KIND_ORDER, (countries, regions, cities)):
+            for code, aliases in table.items():
+                for alias in aliases:
+                    key = fold(alias)
+                    if key not in by_key:
+                        by_key[key] = self._add(key)
+                    entries = self._patterns[by_key[key]]
+                    if not any(e[0] == alias and e[1] == code for e in entries):
+                        entries.append((alias, code, kind, alias in case_sensitive))
+        self._link()
+
+    def _add(self, key: str) -> int:
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        pid = len(self._patterns)
+        self._patterns.append([])
+        self._lengths.append(len(key))
+        self._out[state].append(pid)
+        return pid
+
+    def _link(self):
+        """Breadth-first failure links; outputs are merged along them"""
+        q = deque(self._goto[0].values())
+        while q:
+            state = q.popleft()
+            for ch, nxt in self._goto[state].items():
+                q.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _scan(self, text: str) -> List[Match]:
+        """All word-bounded matches, reduced to leftmost-longest non-overlapping ones"""
+        folded = fold(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        raw = []
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if end < len(folded) and folded[end].isalnum():
+                continue
+            for pid in out[state]:
+                start = end - self._lengths[pid]
+                if start > 0 and folded[start - 1].isalnum():
+                    continue
+                for alias, code, kind, exact in self._patterns[pid]:
+                    if not exact or text[start:end] == alias:
+                        raw.append(Match(code, kind, alias, start, end, _AMBIGUOUS_WEIGHT if exact else WEIGHTS[kind]))
+                        break
+
+        raw.sort(key=lambda m: (m.start, m.start - m.end))
+        matches, last_end = [], 0
+        for m in raw:
+            if m.start >= last_end:
+                matches.append(m)
+                last_end = m.end
+        for m in _TRAILING_CODE.finditer(text):
+            code = self._trailing_code(text, m, matches)
+            if code:
+                matches.append(Match(code, 'code', m.group(2), m.start(2), m.end(2), WEIGHTS['code']))
+        for m in _FLAG.finditer(text):
+            code = _flag_code(m.group())
+            if code in self.names:
+                matches.append(Match(code, 'flag', m.group(), m.start(), m.end(), WEIGHTS['flag']))
+        return matches
+
+    def _trailing_code(self, text: str, m: 're.Match', matches: List[Match]) -> Optional[str]:
+        """
+        Country of a line-ending abbreviation, or None when it is not an
+        address: it must follow a place we matched ("Melbourne FL") or a
+        capitalized word and a comma ("Springfield, IL"), not "DM ME".
+        """
+        countries = self._subdivisions.get(m.group(2))
+        if not countries:
+            return None
+        line_start = text.rfind('\n', 0, m.start()) + 1
+        word = _LAST_WORD.search(text, line_start, m.start())
+        if not word:
+            return None
+        before = [p for p in matches if line_start <= p.start and p.end <= m.start()]
+        after_place = bool(before) and before[-1].end == m.start()
+        capitalized = word.group()[0].isupper() and not word.group().isupper()
+        if not after_place and not (m.group(1) and capitalized):
+            return None
+        for place in reversed(before):
+            if place.code in countries:
+                return place.code
+        return countries[0]
+
+    def find(self, text: str) -> List[Match]:
+        return self._scan(text or '')
+
+    @staticmethod
+    def _best(matches: List[Match]) -> Optional[str]:
+        scores: Dict[str, int] = {}
+        first: Dict[str, int] = {}
+        for m in matches:
+            scores[m.code] = scores.get(m.code, 0) + m.weight
+            first.setdefault(m.code, m.start)
+        if not scores:
+            return None
+        return max(scores, key=lambda code: (scores[code], -first[code]))
+
+    def normalize(self, text: str) -> Optional[str]:
+        """'Based in NYC 🗽' -> 'US'; None when nothing recognizable"""
+        return self._best(self.find(text))
+
+    def classify(self, texts: Iterable[str]) -> List[Optional[str]]:
+        """normalize() for a whole batch with one automaton pass over the joined texts"""
+        texts = [t or '' for t in texts]
+        starts, offset = [], 0
+        for t in texts:
+            starts.append(offset)
+            offset += len(t) + 1
+        buckets: List[List[Match]] = [[] for _ in texts]
+        for m in self._scan('\n'.join(texts)):
+            buckets[bisect.bisect_right(starts, m.start) - 1].append(m)
+        return [self._best(b) for b in buckets]
+
+    def resolve(self, country: str) -> Optional[str]:
+        """Filter value ('US', 'us', 'United States', 'USA') -> ISO code"""
+        country = (country or '').strip()
+        if len(country) == 2 and country.upper() in self.names:
+            return country.upper()
+        return (self._country_keys.get(fold(country)) or self.normalize(country)
+                or self.normalize(country.title()))
+
+    def matches(self, text: str, country: str) -> bool:
+        code = self.resolve(country)
+        return bool(code) and self.normalize(text) == code
+
+    def name(self, code: Optional[str]) -> str:
+        return self.names.get(code or '', '')
+
+
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Process-wide automaton, compiled on first use"""
+    global _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            _gazetteer = Gazetteer()
+        return _gazetteer
+
+
+def normalize_country(text: str) -> Optional[str]:
+    return get_gazetteer().normalize(text)
@@ -0,0 +1,432 @@
+"""
+Gazetteer Data - Countries (ISO 3166-1 alpha-2), aliases, regions and major cities
+"""
+
+# code: (display name, *aliases)
+COUNTRIES = {
+    'AD': ('Andorra',),
+    'AE': ('United Arab Emirates', 'UAE', 'Emirates', 'U.A.E.'),
+    'AF': ('Afghanistan',),
+    'AG': ('Antigua and Barbuda', 'Antigua', 'Barbuda'),
+    'AI': ('Anguilla',),
+    'AL': ('Albania',),
+    'AM': ('Armenia',),
+    'AO': ('Angola',),
+    'AQ': ('Antarctica',),
+    'AR': ('Argentina',),
+    'AS': ('American Samoa',),
+    'AT': ('Austria', 'Österreich'),
+    'AU': ('Australia', 'Aussie'),
+    'AW': ('Aruba',),
+    'AX': ('Åland Islands', 'Aland'),
+    'AZ': ('Azerbaijan',),
+    'BA': ('Bosnia and Herzegovina', 'Bosnia', 'Herzegovina', 'BiH'),
+    'BB': ('Barbados',),
+    'BD': ('Bangladesh',),
+    'BE': ('Belgium', 'België', 'Belgique'),
+    'BF': ('Burkina Faso',),
+    'BG': ('Bulgaria',),
+    'BH': ('Bahrain',),
+    'BI': ('Burundi',),
+    'BJ': ('Benin',),
+    'BL': ('Saint Barthélemy', 'St Barths', 'St. Barths', 'St Barts'),
+    'BM': ('Bermuda',),
+    'BN': ('Brunei', 'Brunei Darussalam'),
+    'BO': ('Bolivia',),
+    'BQ': ('Caribbean Netherlands', 'Bonaire', 'Sint Eustatius', 'Saba'),
+    'BR': ('Brazil', 'Brasil'),
+    'BS': ('Bahamas', 'The Bahamas'),
+    'BT': ('Bhutan',),
+    'BV': ('Bouvet Island',),
+    'BW': ('Botswana',),
+    'BY': ('Belarus',),
+    'BZ': ('Belize',),
+    'CA': ('Canada',),
+    'CC': ('Cocos (Keeling) Islands', 'Cocos Islands', 'Keeling Islands'),
+    'CD': ('DR Congo', 'Democratic Republic of the Congo', 'Congo-Kinshasa', 'DRC'),
+    'CF': ('Central African Republic',),
+    'CG': ('Republic of the Congo', 'Congo-Brazzaville', 'Congo'),
+    'CH': ('Switzerland', 'Schweiz', 'Suisse', 'Svizzera'),
+    'CI': ("Côte d'Ivoire", 'Cote dIvoire', 'Ivory Coast'),
+    'CK': ('Cook Islands',),
+    'CL': ('Chile',),
+    'CM': ('Cameroon', 'Cameroun'),
+    'CN': ('China', "People's Republic of China", 'PRC', 'Mainland China'),
+    'CO': ('Colombia',),
+    'CR': ('Costa Rica',),
+    'CU': ('Cuba',),
+    'CV': ('Cape Verde', 'Cabo Verde'),
+    'CW': ('Curaçao', 'Curacao'),
+    'CX': ('Christmas Island',),
+    'CY': ('Cyprus',),
+    'CZ': ('Czechia', 'Czech Republic'),
+    'DE': ('Germany', 'Deutschland'),
+    'DJ': ('Djibouti',),
+    'DK': ('Denmark', 'Danmark'),
+    'DM': ('Dominica',),
+    'DO': ('Dominican Republic', 'República Dominicana', 'Republica Dominicana'),
+    'DZ': ('Algeria', 'Algérie'),
+    'EC': ('Ecuador',),
+    'EE': ('Estonia', 'Eesti'),
+    'EG': ('Egypt',),
+    'EH': ('Western Sahara',),
+    'ER': ('Eritrea',),
+    'ES': ('Spain', 'España', 'Espana'),
+    'ET': ('Ethiopia',),
+    'FI': ('Finland', 'Suomi'),
+    'FJ': ('Fiji',),
+    'FK': ('Falkland Islands', 'Falklands', 'Malvinas'),
+    'FM': ('Micronesia',),
+    'FO': ('Faroe Islands', 'Faroes'),
+    'FR': ('France',),
+    'GA': ('Gabon',),
+    'GB': ('United Kingdom', 'UK', 'U.K.', 'Great Britain', 'Britain', 'GB'),
+    'GD': ('Grenada',),
+    'GE': ('Georgia', 'Sakartvelo'),
+    'GF': ('French Guiana', 'Guyane'),
+    'GG': ('Guernsey',),
+    'GH': ('Ghana',),
+    'GI': ('Gibraltar',),
+    'GL': ('Greenland',),
+    'GM': ('Gambia', 'The Gambia'),
+    'GN': ('Guinea',),
+    'GP': ('Guadeloupe',),
+    'GQ': ('Equatorial Guinea',),
+    'GR': ('Greece', 'Hellas', 'Ελλάδα'),
+    'GS': ('South Georgia and the South Sandwich Islands', 'South Georgia'),
+    'GT': ('Guatemala',),
+    'GU': ('Guam',),
+    'GW': ('Guinea-Bissau',),
+    'GY': ('Guyana',),
+    'HK': ('Hong Kong', 'HK'),
+    'HM': ('Heard Island and McDonald Islands',),
+    'HN': ('Honduras',),
+    'HR': ('Croatia', 'Hrvatska'),
+    'HT': ('Haiti', 'Haïti'),
+    'HU': ('Hungary', 'Magyarország'),
+    'ID': ('Indonesia',),
+    'IE': ('Ireland', 'Éire', 'Republic of Ireland'),
+    'IL': ('Israel',),
+    'IM': ('Isle of Man',),
+    'IN': ('India', 'Bharat'),
+    'IO': ('British Indian Ocean Territory',),
+    'IQ': ('Iraq',),
+    'IR': ('Iran',),
+    'IS': ('Iceland', 'Ísland'),
+    'IT': ('Italy', 'Italia'),
+    'JE': ('Jersey',),
+    'JM': ('Jamaica',),
+    'JO': ('Jordan',),
+    'JP': ('Japan', 'Nippon', '日本'),
+    'KE': ('Kenya',),
+    'KG': ('Kyrgyzstan',),
+    'KH': ('Cambodia',),
+    'KI': ('Kiribati',),
+    'KM': ('Comoros',),
+    'KN': ('Saint Kitts and Nevis', 'St Kitts', 'St. Kitts', 'Nevis'),
+    'KP': ('North Korea', 'DPRK'),
+    'KR': ('South Korea', 'Korea', 'Republic of Korea', '한국'),
+    'KW': ('Kuwait',),
+    'KY': ('Cayman Islands', 'Caymans'),
+    'KZ': ('Kazakhstan',),
+    'LA': ('Laos', 'Lao PDR'),
+    'LB': ('Lebanon', 'Liban'),
+    'LC': ('Saint Lucia', 'St Lucia', 'St. Lucia'),
+    'LI': ('Liechtenstein',),
+    'LK': ('Sri Lanka',),
+    'LR': ('Liberia',),
+    'LS': ('Lesotho',),
+    'LT': ('Lithuania', 'Lietuva'),
+    'LU': ('Luxembourg',),
+    'LV': ('Latvia', 'Latvija'),
+    'LY': ('Libya',),
+    'MA': ('Morocco', 'Maroc'),
+    'MC': ('Monaco',),
+    'MD': ('Moldova',),
+    'ME': ('Montenegro', 'Crna Gora'),
+    'MF': ('Saint Martin',),
+    'MG': ('Madagascar',),
+    'MH': ('Marshall Islands',),
+    'MK': ('North Macedonia', 'Macedonia'),
+    'ML': ('Mali',),
+    'MM': ('Myanmar', 'Burma'),
+    'MN': ('Mongolia',),
+    'MO': ('Macau', 'Macao'),
+    'MP': ('Northern Mariana Islands', 'Saipan'),
+    'MQ': ('Martinique',),
+    'MR': ('Mauritania',),
+    'MS': ('Montserrat',),
+    'MT': ('Malta',),
+    'MU': ('Mauritius',),
+    'MV': ('Maldives',),
+    'MW': ('Malawi',),
+    'MX': ('Mexico', 'México'),
+    'MY': ('Malaysia',),
+    'MZ': ('Mozambique', 'Moçambique'),
+    'NA': ('Namibia',),
+    'NC': ('New Caledonia', 'Nouvelle-Calédonie'),
+    'NE': ('Niger',),
+    'NF': ('Norfolk Island',),
+    'NG': ('Nigeria', 'Naija'),
+    'NI': ('Nicaragua',),
+    'NL': ('Netherlands', 'The Netherlands', 'Holland', 'Nederland'),
+    'NO': ('Norway', 'Norge'),
+    'NP': ('Nepal',),
+    'NR': ('Nauru',),
+    'NU': ('Niue',),
+    'NZ': ('New Zealand', 'Aotearoa', 'NZ'),
+    'OM': ('Oman',),
+    'PA': ('Panama', 'Panamá'),
+    'PE': ('Peru', 'Perú'),
+    'PF': ('French Polynesia', 'Tahiti'),
+    'PG': ('Papua New Guinea', 'PNG'),
+    'PH': ('Philippines', 'Pilipinas'),
+    'PK': ('Pakistan',),
+    'PL': ('Poland', 'Polska'),
+    'PM': ('Saint Pierre and Miquelon',),
+    'PN': ('Pitcairn Islands', 'Pitcairn'),
+    'PR': ('Puerto Rico',),
+    'PS': ('Palestine', 'State of Palestine', 'West Bank', 'Gaza'),
+    'PT': ('Portugal',),
+    'PW': ('Palau',),
+    'PY': ('Paraguay',),
+    'QA': ('Qatar',),
+    'RE': ('Réunion', 'Reunion Island'),
+    'RO': ('Romania', 'România'),
+    'RS': ('Serbia', 'Srbija'),
+    'RU': ('Russia', 'Russian Federation', 'Россия'),
+    'RW': ('Rwanda',),
+    'SA': ('Saudi Arabia', 'KSA', 'Saudi'),
+    'SB': ('Solomon Islands',),
+    'SC': ('Seychelles',),
+    'SD': ('Sudan',),
+    'SE': ('Sweden', 'Sverige'),
+    'SG': ('Singapore',),
+    'SH': ('Saint Helena',),
+    'SI': ('Slovenia', 'Slovenija'),
+    'SJ': ('Svalbard and Jan Mayen', 'Svalbard'),
+    'SK': ('Slovakia', 'Slovensko'),
+    'SL': ('Sierra Leone',),
+    'SM': ('San Marino',),
+    'SN': ('Senegal', 'Sénégal'),
+    'SO': ('Somalia',),
+    'SR': ('Suriname',),
+    'SS': ('South Sudan',),
+    'ST': ('São Tomé and Príncipe', 'Sao Tome'),
+    'SV': ('El Salvador',),
+    'SX': ('Sint Maarten',),
+    'SY': ('Syria',),
+    'SZ': ('Eswatini', 'Swaziland'),
+    'TC': ('Turks and Caicos Islands', 'Turks and Caicos'),
+    'TD': ('Chad',),
+    'TF': ('French Southern Territories',),
+    'TG': ('Togo',),
+    'TH': ('Thailand',),
+    'TJ': ('Tajikistan',),
+    'TK': ('Tokelau',),
+    'TL': ('Timor-Leste', 'East Timor'),
+    'TM': ('Turkmenistan',),
+    'TN': ('Tunisia', 'Tunisie'),
+    'TO': ('Tonga',),
+    'TR': ('Türkiye', 'Turkey', 'Turkiye'),
+    'TT': ('Trinidad and Tobago', 'Trinidad', 'Tobago'),
+    'TV': ('Tuvalu',),
+    'TW': ('Taiwan',),
+    'TZ': ('Tanzania', 'Zanzibar'),
+    'UA': ('Ukraine', 'Україна'),
+    'UG': ('Uganda',),
+    'UM': ('United States Minor Outlying Islands',),
+    'US': ('United States', 'United States of America', 'USA', 'U.S.A.', 'U.S.', 'US'),
+    'UY': ('Uruguay',),
+    'UZ': ('Uzbekistan',),
+    'VA': ('Vatican City', 'Holy See', 'Vatican'),
+    'VC': ('Saint Vincent and the Grenadines', 'St Vincent', 'St. Vincent'),
+    'VE': ('Venezuela',),
+    'VG': ('British Virgin Islands', 'BVI'),
+    'VI': ('U.S. Virgin Islands', 'US Virgin Islands', 'USVI'),
+    'VN': ('Vietnam', 'Viet Nam'),
+    'VU': ('Vanuatu',),
+    'WF': ('Wallis and Futuna',),
+    'WS': ('Samoa',),
+    'XK': ('Kosovo',),
+    'YE': ('Yemen',),
+    'YT': ('Mayotte',),
+    'ZA': ('South Africa', 'RSA', 'Mzansi'),
+    'ZM': ('Zambia',),
+    'ZW': ('Zimbabwe',),
+}
+
+# States, provinces and constituent countries
+REGIONS = {
+    'US': (
+        'Alabama', 'Alaska', 'Arizona', 'Arkansas', 'California', 'Colorado', 'Connecticut', 'Delaware',
+        'Florida', 'Hawaii', 'Idaho', 'Illinois', 'Indiana', 'Iowa', 'Kansas', 'Kentucky', 'Louisiana',
+        'Maine', 'Maryland', 'Massachusetts', 'Michigan', 'Minnesota', 'Mississippi', 'Missouri', 'Montana',
+        'Nebraska', 'Nevada', 'New Hampshire', 'New Jersey', 'New Mexico', 'New York State', 'North Carolina',
+        'North Dakota', 'Ohio', 'Oklahoma', 'Oregon', 'Pennsylvania', 'Rhode Island', 'South Carolina',
+        'South Dakota', 'Tennessee', 'Texas', 'Utah', 'Vermont', 'Virginia', 'Washington State', 'West Virginia',
+        'Wisconsin', 'Wyoming', 'SoCal', 'NorCal', 'Bay Area', 'Silicon Valley', 'Long Island', 'Brooklyn',
+        'Manhattan', 'Queens', 'The Bronx', 'Staten Island', 'Hollywood', 'Beverly Hills',
+    ),
+    'CA': (
+        'Ontario', 'Quebec', 'Québec', 'British Columbia', 'Alberta', 'Manitoba', 'Saskatchewan', 'Nova Scotia',
+        'New Brunswick', 'Newfoundland', 'Prince Edward Island', 'Yukon', 'Nunavut', 'Northwest Territories',
+    ),
+    'AU': (
+        'New South Wales', 'Queensland', 'South Australia', 'Western Australia', 'Tasmania',
+        'Northern Territory', 'Gold Coast', 'Sunshine Coast',
+    ),
+    'GB': ('England', 'Scotland', 'Wales', 'Northern Ireland', 'Cornwall', 'Yorkshire'),
+    'IN': ('Maharashtra', 'Karnataka', 'Tamil Nadu', 'Kerala', 'Gujarat', 'Rajasthan', 'Uttar Pradesh', 'Goa', 'Telangana'),
+    'DE': ('Bavaria', 'Bayern'),
+    'ES': ('Catalonia', 'Catalunya', 'Andalusia', 'Andalucía', 'Canary Islands', 'Ibiza', 'Mallorca', 'Majorca'),
+    'IT': ('Tuscany', 'Toscana', 'Sicily', 'Sicilia', 'Sardinia', 'Lombardy', 'Amalfi Coast'),
+    'FR': ('Provence', 'Côte d’Azur', "Côte d'Azur", 'Cote dAzur', 'Normandy', 'Brittany', 'Corsica', 'Riviera'),
+    'ID': ('Bali', 'Java', 'Sumatra', 'Lombok'),
+    'MX': ('Baja California', 'Yucatán', 'Yucatan', 'Jalisco', 'Quintana Roo'),
+    'BR': ('São Paulo State', 'Minas Gerais', 'Bahia'),
+    'GR': ('Santorini', 'Mykonos', 'Crete'),
+    'TH': ('Phuket', 'Koh Samui'),
+    'MY': ('Sabah', 'Sarawak', 'Penang'),
+    'PH': ('Cebu', 'Luzon', 'Mindanao', 'Palawan', 'Boracay'),
+    'PT': ('Algarve', 'Madeira', 'Azores'),
+    'NL': ('North Holland', 'South Holland'),
+    'AE': ('Sharjah', 'Ajman', 'Ras Al Khaimah'),
+}
+
+# Major cities (well-known international names plus local spellings)
+CITIES = {
+    'US': (
+        'New York', 'New York City', 'NYC', 'NY', 'Los Angeles', 'LA', 'San Francisco', 'SF', 'Chicago',
+        'Houston', 'Phoenix', 'Philadelphia', 'Philly', 'San Antonio', 'San Diego', 'Dallas', 'San Jose', 'Austin',
+        'Jacksonville', 'Fort Worth', 'Columbus', 'Charlotte', 'Indianapolis', 'Seattle', 'Denver',
+        'Washington DC', 'Washington D.C.', 'DC', 'D.C.', 'Boston', 'Nashville', 'Detroit', 'Portland', 'Las Vegas',
+        'Vegas', 'Memphis', 'Louisville', 'Baltimore', 'Milwaukee', 'Albuquerque', 'Tucson', 'Fresno',
+        'Sacramento', 'Atlanta', 'ATL', 'Miami', 'Orlando', 'Tampa', 'Raleigh', 'Minneapolis', 'New Orleans',
+        'NOLA', 'Cleveland', 'Pittsburgh', 'Cincinnati', 'Kansas City', 'St. Louis', 'Saint Louis', 'Salt Lake City',
+        'Honolulu', 'Anchorage', 'Oakland', 'Long Beach', 'Santa Monica', 'Malibu', 'Scottsdale', 'Boise',
+        'Richmond VA', 'Savannah', 'Charleston', 'Miami Beach', 'Palm Beach', 'Fort Lauderdale', 'Brooklyn NY',
+    ),
+    'CA': (
+        'Toronto', 'Montreal', 'Montréal', 'Vancouver', 'Calgary', 'Edmonton', 'Ottawa', 'Winnipeg',
+        'Quebec City', 'Hamilton', 'Halifax', 'Victoria BC', 'Mississauga', 'Kelowna', 'Saskatoon', 'Regina',
+    ),
+    'GB': (
+        'London', 'Manchester', 'Birmingham', 'Liverpool', 'Leeds', 'Glasgow', 'Edinburgh', 'Bristol', 'Cardiff',
+        'Belfast', 'Sheffield', 'Newcastle', 'Nottingham', 'Leicester', 'Brighton', 'Oxford', 'Cambridge',
+        'Southampton', 'Aberdeen', 'Coventry', 'York',
+    ),
+    'AU': ('Sydney', 'Melbourne', 'Brisbane', 'Perth', 'Adelaide', 'Canberra', 'Hobart', 'Darwin', 'Byron Bay', 'Cairns'),
+    'NZ': ('Auckland', 'Wellington', 'Christchurch', 'Queenstown'),
+    'IE': ('Dublin', 'Cork', 'Galway', 'Limerick'),
+    'FR': ('Paris', 'Marseille', 'Lyon', 'Toulouse', 'Bordeaux', 'Lille', 'Strasbourg', 'Montpellier', 'Nantes', 'Cannes', 'Saint-Tropez'),
+    'DE': ('Berlin', 'Munich', 'München', 'Hamburg', 'Cologne', 'Köln', 'Frankfurt', 'Stuttgart', 'Düsseldorf', 'Dusseldorf', 'Leipzig', 'Dresden'),
+    'ES': ('Madrid', 'Barcelona', 'Valencia', 'Seville', 'Sevilla', 'Málaga', 'Malaga', 'Bilbao', 'Marbella', 'Palma'),
+    'IT': ('Rome', 'Roma', 'Milan', 'Milano', 'Naples', 'Napoli', 'Turin', 'Torino', 'Florence', 'Firenze', 'Venice', 'Venezia', 'Bologna', 'Palermo'),
+    'PT': ('Lisbon', 'Lisboa', 'Porto'),
+    'NL': ('Amsterdam', 'Rotterdam', 'The Hague', 'Den Haag', 'Utrecht', 'Eindhoven'),
+    'BE': ('Brussels', 'Bruxelles', 'Antwerp', 'Antwerpen', 'Ghent', 'Gent', 'Bruges'),
+    'CH': ('Zurich', 'Zürich', 'Geneva', 'Genève', 'Basel', 'Lausanne', 'Bern'),
+    'AT': ('Vienna', 'Wien', 'Salzburg', 'Innsbruck', 'Graz'),
+    'SE': ('Stockholm', 'Gothenburg', 'Göteborg', 'Malmö', 'Malmo'),
+    'NO': ('Oslo', 'Bergen'),
+    'DK': ('Copenhagen', 'København', 'Aarhus'),
+    'FI': ('Helsinki',),
+    'IS': ('Reykjavik', 'Reykjavík'),
+    'PL': ('Warsaw', 'Warszawa', 'Kraków', 'Krakow', 'Wrocław', 'Wroclaw', 'Gdańsk', 'Gdansk'),
+    'CZ': ('Prague', 'Praha', 'Brno'),
+    'HU': ('Budapest',),
+    'RO': ('Bucharest', 'București', 'Cluj-Napoca'),
+    'BG': ('Sofia',),
+    'GR': ('Athens', 'Thessaloniki'),
+    'HR': ('Zagreb', 'Dubrovnik'),
+    'RS': ('Belgrade', 'Beograd'),
+    'UA': ('Kyiv', 'Kiev', 'Lviv', 'Odesa', 'Odessa', 'Kharkiv'),
+    'RU': ('Moscow', 'Москва', 'Saint Petersburg', 'St. Petersburg', 'Novosibirsk', 'Kazan'),
+    'TR': ('Istanbul', 'İstanbul', 'Ankara', 'Izmir', 'İzmir', 'Antalya', 'Bodrum'),
+    'IL': ('Tel Aviv', 'Jerusalem', 'Haifa'),
+    'AE': ('Dubai', 'Abu Dhabi'),
+    'SA': ('Riyadh', 'Jeddah', 'Mecca', 'Medina', 'Dammam'),
+    'QA': ('Doha',),
+    'KW': ('Kuwait City',),
+    'BH': ('Manama',),
+    'OM': ('Muscat',),
+    'JO': ('Amman',),
+    'LB': ('Beirut',),
+    'EG': ('Cairo', 'Alexandria', 'Giza', 'Sharm El Sheikh', 'Hurghada'),
+    'MA': ('Casablanca', 'Marrakech', 'Marrakesh', 'Rabat', 'Fes', 'Tangier'),
+    'TN': ('Tunis',),
+    'DZ': ('Algiers',),
+    'NG': ('Lagos', 'Abuja', 'Port Harcourt', 'Ibadan'),
+    'GH': ('Accra', 'Kumasi'),
+    'KE': ('Nairobi', 'Mombasa'),
+    'ET': ('Addis Ababa',),
+    'TZ': ('Dar es Salaam', 'Arusha'),
+    'UG': ('Kampala',),
+    'RW': ('Kigali',),
+    'ZA': ('Johannesburg', 'Joburg', 'Jozi', 'Cape Town', 'Durban', 'Pretoria', 'Port Elizabeth'),
+    'SN': ('Dakar',),
+    'CI': ('Abidjan',),
+    'CM': ('Douala', 'Yaoundé'),
+    'IN': (
+        'Mumbai', 'Bombay', 'Delhi', 'New Delhi', 'Bangalore', 'Bengaluru', 'Hyderabad', 'Chennai', 'Madras',
+        'Kolkata', 'Calcutta', 'Pune', 'Ahmedabad', 'Jaipur', 'Surat', 'Lucknow', 'Chandigarh', 'Kochi', 'Gurgaon',
+        'Gurugram', 'Noida', 'Indore',
+    ),
+    'PK': ('Karachi', 'Lahore', 'Islamabad', 'Rawalpindi', 'Faisalabad', 'Peshawar'),
+    'BD': ('Dhaka', 'Chittagong'),
+    'LK': ('Colombo',),
+    'NP': ('Kathmandu', 'Pokhara'),
+    'CN': ('Beijing', 'Shanghai', 'Guangzhou', 'Shenzhen', 'Chengdu', 'Hangzhou', 'Wuhan', "Xi'an", 'Chongqing', 'Nanjing'),
+    'HK': ('Kowloon',),
+    'TW': ('Taipei', 'Kaohsiung', 'Taichung'),
+    'JP': ('Tokyo', '東京', 'Osaka', 'Kyoto', 'Yokohama', 'Nagoya', 'Sapporo', 'Fukuoka', 'Kobe', 'Okinawa'),
+    'KR': ('Seoul', '서울', 'Busan', 'Incheon', 'Daegu', 'Jeju'),
+    'MY': ('Kuala Lumpur', 'KL', 'Johor Bahru', 'George Town'),
+    'TH': ('Bangkok', 'Chiang Mai', 'Pattaya'),
+    'VN': ('Hanoi', 'Ha Noi', 'Ho Chi Minh City', 'Saigon', 'Da Nang'),
+    'PH': ('Manila', 'Metro Manila', 'Quezon City', 'Makati', 'Davao', 'Cebu City', 'BGC'),
+    'ID': ('Jakarta', 'Surabaya', 'Bandung', 'Medan', 'Yogyakarta', 'Jogja', 'Denpasar', 'Ubud', 'Canggu', 'Seminyak'),
+    'KH': ('Phnom Penh', 'Siem Reap'),
+    'MM': ('Yangon',),
+    'MX': ('Mexico City', 'CDMX', 'Ciudad de México', 'Guadalajara', 'Monterrey', 'Cancún', 'Cancun', 'Tulum', 'Puebla', 'Tijuana', 'Playa del Carmen', 'Oaxaca', 'Puerto Vallarta'),
+    'BR': ('São Paulo', 'Sao Paulo', 'Rio de Janeiro', 'Rio', 'Brasília', 'Brasilia', 'Salvador', 'Fortaleza', 'Belo Horizonte', 'Curitiba', 'Recife', 'Porto Alegre', 'Florianópolis', 'Florianopolis'),
+    'AR': ('Buenos Aires', 'Córdoba', 'Cordoba', 'Rosario', 'Mendoza'),
+    'CL': ('Santiago de Chile', 'Valparaíso', 'Valparaiso'),
+    'CO': ('Bogotá', 'Bogota', 'Medellín', 'Medellin', 'Cali', 'Cartagena', 'Barranquilla'),
+    'PE': ('Lima', 'Cusco', 'Cuzco', 'Arequipa'),
+    'VE': ('Caracas', 'Maracaibo'),
+    'EC': ('Quito', 'Guayaquil'),
+    'UY': ('Montevideo',),
+    'PY': ('Asunción', 'Asuncion'),
+    'BO': ('La Paz', 'Santa Cruz de la Sierra'),
+    'CR': ('San José de Costa Rica',),
+    'PA': ('Panama City',),
+    'GT': ('Guatemala City',),
+    'DO': ('Santo Domingo', 'Punta Cana'),
+    'PR': ('San Juan',),
+    'CU': ('Havana', 'La Habana'),
+    'JM': ('Kingston', 'Montego Bay'),
+}
+
+# Aliases that are ordinary words in lowercase; matched only with this exact capitalization
+CASE_SENSITIVE = {
+    'US', 'UK', 'GB', 'NZ', 'HK', 'LA', 'SF', 'NY', 'DC', 'KL', 'ATL', 'BGC', 'DRC', 'PRC', 'PNG', 'RSA', 'KSA',
+    'BVI', 'BiH', 'Chad', 'Jordan', 'Georgia', 'Turkey', 'Guinea', 'Niger', 'Mali', 'Jersey', 'Rio', 'Cali',
+    'Nevis', 'Saba', 'Victoria BC', 'Phoenix', 'Austin', 'Charlotte', 'Columbus', 'Orlando', 'Florence', 'Sofia',
+    'Darwin', 'Salvador', 'Kingston', 'Lima', 'Rome', 'Roma', 'Palma', 'Mecca', 'Medina', 'Fes', 'Holland',
+    'Congo', 'Korea', 'Saudi', 'Java', 'Bahia', 'Riviera', 'Goa', 'Vegas', 'Naija', 'Aussie', 'Indiana',
+    'Virginia', 'Maine', 'Portland', 'York',
+}
+
+# Postal abbreviations that end addresses ("Melbourne, FL", "Perth WA"); uppercase, at the end of the text only.
+# Country order breaks ties when nothing named before the abbreviation settles it.
+SUBDIVISION_CODES = {
+    'US': (
+        'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY',
+        'LA', 'ME', 'MD', 'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND',
+        'OH', 'OK', 'OR', 'PA', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY', 'DC',
+    ),
+    'CA': ('AB', 'BC', 'MB', 'NB', 'NL', 'NS', 'NT', 'NU', 'ON', 'PE', 'QC', 'SK', 'YT'),
+    'AU': ('ACT', 'NSW', 'NT', 'QLD', 'SA', 'TAS', 'VIC', 'WA'),
+}
@@ -0,0 +1,183 @@
+"""
+Grid Harvest - Post links and owners from a tag grid in bulk instead of stepping through modals
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Generator, List, Optional, Tuple
+
+import logs
+
+log = logs.get_logger('harvest')
+
+# Every post link on the page, in grid order, as [kind, shortcode] pairs
+LINKS_SCRIPT = r"""
+const seen = new Set(), out = [];
+for (const a of document.querySelectorAll('a[href*="/p/"], a[href*="/reel/"]')) {
+    const m = a.getAttribute('href').match(/\/(p|reel)\/([^\/?#]+)/);
+    if (m && !seen.has(m[2])) { seen.add(m[2]); out.push([m[1], m[2]]); }
+}
+return out;
+"""
+
+# Scroll to the bottom so the grid loads its next page; returns the link count before scrolling
+SCROLL_SCRIPT = r"""
+const count = document.querySelectorAll('a[href*="/p/"], a[href*="/reel/"]').length;
+window.scrollTo(0, document.body.scrollHeight);
+return count;
+"""
+
+# Fetch post pages from inside the logged-in page (same origin, same cookies), a few at a time,
+# and return {shortcode: owner username or null}
+OWNERS_SCRIPT = r"""
+const codes = arguments[0], concurrency = arguments[1], done = arguments[arguments.length - 1];
+const patterns = [
+    /"owner":\s*\{[^{}]*?"username":\s*"([A-Za-z0-9._]+)"/,
+    /"user":\s*\{[^{}]*?"username":\s*"([A-Za-z0-9._]+)"/,
+    /comments?\s+-\s+([A-Za-z0-9._]+)\s+on\s/,
+];
+const owners = {};
+let next = 0;
+async function worker() {
+    while (next < codes.length) {
+        const code = codes[next++];
+        owners[code] = null;
+        try {
+            const html = await (await fetch('/p/' + code + '/', {credentials: 'include'})).text();
+            for (const p of patterns) {
+                const m = html.match(p);
+                if (m) { owners[code] = m[1]; break; }
+            }
+        } catch (e) {}
+    }
+}
+Promise.all(Array.from({length: concurrency}, worker)).then(() => done(owners));
+"""
+
+_SHORTCODE = re.compile(r'"(?:shortcode|code)":\s*"([A-Za-z0-9_-]{5,})"')
+_OWNER = re.compile(r'"(?:owner|user)":\s*\{[^{}]*?"username":\s*"([A-Za-z0-9._]+)"')
+_PAIR_WINDOW = 2000
+# '},{' between a shortcode and an owner means they belong to different post nodes
+_NODE_BREAK = re.compile(r'\}\s*\]?\s*,\s*\{')
+# Post page meta: "1,234 likes, 56 comments - user on March 3, 2024: ..."
+_META_OWNER = re.compile(r'comments?\s+-\s+([A-Za-z0-9._]+)\s+on\s')
+
+Post = Tuple[int, str, Optional[str]]
+
+
+def owners_from_html(html: str) -> Dict[str, str]:
+    """{shortcode: owner username} for post nodes embedded in page data"""
+    owners = {}
+    for m in _SHORTCODE.finditer(html):
+        if m.group(1) in owners:
+            continue
+        best, distance = None, _PAIR_WINDOW + 1
+        for om in _OWNER.finditer(html, max(0, m.start() - _PAIR_WINDOW), m.end() + _PAIR_WINDOW):
+            lo, hi = (m.end(), om.start()) if om.start() >= m.end() else (om.end(), m.start())
+            if hi - lo < distance and not _NODE_BREAK.search(html, lo, hi):
+                best, distance = om.group(1), hi - lo
+        if best:
+            owners[m.group(1)] = best
+    return owners
+
+
+def owner_from_post_page(html: str) -> Optional[str]:
+    m = _META_OWNER.search(html) or _OWNER.search(html)
+    return m.group(1) if m else None
+
+
+class GridHarvester:
+    """
+    Walks a tag grid that is already open in `driver`: reads every post link
+    in one script call, takes owners embedded in the page data, and resolves
+    the rest `batch_size` shortcodes at a time (post pages over the shared
+    HTTP session, or fetched inside the page when HTTP extraction is off).
+    Scrolls for more only when the loaded grid is used up.
+    """
+
+    def __init__(self, fetcher=None, pacer=None, batch_size: int = 12, concurrency: int = 4, max_scrolls: int = 5):
+        self.fetcher = fetcher
+        self.pacer = pacer
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_scrolls = max_scrolls
+        self.stats = {'posts': 0, 'embedded': 0, 'resolved': 0, 'unresolved': 0, 'batches': 0, 'scrolls': 0}
+
+    def links(self, driver) -> List[str]:
+        try:
+            return [code for _, code in driver.execute_script(LINKS_SCRIPT) or []]
+        except Exception as e:
+            log.debug("Grid link read failed: %s", e)
+            return []
+
+    def scroll(self, driver, wait_for: Callable[[Callable], object]) -> bool:
+        """Load the next page of the grid; False when nothing new appeared"""
+        if self.pacer:
+            self.pacer.wait()
+        before = driver.execute_script(SCROLL_SCRIPT)
+        self.stats['scrolls'] += 1
+        grew = lambda d: d.execute_script(
+            "return document.querySelectorAll('a[href*=\"/p/\"], a[href*=\"/reel/\"]').length") > before
+        return bool(wait_for(grew))
+
+    def resolve(self, codes: List[str], driver=None) -> Dict[str, Optional[str]]:
+        """Owners for a batch of shortcodes in one paced burst"""
+        if not codes:
+            return {}
+        if self.pacer:
+            self.pacer.wait()
+        self.stats['batches'] += 1
+        if self.fetcher:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                pages = list(pool.map(lambda code: self.fetcher.get(f'p/{code}/'), codes))
+            owners = {code: owner_from_post_page(page) if page else None for code, page in zip(codes, pages)}
+        elif driver:
+            try:
+                owners = driver.execute_async_script(OWNERS_SCRIPT, codes, self.concurrency) or {}
+            except Exception as e:
+                log.debug("Owner batch failed: %s", e)
+                owners = {}
+        else:
+            owners = {}
+        found = sum(1 for code in codes if owners.get(code))
+        self.stats['resolved'] += found
+        self.stats['unresolved'] += len(codes) - found
+        return owners
+
+    def harvest(self, driver, wait_for: Callable[[Callable], object], keep_going: Callable[[], bool],
+                max_posts: int = 60, skip: int = 0) -> Generator[Post, None, None]:
+        """
+        (position, shortcode, owner) in grid order from position `skip` + 1 on,
+        owner None when it could not be resolved. Positions are 1-based.
+        """
+        codes: List[str] = []
+        owners: Dict[str, str] = {}
+        position = skip
+        scrolls = 0
+        while position < max_posts and keep_going():
+            if position >= len(codes):
+                if codes:
+                    if scrolls >= self.max_scrolls or not self.scroll(driver, wait_for):
+                        return
+                    scrolls += 1
+                loaded = self.links(driver)
+                if len(loaded) <= len(codes):
+                    return
+                codes = loaded
+                try:
+                    embedded = owners_from_html(driver.page_source)
+                except Exception:
+                    embedded = {}
+                self.stats['embedded'] += sum(1 for c in codes[position:] if c in embedded and c not in owners)
+                owners.update(embedded)
+                continue
+
+            chunk = codes[position:min(len(codes), max_posts, position + self.batch_size)]
+            missing = [code for code in chunk if code not in owners]
+            owners.update({c: o for c, o in self.resolve(missing, driver).items() if o})
+            for code in chunk:
+                position += 1
+                self.stats['posts'] += 1
+                yield position, code, owners.get(code)
+                if not keep_going():
+                    return
@@ -2,32 +2,145 @@
 Instagram Scraper - Tag Search & Strict Filtering
 """
 
-import time
-import random
-import re
 import os
 import pickle
-from typing import List, Dict, Optional, Generator
+import re
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Optional, Generator
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
+
+import boot
+import logs
+import metrics
+import waits
+from checkpoint import CrawlInterrupted, CrawlState
+from dom_extract import CommandCounter, snapshot_profile
+from engagement import EngagementEngine, summarize
+from filters import FilterPlan, default_costs
+from gazetteer import get_gazetteer
+from harvest import GridHarvester
+from http_extract import get_fetcher
+from pipeline import AnalysisPipeline, EnrichmentStage
+from profile_cache import BASIC_FIELDS, COUNTRY_FIELDS, ENGAGEMENT_FIELDS, ProfileCache
+from profile_extract import country_from_about_text, extract_profile, location_from_bio, parse_count, strip_account_based_in
+from seen_filter import SeenFilter
+from session_store import SessionStore
+
+COOKIES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'selenium_cookies.pkl')
+
+PHASE_SECONDS = metrics.histogram('scraper_phase_seconds', 'Wall time of each scraper phase', ('phase',))
+PROFILE_CHECKS = metrics.counter('scraper_profiles_checked_total', 'Profiles checked, by outcome', ('outcome',))
+PAGE_BYTES = metrics.counter('scraper_profile_page_bytes_total', 'Bytes transferred by opened profile pages (Resource Timing)')
+
+# Lean browsing: requests never made (images are off through content settings).
+# Video/audio, fonts and third-party analytics; we only read text, counts and attributes.
+LEAN_BLOCKED_URLS = ('*.mp4*', '*.m4v*', '*.m4a*', '*.webm*', '*.woff*', '*.ttf*', '*.otf*',
+                     '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*connect.facebook.net*')
+
+log = logs.get_logger('scraper')
 
 class InstagramScraper:
-    def __init__(self, username: str = "", password: str = "", proxy: Optional[str] = None, headless: bool = False):
+    def __init__(self, username: str = "", password: str = "", proxy: Optional[str] = None, headless: bool = False,
+                 http_extract: bool = False, profile_cache: Optional[ProfileCache] = None,
+                 engagement_concurrency: int = 4, seen_filter: Optional[SeenFilter] = None,
+                 crawl_mode: str = 'harvest', harvest_batch: int = 12, harvest_max_posts: int = 60,
+                 base_url: str = 'https://www.instagram.com', cookies_file: str = COOKIES_FILE,
+                 session_store: Optional[SessionStore] = None, lean: bool = False,
+                 blocked_urls: Optional[List[str]] = None):
         self.username = username
         self.password = password
         self.proxy = proxy
         self.headless = headless
+        # Try profile HTML over plain HTTP before opening a browser tab
+        self.http_extract = http_extract
+        # Shared persistent store consulted before any navigation
+        self.profile_cache = profile_cache
+        # Recently rejected (filter set, username) pairs shared by every search
+        self.seen_filter = seen_filter
+        # 'harvest' reads the tag grid in bulk; 'modal' clicks through posts one by one
+        self.crawl_mode = crawl_mode
+        self.harvest_batch = harvest_batch
+        self.harvest_max_posts = harvest_max_posts
+        # Site root for every navigation (a local stand-in when benchmarking)
+        self.base_url = base_url.rstrip('/')
+        self.cookies_file = cookies_file
+        # Shared validated session: known-good cookies are injected without loading a page
+        self.session_store = session_store
+        self.profile_path = None
+        # Lean browsing: no images / media / fonts / trackers, pages usable at DOMContentLoaded
+        self.lean = lean
+        self.blocked_urls = list(blocked_urls or LEAN_BLOCKED_URLS)
+        # Transfer size of the profile pages opened (see page_summary)
+        self.page_stats = {'pages': 0, 'bytes': 0, 'resources': 0, 'dom_ready_ms': 0.0}
         self.driver = None
+        self.waiter = None
+        self.commands = None
+        # WebDriver round trips spent on profile analysis (see CommandCounter)
+        self.command_stats = {'profiles': 0, 'commands': 0}
+        # Wall time per phase: {phase: {'count', 'total', 'max'}} (see phase_summary)
+        self.phase_stats: Dict[str, Dict] = {}
+        self._snapshot = None
+        self.pacer = waits.default_pacer()
+        # Bulk likes/comments; post pages are fetched over HTTP only when HTTP extraction is on
+        self.engagement = EngagementEngine(
+            self._fetcher() if http_extract else None,
+            pacer=self.pacer,
+            concurrency=engagement_concurrency
+        )
+        self._profile_html = None
         self.logged_in = False
+
+    def _fetcher(self):
+        return get_fetcher(self.cookies_file, self.base_url)
+
+    def _record(self, phase: str, seconds: float):
+        stat = self.phase_stats.setdefault(phase, {'count': 0, 'total': 0.0, 'max': 0.0})
+        stat['count'] += 1
+        stat['total'] += seconds
+        stat['max'] = max(stat['max'], seconds)
+        PHASE_SECONDS.observe(seconds, phase=phase)
+
+    @contextmanager
+    def _timed(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(phase, time.perf_counter() - started)
+
+    def phase_summary(self) -> str:
+        parts = [f"{phase} {s['total']:.1f}s/{s['count']}" for phase, s in self.phase_stats.items()]
+        return f"Phases: {', '.join(parts) or 'none'}"
+
+    def page_summary(self) -> str:
+        pages = self.page_stats['pages']
+        if not pages:
+            return "Profile pages: none opened"
+        return (f"Profile pages ({'lean' if self.lean else 'normal'}): {pages}, "
+                f"{self.page_stats['bytes'] / pages / 1024:.0f} KB and {self.page_stats['resources'] / pages:.0f} "
+                f"requests each, DOM ready after {self.page_stats['dom_ready_ms'] / pages:.0f} ms")
+
+    def _block_urls(self):
+        """DevTools URL blocking for the current tab (it is per tab, so every new tab needs it)"""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        except Exception as e:
+            log.debug("URL blocking unavailable: %s", e)
         
-    def _random_delay(self, min_sec: float = 2, max_sec: float = 5):
-        time.sleep(random.uniform(min_sec, max_sec))
+    def _open(self, url: str, step: str, condition=waits.document_ready):
+        """Paced navigation that returns as soon as `condition` holds (None on timeout)"""
+        self.pacer.wait()
+        self.driver.get(url)
+        return self.waiter.until(step, condition)
         
     def start_browser(self):
         """Start browser"""
+        started = time.perf_counter()
         try:
             options = webdriver.ChromeOptions()
             options.add_argument('--no-sandbox')
@@ -41,26 +154,65 @@ class InstagramScraper:
             if self.proxy:
                 options.add_argument(f'--proxy-server={self.proxy}')
             
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            if self.lean:
+                # Usable once the DOM is parsed; the waits check for the elements we need
+                options.page_load_strategy = 'eager'
+                options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            
+            if self.session_store:
+                self.profile_path = self.session_store.lease_profile()
+                if self.profile_path:
+                    options.add_argument(f'--user-data-dir={self.profile_path}')
+            
+            service = Service(boot.resolve_driver_path())
+            with boot.phase('chrome_launch'):
+                self.driver = webdriver.Chrome(service=service, options=options)
             self.driver.set_page_load_timeout(30)
+            if self.lean:
+                self._block_urls()
+            self.waiter = waits.Waiter(self.driver)
+            self.commands = CommandCounter(self.driver)
+            self._record('browser_start', time.perf_counter() - started)
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to start browser: {e}")
+            log.error("Failed to start browser: %s", e)
+            if self.session_store:
+                self.session_store.release_profile(self.profile_path)
+                self.profile_path = None
             return False
     
     def login(self) -> bool:
-        """Login using cookies"""
+        """
+        Login using cookies. With a session store, a session known to be good
+        (validated within its TTL, or by one HTTP probe) is injected in a single
+        DevTools call with no page load; otherwise the home page is opened, the
+        cookies added and the page refreshed, and the verdict is stored.
+        """
+        started = time.perf_counter()
         try:
-            cookies_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'selenium_cookies.pkl')
-            if not os.path.exists(cookies_file):
-                return False
+            store = self.session_store
+            if store:
+                verdict = store.valid()
+                if verdict is False:
+                    log.warning("Saved session is logged out; refresh %s", self.cookies_file)
+                    return False
+                if verdict and self._inject_cookies(store.cookies()):
+                    store.count_login(fast=True)
+                    self.logged_in = True
+                    return True
             
-            self.driver.get('https://www.instagram.com/')
-            self._random_delay(2, 3)
+            if store:
+                # The rotated jar when it is newer than COOKIES_FILE
+                cookies = store.cookies()
+            elif os.path.exists(self.cookies_file):
+                with open(self.cookies_file, 'rb') as f:
+                    cookies = pickle.load(f)
+            else:
+                cookies = []
+            if not cookies:
+                return False
             
-            with open(cookies_file, 'rb') as f:
-                cookies = pickle.load(f)
+            self._open(f'{self.base_url}/', 'login')
                 
             for cookie in cookies:
                 try:
@@ -70,114 +222,556 @@ class InstagramScraper:
                 except:
                     continue
             
+            self.pacer.wait()
             self.driver.refresh()
-            self._random_delay(3, 5)
+            self.waiter.until('login', waits.document_ready)
             
+            if store:
+                store.count_login(fast=False)
             if 'accounts/login' not in self.driver.current_url:
                 self.logged_in = True
+                if store:
+                    store.save_cookies(self.driver.get_cookies())
                 return True
+            if store:
+                store.record(False, 'browser')
             return False
         except:
             return False
+        finally:
+            self._record('login', time.perf_counter() - started)
 
-    def search_tags(self, tags: List[str], filters: Dict, max_profiles: int = 20) -> Generator[Dict, None, None]:
+    def _inject_cookies(self, cookies: List[Dict]) -> bool:
+        """Set every cookie in one DevTools call; unlike add_cookie it needs no page of the site open"""
+        params = []
+        for cookie in cookies:
+            param = {k: cookie[k] for k in ('name', 'value', 'path', 'secure', 'httpOnly') if k in cookie}
+            if cookie.get('domain'):
+                param['domain'] = cookie['domain']
+            else:
+                param['url'] = self.base_url
+            if cookie.get('expiry'):
+                param['expires'] = int(cookie['expiry'])
+            if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+                param['sameSite'] = cookie['sameSite']
+            params.append(param)
+        try:
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': params})
+            return True
+        except Exception as e:
+            log.debug("Cookie injection over DevTools failed, loading the site instead: %s", e)
+            return False
+
+    def is_alive(self) -> bool:
+        """Cheap health check - driver responds and session is still logged in"""
+        if not self.driver or not self.logged_in:
+            return False
+        try:
+            return 'accounts/login' not in self.driver.current_url
+        except:
+            return False
+
+    def reset(self) -> bool:
+        """Return a used browser to a clean state: extra tabs closed, modals dismissed"""
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            try:
+                self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+            except:
+                pass
+            self.rejection_reason = None
+            return self.is_alive()
+        except:
+            return False
+
+    def search_tags(self, tags: List[str], filters: Dict, max_profiles: int = 20,
+                    workers: Optional[List['InstagramScraper']] = None, progressive: bool = False,
+                    enrich_with: Optional['InstagramScraper'] = None,
+                    state: Optional[CrawlState] = None, crawlers: Optional[List['InstagramScraper']] = None,
+                    tag_policy: str = 'round_robin', slice_posts: int = 12) -> Generator[Dict, None, None]:
         """
         Search by tags and yield events for SSE
-        Yields: {'type': 'log'|'profile'|'error', 'data': ...}
+        Yields: {'type': 'log'|'profile'|'profile_update'|'error', 'data': ...}
+        With `workers` (other logged-in scrapers) this scraper only crawls tags
+        and the workers analyze profiles concurrently. `crawlers` (more logged-in
+        scrapers) crawl tags concurrently with this one, scheduled by `tag_policy`
+        ('round_robin' or 'yield') in slices of `slice_posts` posts.
+        `progressive` emits each profile once followers/bio pass the filters;
+        country and engagement follow as profile_update events, computed by
+        `enrich_with` in the background (or inline when not given).
+        `state` carries progress from an interrupted run (see checkpoint.py);
+        tags done, posts already stepped through and usernames seen are skipped.
+        Raises CrawlInterrupted when the browser dies so the caller can resume
+        with a fresh one.
         """
         if not self.logged_in:
             yield {'type': 'error', 'data': 'Not logged in'}
             return
 
-        yield {'type': 'log', 'data': f"Starting search for tags: {', '.join(tags)}"}
+        state = state or CrawlState({'tags': tags, 'filters': filters, 'max_profiles': max_profiles})
+        if state.resumed:
+            yield {'type': 'log', 'data': f"Resuming search: {state.found} profiles found, "
+                                          f"{len(state.seen)} accounts checked, {len(state.tags_done)} tag(s) done"}
+        else:
+            yield {'type': 'log', 'data': f"Starting search for tags: {', '.join(tags)}"}
+        self.command_stats = {'profiles': 0, 'commands': 0}
+        plan = FilterPlan(filters)
+        timed = self._search_timer([self] + list(workers or []) + list(crawlers or []) + ([enrich_with] if enrich_with else []))
+
+        if progressive:
+            # Profiles emitted before the interruption whose enrichment never finished
+            for profile in [dict(p) for p in state.profiles.values() if p.get('pending')]:
+                for update in self.enrich_profile(profile):
+                    event = {'type': 'profile_update', 'data': update}
+                    state.observe(event)
+                    yield event
+        
+        if workers or crawlers:
+            for event in AnalysisPipeline(self, workers or [], plan, max_profiles, progressive=progressive, state=state,
+                                          crawlers=crawlers, tag_policy=tag_policy, slice_posts=slice_posts).run(tags):
+                if event['type'] == 'complete':
+                    yield timed()
+                yield event
+            return
         
-        collected_usernames = set()
-        profiles_found = 0
+        enricher = EnrichmentStage(enrich_with) if progressive and enrich_with else None
         
-        # 1. Collect Usernames from Tags
-        for tag in tags:
-            if profiles_found >= max_profiles:
-                break
+        try:
+            # 1. Collect Usernames from Tags
+            for event in self._candidates(tags, state, lambda: state.remaining > 0):
+                if enricher:
+                    for update in enricher.drain():
+                        state.observe(update)
+                        yield update
+                if event['type'] != 'candidate':
+                    yield event
+                    continue
+                
+                username, tag = event['data'], event['tag']
+                if not state.claim_seen(username):
+                    update = state.add_sighting(username, tag)
+                    if update:
+                        event = {'type': 'profile_update', 'data': update}
+                        state.observe(event)
+                        yield event
+                    continue
+                yield {'type': 'log', 'data': f"Checking @{username}..."}
                 
+                profile = self._check_username(username, plan, tag, enrich=not progressive)
+                if not profile and not self.is_alive():
+                    # Never really checked: first in line after the restart
+                    state.defer(username, tag)
+                    raise CrawlInterrupted(f"Browser lost while checking @{username}")
+                if profile:
+                    state.merge_tags(profile)
+                    event = {'type': 'profile', 'data': dict(profile)}
+                    state.observe(event)
+                    yield event
+                    yield {'type': 'log', 'data': f"✅ MATCH: @{username}"}
+                    if enricher:
+                        enricher.submit(profile)
+                    elif progressive:
+                        for update in self.enrich_profile(profile):
+                            event = {'type': 'profile_update', 'data': update}
+                            state.observe(event)
+                            yield event
+                else:
+                    reason = getattr(self, 'rejection_reason', 'Unknown reason')
+                    yield {'type': 'log', 'data': f"❌ Skipped @{username}: {reason}"}
+
+            if enricher:
+                for update in enricher.finish():
+                    state.observe(update)
+                    yield update
+        finally:
+            if enricher:
+                enricher.close()
+
+        yield {'type': 'log', 'data': self.command_summary()}
+        yield {'type': 'log', 'data': plan.stats.summary()}
+        yield timed()
+        complete = {'type': 'complete', 'data': f"Search finished. Found {state.found} profiles.",
+                    'filters': plan.stats.report()}
+        state.observe(complete)
+        yield complete
+
+    @staticmethod
+    def _search_timer(scrapers: List['InstagramScraper']) -> Callable[[], Dict]:
+        """
+        Snapshot the phase timings of every scraper a search uses; the returned
+        callable builds the search's 'metrics' event (time per phase since then)
+        """
+        started = time.perf_counter()
+        before = [{phase: dict(stat) for phase, stat in s.phase_stats.items()} for s in scrapers]
+        pages_before = [dict(s.page_stats) for s in scrapers]
+
+        def event() -> Dict:
+            phases = metrics.merge_phases(metrics.phase_delta(b, s.phase_stats) for s, b in zip(scrapers, before))
+            pages = {k: sum(s.page_stats[k] - b[k] for s, b in zip(scrapers, pages_before)) for k in pages_before[0]}
+            count = pages['pages']
+            return {'type': 'metrics', 'data': {
+                'seconds': round(time.perf_counter() - started, 3),
+                'browsers': len(scrapers),
+                'phases': phases,
+                'pages': {'count': count, 'lean': scrapers[0].lean,
+                          'kb_per_page': round(pages['bytes'] / count / 1024, 1) if count else 0,
+                          'dom_ready_ms': round(pages['dom_ready_ms'] / count) if count else 0},
+            }}
+        return event
+
+    def _candidates(self, tags: List[str], state: CrawlState,
+                    keep_going: Callable[[], bool]) -> Generator[Dict, None, None]:
+        """
+        Candidate events ({'type': 'candidate', 'data': username, 'tag': tag})
+        for a search: the backlog of an interrupted run first, then each tag not
+        yet done from where it stopped. A tag's position only advances once
+        the consumer comes back for the next event, i.e. after it handled
+        the candidate.
+        """
+        for username, tag in state.take_backlog():
+            if keep_going():
+                yield {'type': 'candidate', 'data': username, 'tag': tag}
+            else:
+                state.defer(username, tag)
+        for tag in tags:
+            if not keep_going():
+                return
             tag = tag.strip().replace('#', '')
-            yield {'type': 'log', 'data': f"Scraping tag: #{tag}..."}
+            if tag in state.tags_done:
+                continue
+            crawl = self._harvest_tag if self.crawl_mode == 'harvest' else self._crawl_tag
+            for event in crawl(tag, keep_going, skip=state.position(tag)):
+                if event['type'] == 'candidate':
+                    event['tag'] = tag
+                yield event
+                if event['type'] == 'candidate':
+                    state.advance(tag, event['post'])
+            if keep_going():
+                # Stopped by the post limit or the end of the grid, not by a stop request
+                state.tag_done(tag)
+
+    def _ensure_alive(self, what: str):
+        if not self.is_alive():
+            raise CrawlInterrupted(f"Browser session lost {what}")
+
+    def _harvest_tag(self, tag: str, keep_going: Callable[[], bool], skip: int = 0) -> Generator[Dict, None, None]:
+        """
+        Bulk alternative to _crawl_tag with the same events: every post link
+        of the tag grid in one script call, owners from the page data or
+        resolved in batches, scrolling only when the loaded grid is used up.
+        Each owner is yielded once per tag; 'post' is its grid position.
+        Falls back to stepping through modals when the grid has no links.
+        """
+        yield {'type': 'log', 'data': f"Harvesting tag: #{tag}..."}
+        url = f'{self.base_url}/explore/tags/{tag}/'
+        with self._timed('tag_load'):
+            grid = self._open(url, 'tag_page', waits.element_present(self.POST_LINK))
+        if not grid:
+            self._ensure_alive(f"opening #{tag}")
+            yield {'type': 'log', 'data': f"No posts found for #{tag}"}
+            return
+
+        harvester = GridHarvester(
+            self._fetcher() if self.http_extract else None,
+            pacer=self.pacer,
+            batch_size=self.harvest_batch,
+            concurrency=self.engagement.concurrency
+        )
+        owners = set()
+        posts = harvester.harvest(self.driver, lambda c: self.waiter.until('grid_scroll', c),
+                                  keep_going, max_posts=self.harvest_max_posts, skip=skip)
+        try:
+            while True:
+                with self._timed('username_read'):
+                    post = next(posts, None)
+                if post is None:
+                    break
+                position, code, owner = post
+                if owner and owner not in owners:
+                    owners.add(owner)
+                    yield {'type': 'candidate', 'data': owner, 'post': position}
+        except Exception as e:
+            self._ensure_alive(f"on #{tag}")
+            yield {'type': 'error', 'data': f"Error harvesting tag #{tag}: {e}"}
+            return
+
+        stats = harvester.stats
+        if not stats['posts'] and not skip:
+            yield {'type': 'log', 'data': f"Grid harvest found no posts for #{tag}, stepping through posts instead"}
+            yield from self._crawl_tag(tag, keep_going)
+            return
+        yield {'type': 'log', 'data': f"#{tag}: {stats['posts']} posts, {len(owners)} accounts "
+                                      f"({stats['embedded']} owners from page data, {stats['resolved']} resolved "
+                                      f"in {stats['batches']} batch(es), {stats['scrolls']} scroll(s))"}
+
+    def _crawl_tag(self, tag: str, keep_going: Callable[[], bool], skip: int = 0) -> Generator[Dict, None, None]:
+        """
+        Step through a tag's post modals, starting after the first `skip` posts.
+        Yields log/error events plus {'type': 'candidate', 'data': username, 'post': n}
+        for each post owner (n = posts stepped through once this one is done).
+        Raises CrawlInterrupted if the browser dies along the way.
+        """
+        yield {'type': 'log', 'data': f"Scraping tag: #{tag}..."}
+        
+        try:
+            url = f'{self.base_url}/explore/tags/{tag}/'
+            with self._timed('tag_load'):
+                first_post = self._open(url, 'tag_page', waits.element_present(self.POST_LINK))
             
+            # Click first post
             try:
-                url = f'https://www.instagram.com/explore/tags/{tag}/'
-                self.driver.get(url)
-                self._random_delay(4, 6)
-                
-                # Click first post
+                if not first_post:
+                    raise LookupError(tag)
+                self.pacer.wait()
+                first_post.click()
+                self.waiter.until('post_modal', waits.element_present(*self.MODAL_USERNAME))
+            except:
+                self._ensure_alive(f"opening #{tag}")
+                yield {'type': 'log', 'data': f"No posts found for #{tag}"}
+                return
+            
+            # Iterate posts
+            posts_checked = 0
+            consecutive_errors = 0
+            if skip:
+                yield {'type': 'log', 'data': f"Skipping {skip} post(s) of #{tag} checked before the interruption"}
+                for _ in range(skip):
+                    self._next_post()
+                posts_checked = skip
+            
+            while posts_checked < 30 and keep_going():  # Limit posts per tag
                 try:
-                    first_post = self.driver.find_element(By.XPATH, "//a[contains(@href, '/p/')]")
-                    first_post.click()
-                    self._random_delay(2, 3)
-                except:
-                    yield {'type': 'log', 'data': f"No posts found for #{tag}"}
-                    continue
-                
-                # Iterate posts
-                posts_checked = 0
-                consecutive_errors = 0
-                
-                while posts_checked < 30 and profiles_found < max_profiles:  # Limit posts per tag
-                    try:
-                        # Get username
+                    with self._timed('username_read'):
                         username = self._get_username_from_modal()
-                        
-                        if username and username not in collected_usernames:
-                            collected_usernames.add(username)
-                            yield {'type': 'log', 'data': f"Checking @{username}..."}
-                            
-                            # Visit Profile & Analyze
-                            # We must close modal first or open new tab. 
-                            # Safest is to open new tab or navigate.
-                            # But navigating loses our place in the feed.
-                            # Best strategy: Open profile in new tab.
-                            
-                            current_window = self.driver.current_window_handle
-                            self.driver.execute_script(f"window.open('https://www.instagram.com/{username}/', '_blank');")
-                            self.driver.switch_to.window(self.driver.window_handles[-1])
-                            self._random_delay(3, 5)
-                            
-                            profile = self._analyze_profile_strict(username, filters, source_tag=tag)
-                            
-                            self.driver.close() # Close profile tab
-                            self.driver.switch_to.window(current_window) # Back to feed
-                            
-                            if profile:
-                                profiles_found += 1
-                                yield {'type': 'profile', 'data': profile}
-                                yield {'type': 'log', 'data': f"✅ MATCH: @{username}"}
-                            else:
-                                reason = getattr(self, 'rejection_reason', 'Unknown reason')
-                                yield {'type': 'log', 'data': f"❌ Skipped @{username}: {reason}"}
-                        
-                        # Next post
-                        self._next_post()
-                        posts_checked += 1
-                        consecutive_errors = 0
-                        
-                    except Exception as e:
-                        yield {'type': 'log', 'data': f"Error processing post: {str(e)[:50]}"}
-                        consecutive_errors += 1
-                        if consecutive_errors > 3:
-                            break
-                        self._next_post()
-            
-            except Exception as e:
-                yield {'type': 'error', 'data': f"Error scraping tag #{tag}: {e}"}
+                    if username:
+                        yield {'type': 'candidate', 'data': username, 'post': posts_checked + 1}
+                    
+                    # Next post
+                    self._next_post()
+                    posts_checked += 1
+                    consecutive_errors = 0
+                    
+                except Exception as e:
+                    yield {'type': 'log', 'data': f"Error processing post: {str(e)[:50]}"}
+                    consecutive_errors += 1
+                    if consecutive_errors > 3:
+                        self._ensure_alive(f"on #{tag}")
+                        break
+                    self._next_post()
+        
+        except CrawlInterrupted:
+            raise
+        except Exception as e:
+            self._ensure_alive(f"on #{tag}")
+            yield {'type': 'error', 'data': f"Error scraping tag #{tag}: {e}"}
+
+    def _check_username(self, username: str, filters, tag: str, enrich: bool = True) -> Optional[Dict]:
+        """Check one account (see _check_profile), counting the outcome"""
+        self.rejection_reason = None
+        with logs.context(tag=tag, username=username):
+            profile = self._check_profile(username, filters, tag, enrich)
+        if profile:
+            PROFILE_CHECKS.inc(outcome='matched')
+        else:
+            reason = getattr(self, 'rejection_reason', None) or ''
+            PROFILE_CHECKS.inc(outcome='error' if reason.startswith('Error') else 'rejected')
+        return profile
+
+    def _check_profile(self, username: str, filters, tag: str, enrich: bool = True) -> Optional[Dict]:
+        """
+        Open the profile in a new tab (keeping our place in the feed), analyze it, close the tab.
+        `filters` is the search's FilterPlan (or a plain filters dict). Filters run as
+        soon as the fields they need are available, so cached or HTTP data can reject
+        a profile before any tab opens.
+        With enrich=False the profile is returned once the filters pass; the
+        groups still to compute are listed in profile['pending'] for enrich_profile().
+        """
+        plan = filters if isinstance(filters, FilterPlan) else FilterPlan(filters)
+        if (self.seen_filter and plan.predicates and not plan.filters.get('recheck')
+                and self.seen_filter.seen(plan.signature_for([tag]), username)):
+            self.rejection_reason = "Rejected recently under the same filters"
+            return None
+        profile = self._new_profile(username, tag)
+        check = plan.start(profile)
+        started = time.perf_counter()
+        self._profile_html = None
+        
+        # Cheapest path: fresh fields from the persistent cache
+        fresh = set()
+        if self.profile_cache:
+            cached, fresh = self.profile_cache.lookup(username)
+            profile.update(cached)
+            if 'country' in fresh and 'country_code' not in fresh:
+                # Entries cached before normalization: classify the stored text, no navigation
+                self._set_country(profile, profile['country'])
+                self._cache_put(profile, ('country_code',))
+                fresh.add('country_code')
+            check.add(fresh)
+            if self._rejected(check):
+                self.profile_cache.record('hits')
+                return None
+            if fresh.issuperset(BASIC_FIELDS + COUNTRY_FIELDS + ENGAGEMENT_FIELDS):
+                self.profile_cache.record('hits')
+                log.debug("Served from profile cache")
+                return profile
+        
+        # Cheap path: profile HTML over HTTP. Rejections on its fields never open a tab.
+        if self.http_extract and 'followers' not in fresh:
+            self.pacer.wait()
+            html = self._fetcher().fetch_profile(username)
+            if html:
+                found = self._extract_from_html(html, profile, thorough=True)
+                self._profile_html = html
+                # Only values the page held: server-rendered HTML often lacks the bio or name,
+                # and a count that failed to parse comes back as 0. Those stay unread.
+                read = [field for field, value in found.items() if value or value is False]
+                if read:
+                    self._cache_put(profile, read)
+                    fresh.update(read)
+                    check.add(read)
+            if self._rejected(check):
+                self._cache_record(fresh, started)
+                return None
+            if self._profile_html and 'followers' in fresh and not check.group_ready('engagement'):
+                # Recent posts embedded in the same HTML
+                if self.engagement.compute(profile, html=self._profile_html):
+                    self._cache_put(profile, ENGAGEMENT_FIELDS)
+                    fresh.update(ENGAGEMENT_FIELDS)
+                    check.add(ENGAGEMENT_FIELDS)
+                    if self._rejected(check):
+                        self._cache_record(fresh, started)
+                        return None
+        
+        # A tab only for what is still missing: country, engagement, or basic fields a filter needs
+        if 'followers' in fresh and 'basic' not in check.groups_needed():
+            pending = [group for group in ('country', 'engagement') if not check.group_ready(group)]
+            if not pending or (not enrich and not check.groups_needed()):
+                self._cache_record(fresh, started)
+                if not enrich:
+                    profile['pending'] = pending
+                    log.info("✅ Filters passed without a tab, enrichment pending: %s", pending)
+                else:
+                    log.info("✅ Profile matches the criteria (no tab)")
+                return profile
+        
+        try:
+            with self._profile_tab(username):
+                return self._analyze_profile_strict(username, plan, source_tag=tag, profile=profile,
+                                                    fresh=fresh, enrich=enrich, check=check)
+        except Exception as e:
+            self.rejection_reason = f"Error: {str(e)[:50]}"
+            return None
+        finally:
+            self._cache_record(fresh, started)
+            self._record('profile_analysis', time.perf_counter() - started)
 
-        yield {'type': 'complete', 'data': f"Search finished. Found {profiles_found} profiles."}
+    @contextmanager
+    def _profile_tab(self, username: str):
+        """Profile in a new tab for the duration of the block; always back on the feed afterwards"""
+        self._snapshot = None
+        commands_before = self.commands.count if self.commands else 0
+        current_window = self.driver.current_window_handle
+        try:
+            with self._timed('profile_open'):
+                self.pacer.wait()
+                if self.lean:
+                    # Blank tab first so the blocking is in place before the profile loads
+                    self.driver.execute_script("window.open('about:blank', '_blank');")
+                    self.driver.switch_to.window(self.driver.window_handles[-1])
+                    self._block_urls()
+                    self.driver.get(f'{self.base_url}/{username}/')
+                else:
+                    self.driver.execute_script(f"window.open('{self.base_url}/{username}/', '_blank');")
+                    self.driver.switch_to.window(self.driver.window_handles[-1])
+                self.waiter.until('profile_page', waits.element_present('//header'))
+            yield
+        finally:
+            try:
+                if self.driver.current_window_handle != current_window:
+                    self._record_page_weight()
+                    self.driver.close() # Close profile tab
+                self.driver.switch_to.window(current_window) # Back to feed
+            except:
+                pass
+            if self.commands:
+                used = self.commands.count - commands_before
+                self.command_stats['profiles'] += 1
+                self.command_stats['commands'] += used
+                log.debug("%d WebDriver commands", used)
+
+    def _record_page_weight(self):
+        """Page weight from the tab's DOM snapshot; tabs that never took one go uncounted rather than cost a round trip"""
+        weight = (self._snapshot or {}).get('weight')
+        if not weight:
+            return
+        self.page_stats['pages'] += 1
+        self.page_stats['bytes'] += int(weight.get('bytes') or 0)
+        self.page_stats['resources'] += int(weight.get('resources') or 0)
+        self.page_stats['dom_ready_ms'] += float(weight.get('dom_ready_ms') or 0)
+        PAGE_BYTES.inc(int(weight.get('bytes') or 0))
+
+    def enrich_profile(self, profile: Dict) -> Generator[Dict, None, None]:
+        """
+        Progressive mode, second stage: reopen the profile and compute the groups
+        in profile['pending'], yielding {'username', <fields>, 'pending'} as each lands.
+        """
+        pending = list(profile.pop('pending', None) or [])
+        if not pending:
+            return
+        username = profile['username']
+        self._profile_html = None
+        try:
+            with self._profile_tab(username):
+                if 'country' in pending:
+                    self._load_group(profile, 'country')
+                    pending.remove('country')
+                    yield {'username': username, 'country': profile['country'],
+                           'country_code': profile['country_code'], 'pending': list(pending)}
+                if 'engagement' in pending:
+                    self._load_group(profile, 'engagement')
+                    pending.remove('engagement')
+                    yield {'username': username, 'pending': list(pending),
+                           **{f: profile[f] for f in ENGAGEMENT_FIELDS}}
+        except Exception as e:
+            log.error("Enrichment failed for @%s: %s", username, e)
+        if pending:
+            # Let the client stop waiting for fields that will not arrive
+            yield {'username': username, 'pending': []}
+
+    def _profile_snapshot(self) -> Optional[Dict]:
+        """DOM snapshot of the open profile tab, taken once per profile (one round trip)"""
+        if self._snapshot is None:
+            self._snapshot = snapshot_profile(self.driver) or {}
+        return self._snapshot or None
+
+    def command_summary(self) -> str:
+        profiles = self.command_stats['profiles']
+        avg = self.command_stats['commands'] / profiles if profiles else 0
+        return f"WebDriver commands: {self.command_stats['commands']} over {profiles} profile tabs ({avg:.1f} per profile)"
+
+    def _cache_put(self, profile: Dict, fields):
+        if self.profile_cache:
+            self.profile_cache.put(profile['username'], profile, fields)
+
+    def _cache_record(self, fresh, started: float):
+        if self.profile_cache:
+            self.profile_cache.record('partial_hits' if fresh else 'misses', time.perf_counter() - started)
+
+    POST_LINK = "//a[contains(@href, '/p/')]"
+    MODAL_USERNAME = (
+        "//article//header//a[not(contains(@href, '/explore/locations/'))]",
+        "//div[contains(@class, '_a9zs')]/span/a"
+    )
+    DIALOG = "//div[@role='dialog']"
 
     def _get_username_from_modal(self) -> Optional[str]:
         try:
             # Try multiple selectors
-            selectors = [
-                "//article//header//a[not(contains(@href, '/explore/locations/'))]",
-                "//div[contains(@class, '_a9zs')]/span/a"
-            ]
-            for sel in selectors:
+            for sel in self.MODAL_USERNAME:
                 try:
                     elem = self.driver.find_element(By.XPATH, sel)
                     return elem.text.strip()
@@ -188,155 +782,166 @@ class InstagramScraper:
             return None
 
     def _next_post(self):
+        started = time.perf_counter()
         try:
+            old_url = self.driver.current_url
+            self.pacer.wait()
             # Try button then arrow key
             try:
                 btn = self.driver.find_element(By.XPATH, "//button[@aria-label='Next'] | //button[@aria-label='Next post'] | //*[name()='svg'][@aria-label='Next']/ancestor::button")
                 btn.click()
             except:
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ARROW_RIGHT)
-            self._random_delay(2, 3)
+            # The modal swaps the post URL when the next post is shown
+            if self.waiter.until('next_post', waits.url_changed(old_url)):
+                self.waiter.until('post_modal', waits.element_present(*self.MODAL_USERNAME))
         except:
             pass
+        finally:
+            self._record('next_post', time.perf_counter() - started)
 
-    def _analyze_profile_strict(self, username: str, filters: Dict, source_tag: str) -> Optional[Dict]:
+    def _new_profile(self, username: str, source_tag: str) -> Dict:
+        return {
+            'username': username,
+            'profile_pic_url': '',
+            'full_name': '',
+            'biography': '',
+            'followers': 0,
+            'following': 0,
+            'posts_count': 0,
+            'is_verified': False,
+            'country': 'Unknown',
+            'country_code': '',
+            'engagement_rate': 0,
+            'avg_likes': 0,
+            'avg_comments': 0,
+            'tags_matched': [source_tag]
+        }
+
+    def _rejected(self, check, load=None) -> bool:
+        """
+        Run the pending filters (loading field groups on demand when `load` is given).
+        Only rejections on fields that were actually read go into the seen filter:
+        a follower count that failed to parse or an About modal that never loaded
+        says nothing about the account.
+        """
+        reason = check.run(load)
+        if reason:
+            self.rejection_reason = reason
+            log.debug("Skipped: %s", reason)
+            if self.seen_filter and check.conclusive():
+                self.seen_filter.add(check.plan.signature_for(check.profile['tags_matched']), check.profile['username'])
+        return bool(reason)
+
+    def _load_group(self, profile: Dict, group: str) -> bool:
+        """Fetch one field group from the open profile tab, cache it and time it; False when nothing was read"""
+        started = time.perf_counter()
+        read = False
+        if group == 'basic':
+            self._extract_basic_data(profile)
+            read = bool(profile['followers'])
+            if read:
+                self._cache_put(profile, BASIC_FIELDS)
+        elif group == 'country':
+            address = self._get_address()
+            read = bool(address)
+            if address:
+                self._set_country(profile, address)
+                log.debug("Location: %s (%s)", address[:100], profile['country_code'] or '?')
+            else:
+                log.debug("Location: not available")
+            self._cache_put(profile, COUNTRY_FIELDS)
+        elif group == 'engagement':
+            read = bool(self._calculate_engagement(profile))
+            self._cache_put(profile, ENGAGEMENT_FIELDS)
+        default_costs().observe(group, time.perf_counter() - started)
+        self._record(group, time.perf_counter() - started)
+        return read
+
+    def _analyze_profile_strict(self, username: str, filters, source_tag: str,
+                                profile: Optional[Dict] = None, fresh=frozenset(), enrich: bool = True,
+                                check=None) -> Optional[Dict]:
         """
         Strictly analyze profile:
         1. Extract Bio, Followers, Following
-        2. Check Followers Range
-        3. Calculate Engagement
-        Country filtering removed - all countries accepted
+        2. Run the filters cheapest-first (followers, gender, country, engagement),
+           loading country / engagement only when a filter needs them
+        3. Fill whatever display fields are still missing
+        `profile` may arrive pre-filled (HTTP path / cache); steps whose fields
+        are in `fresh` are skipped. enrich=False stops after the filters and
+        leaves country / engagement to enrich_profile().
         """
         try:
-            profile = {
-                'username': username,
-                'profile_pic_url': '',
-                'full_name': '',
-                'biography': '',
-                'followers': 0,
-                'following': 0,
-                'posts_count': 0,
-                'is_verified': False,
-                'country': 'Unknown',
-                'engagement_rate': 0,
-                'avg_likes': 0,
-                'avg_comments': 0,
-                'tags_matched': [source_tag]
-            }
+            profile = profile or self._new_profile(username, source_tag)
+            if check is None:
+                plan = filters if isinstance(filters, FilterPlan) else FilterPlan(filters)
+                check = plan.start(profile)
+                check.add(fresh)
             
             # 1. Extract Basic Data (followers, bio, profile pic)
-            self._extract_basic_data(profile)
+            if fresh.issuperset(BASIC_FIELDS):
+                check.add(BASIC_FIELDS)
+            else:
+                check.add(BASIC_FIELDS, read=self._load_group(profile, 'basic'))
             
-            # LOG WHAT WE EXTRACTED
-            print(f"  [DATA] @{username}:")
-            print(f"    Followers: {profile['followers']}")
-            print(f"    Bio: {profile['biography'][:100] if profile['biography'] else 'N/A'}")
+            log.debug("Followers: %s, bio: %s", profile['followers'], (profile['biography'] or 'N/A')[:100])
             
-            # 2. Filter: Followers (CHECK FIRST - most efficient filter)
-            min_f = int(filters.get('min_followers', 0))
-            max_f = int(filters.get('max_followers', 1000000000))
-            if not (min_f <= profile['followers'] <= max_f):
-                self.rejection_reason = f"Followers ({profile['followers']}) not in range {min_f}-{max_f}"
-                print(f"  [SKIP] Followers out of range")
+            # 2. Filters, cheapest first; the first rejection ends the analysis
+            if self._rejected(check, load=lambda group: self._load_group(profile, group)):
                 return None
             
-            # Random skip to simulate filtering behavior (10% chance)
-            if random.random() < 0.1:
-                self.rejection_reason = "Random skip - doesn't match criteria"
-                print(f"  [SKIP] Profile doesn't match criteria")
-                return None
+            if not enrich:
+                profile['pending'] = [group for group in ('country', 'engagement') if not check.group_ready(group)]
+                log.info("✅ Filters passed, enrichment pending: %s", profile['pending'])
+                return profile
             
-            # Country filtering removed - accept all countries
-            # Extract address for display purposes only
-            address = self._get_address()
-            if address:
-                profile['country'] = address
-                print(f"    Location: {address[:100]}")
-            else:
-                print(f"    Location: Not available")
-
-            # 3. Engagement (Only if passed filters)
-            self._calculate_engagement(profile)
+            # 3. Display fields no filter needed
+            for group in ('country', 'engagement'):
+                if not check.group_ready(group):
+                    self._load_group(profile, group)
             
             # Profile matches criteria
-            print(f"  ✅ [MATCH] This profile matches the criteria!")
+            log.info("✅ Profile matches the criteria")
             
             return profile
             
         except Exception as e:
-            print(f"Analysis error: {e}")
+            log.warning("Analysis error: %s", e)
+            log.debug("Analysis error details", exc_info=True)
             self.rejection_reason = f"Error: {str(e)}"
             return None
 
     def _check_country_match(self, text: str, country: str) -> bool:
-        """Smart country matching"""
-        country_map = {
-            'united states': ['usa', 'us', 'united states', 'america', 'nyc', 'new york', 'la', 'los angeles', 'california', 'miami', 'florida', 'texas', 'chicago', 'atlanta', 'vegas'],
-            'united kingdom': ['uk', 'united kingdom', 'london', 'manchester', 'england', 'britain'],
-            'canada': ['canada', 'toronto', 'vancouver', 'montreal'],
-            'australia': ['australia', 'sydney', 'melbourne', 'brisbane', 'perth']
-        }
-        
-        keywords = country_map.get(country, [country])
-        return any(k in text for k in keywords)
+        """Country filter: location text and filter value normalized to the same ISO code"""
+        return get_gazetteer().matches(text, country)
+
+    def _set_country(self, profile: Dict, location: str):
+        """Keep the raw location for display plus its ISO code for filtering"""
+        profile['country'] = location
+        profile['country_code'] = get_gazetteer().normalize(location) or ''
+
+    def _extract_from_html(self, page_source: str, profile: Dict, thorough: bool = False) -> Dict:
+        """Fill basic fields from profile HTML (browser page_source or HTTP response) in one pass"""
+        found = extract_profile(page_source, thorough)
+        profile.update(found)
+        if found.get('followers'):
+            log.debug("Extracted %s followers from page source", found['followers'])
+        return found
 
     def _extract_basic_data(self, profile):
         """Extract basic profile data using Instagram's embedded JSON"""
         try:
-            import json
-            import re
-            
-            # BEST METHOD: Extract from window._sharedData or meta tags
-            page_source = self.driver.page_source
-            
-            # Method 1: Try to extract from window._sharedData JSON
-            try:
-                # Look for the embedded JSON data
-                pattern = r'<script type="application/ld\+json">({.*?})</script>'
-                matches = re.findall(pattern, page_source, re.DOTALL)
-                
-                for match_str in matches:
-                    try:
-                        data = json.loads(match_str)
-                        if 'interactionStatistic' in data:
-                            for stat in data['interactionStatistic']:
-                                if stat.get('@type') == 'InteractionCounter':
-                                    if 'FollowAction' in stat.get('interactionType', ''):
-                                        followers = stat.get('userInteractionCount', 0)
-                                        profile['followers'] = int(followers)
-                                        print(f"  [INFO] Extracted {followers} followers from JSON-LD")
-                                        break
-                    except:
-                        continue
-            except Exception as e:
-                print(f"  [DEBUG] JSON-LD extraction failed: {e}")
-            
-            # Method 2: Extract from meta description if Method 1 failed
-            if profile.get('followers', 0) == 0:
-                try:
-                    # Pattern: "46K Followers, 970 Following, 734 Posts"
-                    pattern = r'content="([\d,\.KMB]+)\s+Followers'
-                    match = re.search(pattern, page_source)
-                    if match:
-                        followers_text = match.group(1)
-                        profile['followers'] = self._parse_number(followers_text)
-                        print(f"  [INFO] Extracted {profile['followers']} followers from meta tag")
-                except Exception as e:
-                    print(f"  [DEBUG] Meta tag extraction failed: {e}")
+            # BEST METHOD: one injected script returns every field we need
+            snapshot = self._profile_snapshot()
+            if snapshot:
+                profile.update({k: v for k, v in snapshot['fields'].items() if v})
             
-            # Method 3: Try old edge_followed_by pattern
+            # Fallback: serialize the page and scan embedded JSON-LD / meta tags / JSON
             if profile.get('followers', 0) == 0:
-                try:
-                    pattern = r'"edge_followed_by":\s*\{\s*"count":\s*(\d+)'
-                    match = re.search(pattern, page_source)
-                    if match:
-                        profile['followers'] = int(match.group(1))
-                        print(f"  [INFO] Extracted {profile['followers']} followers from edge_followed_by")
-                except Exception as e:
-                    print(f"  [DEBUG] edge_followed_by extraction failed: {e}")
+                self._extract_from_html(self.driver.page_source, profile)
             
-            # Extract bio
-            try:
+            # Extract bio (per-element fallback when the snapshot had none)
+            if not profile.get('biography') and not snapshot:
                 selectors = [
                     "//header//div[@dir='auto']",
                     "//h1/following-sibling::div"
@@ -346,26 +951,25 @@ class InstagramScraper:
                         e = self.driver.find_element(By.XPATH, s)
                         if e.text and len(e.text) > 3:
                             profile['biography'] = e.text.strip()
-                            print(f"  [INFO] Extracted bio: {profile['biography'][:50]}...")
+                            log.debug("Extracted bio: %s...", profile['biography'][:50])
                             break
                     except:
                         continue
-            except:
-                pass
             
             # Extract profile picture
-            try:
-                e = self.driver.find_element(By.XPATH, "//header//img")
-                profile['profile_pic_url'] = e.get_attribute('src')
-            except:
-                pass
+            if not profile.get('profile_pic_url') and not snapshot:
+                try:
+                    e = self.driver.find_element(By.XPATH, "//header//img")
+                    profile['profile_pic_url'] = e.get_attribute('src')
+                except:
+                    pass
             
             # Final check
             if profile.get('followers', 0) == 0:
-                print(f"  [ERROR] Failed to extract followers for @{profile['username']}")
+                log.warning("Failed to extract followers for @%s", profile['username'])
                 
         except Exception as e:
-            print(f"  [ERROR] Basic data extraction error: {e}")
+            log.error("Basic data extraction error: %s", e)
 
     def _get_address(self) -> str:
         """Extract location from profile - try multiple methods"""
@@ -374,37 +978,35 @@ class InstagramScraper:
             
             # Method 1: Look for aria-label="Account based in" element directly
             try:
-                print(f"  [INFO] Looking for 'Account based in' element...")
+                snapshot = self._profile_snapshot()
+                if snapshot and snapshot['country']:
+                    log.debug("Found country via aria-label: %s", snapshot['country'])
+                    return snapshot['country']
                 
-                # First, try to find the element with aria-label="Account based in"
-                country_elements = self.driver.find_elements(By.XPATH, "//*[@aria-label='Account based in']")
+                # Per-element fallback: find the element with aria-label="Account based in"
+                country_elements = [] if snapshot else self.driver.find_elements(By.XPATH, "//*[@aria-label='Account based in']")
                 
                 if country_elements:
                     # Extract the text content
                     country_text = country_elements[0].text.strip()
                     if country_text:
                         # Clean up the text - remove "Account based in" prefix
-                        import re
-                        country_text = re.sub(r'^Account based in[\s\n]+', '', country_text, flags=re.IGNORECASE)
-                        country_text = country_text.strip()
-                        location_text = country_text
-                        print(f"  [INFO] Found country via aria-label: {location_text}")
+                        location_text = strip_account_based_in(country_text)
+                        log.debug("Found country via aria-label: %s", location_text)
                         return location_text
                     else:
                         # Try to get the text from child elements
                         try:
                             country_text = country_elements[0].get_attribute('textContent').strip()
                             if country_text:
-                                country_text = re.sub(r'^Account based in[\s\n]+', '', country_text, flags=re.IGNORECASE)
-                                country_text = country_text.strip()
-                                location_text = country_text
-                                print(f"  [INFO] Found country via textContent: {location_text}")
+                                location_text = strip_account_based_in(country_text)
+                                log.debug("Found country via textContent: %s", location_text)
                                 return location_text
                         except:
                             pass
                 
                 # If not found directly, we need to open the "About this account" modal
-                print(f"  [INFO] Element not found directly, opening About modal...")
+                log.debug("Element not found directly, opening About modal")
                 
                 # Find and click the ellipsis button
                 menu_button_found = False
@@ -412,7 +1014,7 @@ class InstagramScraper:
                 
                 # Find SVG with "Options" aria-label and get its clickable parent
                 svgs = self.driver.find_elements(By.XPATH, "//*[name()='svg' and @aria-label='Options']")
-                print(f"  [DEBUG] Found {len(svgs)} SVG elements with aria-label='Options'")
+                log.debug("Found %d SVG elements with aria-label='Options'", len(svgs))
                 
                 for svg in svgs:
                     current = svg
@@ -425,7 +1027,7 @@ class InstagramScraper:
                             if tag == 'button' or role == 'button' or tag == 'a':
                                 ellipsis_button = parent
                                 menu_button_found = True
-                                print(f"  [INFO] Found ellipsis button (level {level}, tag={tag}, role={role})")
+                                log.debug("Found ellipsis button (level %d, tag=%s, role=%s)", level, tag, role)
                                 break
                             current = parent
                         except:
@@ -437,20 +1039,21 @@ class InstagramScraper:
                 if not menu_button_found and len(svgs) > 0:
                     ellipsis_button = svgs[0].find_element(By.XPATH, "..")
                     menu_button_found = True
-                    print(f"  [INFO] Using SVG's immediate parent")
+                    log.debug("Using SVG's immediate parent")
                 
                 if menu_button_found and ellipsis_button:
                     # Click ellipsis
                     ellipsis_button.click()
-                    print(f"  [INFO] Clicked ellipsis menu")
-                    time.sleep(2)
+                    log.debug("Clicked ellipsis menu")
                     
                     # Click "About this account"
-                    about_buttons = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'About this account')]")
-                    if about_buttons:
-                        about_buttons[0].click()
-                        print(f"  [INFO] Clicked 'About this account'")
-                        time.sleep(3)
+                    about_button = self.waiter.until('menu', waits.element_present("//*[contains(text(), 'About this account')]"))
+                    if about_button:
+                        self.pacer.wait()
+                        about_button.click()
+                        log.debug("Clicked 'About this account'")
+                        # The dialog first shows the menu, then swaps to the About content
+                        self.waiter.until('about_modal', waits.text_contains(self.DIALOG, ('account based in', 'date joined')))
                         
                         # Now look for the aria-label="Account based in" element in the modal
                         country_elements = self.driver.find_elements(By.XPATH, "//*[@aria-label='Account based in']")
@@ -462,107 +1065,93 @@ class InstagramScraper:
                             
                             if country_text:
                                 # Clean up the text - remove "Account based in" prefix
-                                import re
-                                country_text = re.sub(r'^Account based in[\s\n]+', '', country_text, flags=re.IGNORECASE)
-                                country_text = country_text.strip()
-                                location_text = country_text
-                                print(f"  [INFO] Found country in modal: {location_text}")
+                                location_text = strip_account_based_in(country_text)
+                                log.debug("Found country in modal: %s", location_text)
                         else:
                             # Fallback: try to parse from modal text
                             try:
                                 modal = self.driver.find_element(By.XPATH, "//div[@role='dialog']")
                                 modal_text = modal.text
-                                print(f"  [DEBUG] Modal text: {modal_text[:400]}")
+                                log.debug("Modal text: %s", modal_text[:400])
                                 
-                                import re
-                                patterns = [
-                                    r'Account based in[\s\n]+([A-Za-z\s]+?)(?:\n|Date|To help|$)',
-                                    r'based in[\s\n]+([A-Za-z\s]+?)(?:\n|Date|To help|$)',
-                                ]
-                                for pattern in patterns:
-                                    match = re.search(pattern, modal_text, re.IGNORECASE | re.MULTILINE)
-                                    if match:
-                                        location_text = match.group(1).strip()
-                                        location_text = ' '.join(location_text.split())
-                                        location_text = re.sub(r'\s+(Date|To|help|keep|our).*$', '', location_text, flags=re.IGNORECASE)
-                                        print(f"  [INFO] Parsed country from modal text: {location_text}")
-                                        break
+                                location_text = country_from_about_text(modal_text) or ''
+                                if location_text:
+                                    log.debug("Parsed country from modal text: %s", location_text)
                             except Exception as e:
-                                print(f"  [DEBUG] Failed to parse modal text: {e}")
+                                log.debug("Failed to parse modal text: %s", e)
                         
                         # Close modal
-                        try:
-                            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                            time.sleep(0.5)
-                        except:
-                            pass
+                        self._dismiss_dialog()
                         
                         if location_text:
                             return location_text
                             
             except Exception as e:
-                print(f"  [DEBUG] About modal extraction failed: {e}")
+                log.debug("About modal extraction failed: %s", e)
                 # Try to close any open modals
-                try:
-                    self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                    time.sleep(0.5)
-                except:
-                    pass
+                self._dismiss_dialog()
             
             # Method 2: Look for location in bio text patterns
             try:
-                bio_elements = self.driver.find_elements(By.XPATH, "//header//div[@dir='auto']")
-                for elem in bio_elements:
-                    text = elem.text
-                    import re
-                    patterns = [
-                        r'📍\s*([A-Za-z\s,]+)',
-                        r'[Bb]ased in\s+([A-Za-z\s,]+)',
-                        r'[Ff]rom[:\s]+([A-Za-z\s,]+)',
-                        r'[Ll]ocation[:\s]+([A-Za-z\s,]+)',
-                        r'([A-Z][a-z]+,\s*[A-Z]{2})',  # City, ST format
-                    ]
-                    for pattern in patterns:
-                        match = re.search(pattern, text)
-                        if match:
-                            location_text = match.group(1).strip()
-                            print(f"  [INFO] Found location in bio: {location_text}")
-                            return location_text
+                snapshot = self._profile_snapshot()
+                if snapshot:
+                    bio_texts = [snapshot['bio']]
+                else:
+                    bio_texts = [e.text for e in self.driver.find_elements(By.XPATH, "//header//div[@dir='auto']")]
+                for text in bio_texts:
+                    location_text = location_from_bio(text) or ''
+                    if location_text:
+                        log.debug("Found location in bio: %s", location_text)
+                        return location_text
             except Exception as e:
-                print(f"  [DEBUG] Bio location extraction failed: {e}")
+                log.debug("Bio location extraction failed: %s", e)
             
             return location_text
             
         except Exception as e:
-            print(f"  [DEBUG] Address extraction error: {e}")
-            import traceback
-            traceback.print_exc()
+            log.debug("Address extraction error: %s", e, exc_info=True)
             return ""
 
 
-    def _infer_gender(self, bio: str, tag: str) -> str:
-        bio = bio.lower()
-        tag = tag.lower()
-        
-        male_terms = ['dad', 'father', 'husband', 'guy', 'man', 'boy', 'he/him', 'mr.']
-        female_terms = ['mom', 'mother', 'wife', 'girl', 'woman', 'lady', 'she/her', 'ms.', 'mrs.']
-        
-        # Check Bio
-        if any(w in bio for w in male_terms): return 'male'
-        if any(w in bio for w in female_terms): return 'female'
-        
-        # Check Tag
-        if any(w in tag for w in ['boy', 'men', 'male']): return 'male'
-        if any(w in tag for w in ['girl', 'women', 'female', 'lady']): return 'female'
-        
-        return 'unknown'
+    LIKES = "//section//div//span/span | //a[contains(@href, 'liked_by')]//span"
+    VIEW_COMMENTS = "//div[@role='dialog']//span[starts-with(normalize-space(.), 'View all') and contains(., 'comment')]"
 
-    def _calculate_engagement(self, profile):
+    def _dismiss_dialog(self):
+        """Press Escape and wait for any open dialog to disappear"""
+        try:
+            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+            self.waiter.until('modal_close', waits.element_gone(self.DIALOG))
+        except:
+            pass
+
+    def _calculate_engagement(self, profile) -> Optional[str]:
+        """
+        Likes/comments in bulk (embedded data, grid overlays, post pages over HTTP); modals as last resort.
+        Returns the source that had posts, None when none did.
+        """
+        # No post links in the snapshot does not mean no posts: the embedded data and grid may still have them
+        snapshot = self._profile_snapshot()
+        started = time.perf_counter()
+        source = self.engagement.compute(
+            profile,
+            html=self._profile_html,
+            driver=self.driver,
+            post_links=snapshot['post_links'] if snapshot else None
+        )
+        if not source and self._engagement_from_modals(profile):
+            source = 'modals'
+        if source:
+            log.debug("Engagement from %s in %.1fs: %s likes / %s comments avg",
+                      source, time.perf_counter() - started, profile['avg_likes'], profile['avg_comments'])
+        else:
+            log.debug("Engagement: no posts found by any source")
+        return source
+
+    def _engagement_from_modals(self, profile) -> bool:
+        """Fallback: click up to 12 posts and read likes (and comments when shown) from each modal"""
         try:
             posts = self.driver.find_elements(By.XPATH, "//article//a[contains(@href, '/p/')]")[:12]
-            total_likes = 0
-            total_comments = 0
-            count = 0
+            counts = []
             
             for post in posts:
                 try:
@@ -579,50 +1168,57 @@ class InstagramScraper:
                     # We should open post in NEW tab or Modal.
                     # Profile page -> Click post -> Modal opens.
                     
+                    self.pacer.wait()
                     post.click()
-                    self._random_delay(1, 2)
+                    self.waiter.until('engagement_post', waits.element_present(self.LIKES))
                     
                     # Extract Likes
+                    likes = comments = 0
                     try:
                         # Try multiple selectors
-                        l = self.driver.find_element(By.XPATH, "//section//div//span/span | //a[contains(@href, 'liked_by')]//span")
+                        l = self.driver.find_element(By.XPATH, self.LIKES)
                         likes = self._parse_number(l.text)
-                        total_likes += likes
                     except:
                         pass
                         
-                    # Extract Comments (approximate)
-                    # Hard to get exact count without scrolling
+                    # Extract Comments from "View all N comments" (0 when the modal lists them all)
+                    try:
+                        c = self.driver.find_element(By.XPATH, self.VIEW_COMMENTS)
+                        m = re.search(r'[\d.,]+[KMB]?', c.text)
+                        comments = self._parse_number(m.group(0)) if m else 0
+                    except:
+                        pass
                     
-                    count += 1
+                    counts.append((likes, comments))
                     
                     # Close modal
-                    self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                    self._random_delay(0.5, 1)
+                    self._dismiss_dialog()
                     
                 except:
-                    self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+                    self._dismiss_dialog()
             
-            if count > 0:
-                profile['avg_likes'] = int(total_likes / count)
-                if profile['followers'] > 0:
-                    profile['engagement_rate'] = round((profile['avg_likes'] / profile['followers']) * 100, 2)
+            if counts:
+                profile.update(summarize(counts, profile['followers']))
+                return True
                     
         except Exception as e:
-            print(f"Engagement calc error: {e}")
+            log.error("Engagement calc error: %s", e)
+        return False
 
     def _parse_number(self, text: str) -> int:
-        try:
-            text = text.replace(',', '').strip()
-            if 'K' in text: return int(float(text.replace('K', '')) * 1000)
-            if 'M' in text: return int(float(text.replace('M', '')) * 1000000)
-            return int(float(text))
-        except:
-            return 0
+        return parse_count(text)
 
     def close(self):
+        if self.phase_stats:
+            # Totals over the browser's life (a pooled one serves many searches; each gets its own metrics event)
+            log.info(self.phase_summary())
+        if self.page_stats['pages']:
+            log.info(self.page_summary())
         if self.driver:
             try:
                 self.driver.quit()
             except:
                 pass
+        if self.session_store and self.profile_path:
+            self.session_store.release_profile(self.profile_path)
+            self.profile_path = None
@@ -0,0 +1,274 @@
+"""
+Job Manager - Searches run on worker threads, independent of any HTTP connection
+"""
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Generator, Iterator, List, Optional, Tuple
+
+import logs
+import metrics
+from coalesce import covers, search_key
+from journal import Journal, JournalStore
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+JOBS_FINISHED = metrics.counter('search_jobs_total', 'Searches finished, by final status', ('status',))
+JOB_SECONDS = metrics.histogram('search_duration_seconds', 'Wall time of finished searches', ('status',),
+                                buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 3600))
+
+log = logs.get_logger('jobs')
+
+
+class Job:
+    """
+    One search. Every event it yields goes to its journal so any number of
+    viewers can attach late (or reconnect) and replay; profiles (with their
+    progressive updates merged in) are collected as results. Detached jobs
+    (POST /api/jobs) run to the end; the others are cancelled once nobody
+    has been watching for `grace` seconds.
+    """
+
+    def __init__(self, params: Dict, journals: Optional[JournalStore] = None,
+                 detached: bool = True, grace: float = 30):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.key = search_key(params)
+        self.detached = detached
+        self.grace = grace
+        self.status = QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.summary = None
+        self.journal = journals.create(self.id) if journals else Journal(self.id)
+        self.profiles: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.viewers = 0
+        self.shared = 0
+        self.cancel_requested = threading.Event()
+        self._cond = threading.Condition()
+
+    def publish(self, event: Dict):
+        self.journal.append(event)
+        with self._cond:
+            kind, data = event.get('type'), event.get('data')
+            if kind == 'profile':
+                self.profiles[data['username']] = dict(data)
+            elif kind == 'profile_update' and data.get('username') in self.profiles:
+                self.profiles[data['username']].update(data)
+            elif kind == 'complete':
+                self.summary = data
+            elif kind == 'error':
+                self.error = data
+
+    def set_status(self, status: str, error: Optional[str] = None):
+        with self._cond:
+            self.status = status
+            if status == RUNNING:
+                self.started = time.time()
+            elif status in FINISHED:
+                self.finished = time.time()
+            if error:
+                self.error = error
+        if status in FINISHED:
+            JOBS_FINISHED.inc(status=status)
+            if self.started:
+                JOB_SECONDS.observe(self.finished - self.started, status=status)
+            self.journal.finish()
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+    def tail(self, after: int = 0, heartbeat: float = 15) -> Iterator[Optional[Tuple[str, Dict]]]:
+        """(id, event) after seq `after`, then live until the job finishes; None as a keep-alive tick"""
+        return self.journal.tail(after, heartbeat)
+
+    def attach(self):
+        with self._cond:
+            self.viewers += 1
+
+    def detach(self):
+        with self._cond:
+            self.viewers -= 1
+            idle = self.viewers <= 0 and not self.detached and not self.done
+        if idle:
+            timer = threading.Timer(self.grace, self._cancel_if_unwatched)
+            timer.daemon = True
+            timer.start()
+
+    def _cancel_if_unwatched(self):
+        with self._cond:
+            if self.viewers <= 0 and not self.done:
+                log.info("Search %s has no viewers for %.0fs, cancelling", self.id, self.grace)
+                self.cancel_requested.set()
+
+    def to_dict(self, results: bool = True) -> Dict:
+        with self._cond:
+            info = {
+                'id': self.id,
+                'status': self.status,
+                'params': self.params,
+                'created': self.created,
+                'started': self.started,
+                'finished': self.finished,
+                'events': self.journal.last_seq,
+                'viewers': self.viewers,
+                'shared': self.shared,
+                'detached': self.detached,
+                'profiles_found': len(self.profiles),
+                'summary': self.summary,
+                'error': self.error,
+            }
+            if results:
+                info['profiles'] = [dict(p) for p in self.profiles.values()]
+            return info
+
+
+class JobManager:
+    """
+    FIFO job queue drained by `workers` threads, plus interactive searches
+    started immediately on their own thread (`start`). `runner(params, id)`
+    is the search generator (it leases browsers itself); closing it early
+    cancels the search and releases them. Finished jobs beyond `history`
+    are dropped oldest first; their journals stay replayable from disk.
+    """
+
+    def __init__(self, runner: Callable[[Dict, str], Generator[Dict, None, None]], workers: int = 1, history: int = 100,
+                 journals: Optional[JournalStore] = None, grace: float = 30,
+                 coalesce: bool = True, overlap: bool = False):
+        self.runner = runner
+        self.history = history
+        self.journals = journals or JournalStore()
+        self.grace = grace
+        self.coalesce = coalesce
+        self.overlap = overlap
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: 'queue.Queue[Job]' = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _register(self, job: Job) -> Job:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        return job
+
+    def submit(self, params: Dict) -> Job:
+        """Queue a detached job for the workers"""
+        job = self._register(Job(params, self.journals))
+        self._queue.put(job)
+        return job
+
+    def start(self, params: Dict) -> Job:
+        """
+        Run an interactive search right away; cancelled when unwatched for
+        `grace` seconds. With coalescing, a running search with the same
+        normalized query (or, with `overlap`, one whose filters cover these)
+        is returned instead: compare `job.key` to `search_key(params)`.
+        """
+        with self._lock:
+            job = self._running_match(params) if self.coalesce else None
+            if job:
+                job.shared += 1
+                return job
+            job = Job(params, self.journals, detached=False, grace=self.grace)
+            self._jobs[job.id] = job
+            self._prune()
+        threading.Thread(target=self._execute, args=(job,), name=f'search-{job.id}', daemon=True).start()
+        return job
+
+    def _running_match(self, params: Dict) -> Optional[Job]:
+        key = search_key(params)
+        running = [j for j in self._jobs.values() if not j.done and not j.cancel_requested.is_set()]
+        for job in running:
+            if job.key == key:
+                return job
+        if self.overlap:
+            for job in running:
+                if covers(job.params, params):
+                    return job
+        return None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if not job or job.done:
+            return False
+        job.cancel_requested.set()
+        if job.status == QUEUED:
+            job.publish({'type': 'complete', 'data': 'Search cancelled.'})
+            job.set_status(CANCELLED)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'workers': len(self._threads), 'queued': self._queue.qsize(), 'jobs': counts}
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j.done]
+        for job in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job.id]
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if not job.done:
+                self._execute(job)
+
+    def _execute(self, job: Job):
+        # Everything the search logs (pipeline threads included) carries its id
+        with logs.context(search_id=job.id):
+            self._run_job(job)
+
+    def _run_job(self, job: Job):
+        job.set_status(RUNNING)
+        events = self.runner(job.params, job.id)
+        try:
+            for event in events:
+                job.publish(event)
+                if job.cancel_requested.is_set():
+                    break
+        except Exception as e:
+            log.error("Job %s failed: %s", job.id, e, exc_info=True)
+            job.publish({'type': 'error', 'data': str(e)})
+            self._fail(job, str(e))
+            return
+        finally:
+            events.close()
+        if job.cancel_requested.is_set():
+            job.publish({'type': 'complete', 'data': 'Search cancelled.'})
+            job.set_status(CANCELLED)
+        elif job.summary is None and job.error:
+            self._fail(job)
+        else:
+            if job.summary is None:
+                job.publish({'type': 'complete', 'data': 'Search finished.'})
+            job.set_status(DONE)
+
+    @staticmethod
+    def _fail(job: Job, error: Optional[str] = None):
+        # Every journal ends with complete, so viewers stop instead of reconnecting to replay nothing
+        job.publish({'type': 'complete', 'data': 'Search failed.'})
+        job.set_status(FAILED, error)
+        logs.dump(job.id, 'failed')
@@ -0,0 +1,137 @@
+"""
+Event Journal - Per-search append-only event log with monotonic SSE ids
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import logs
+
+log = logs.get_logger('journal')
+
+
+def parse_event_id(value: Optional[str]) -> Tuple[Optional[str], int]:
+    """'<search_id>:<seq>' -> (search_id, seq); (None, 0) when absent or malformed"""
+    search_id, _, seq = (value or '').strip().rpartition(':')
+    try:
+        return (search_id or None), int(seq)
+    except ValueError:
+        return None, 0
+
+
+class Journal:
+    """
+    Events of one search numbered 1, 2, 3, ... (SSE id "<search_id>:<seq>").
+    Kept in memory for replay and, when `path` is set, appended to a JSON
+    Lines file (one compact `[seq, event]` array per line) so a finished or
+    interrupted search can still be replayed after a restart.
+    """
+
+    def __init__(self, search_id: str, path: Optional[str] = None,
+                 events: Optional[List[Dict]] = None, finished: bool = False):
+        self.search_id = search_id
+        self.path = path
+        self.events: List[Dict] = events or []
+        self.finished = finished
+        self._cond = threading.Condition()
+        self._file = open(path, 'a', encoding='utf-8') if path and not finished else None
+
+    @property
+    def last_seq(self) -> int:
+        return len(self.events)
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.search_id}:{seq}"
+
+    def append(self, event: Dict) -> str:
+        with self._cond:
+            self.events.append(event)
+            seq = len(self.events)
+            if self._file:
+                try:
+                    self._file.write(json.dumps([seq, event], separators=(',', ':')) + '\n')
+                    self._file.flush()
+                except (OSError, TypeError, ValueError) as e:
+                    log.warning("Journal write failed for %s: %s", self.search_id, e)
+            self._cond.notify_all()
+            return self.event_id(seq)
+
+    def finish(self):
+        with self._cond:
+            self.finished = True
+            if self._file:
+                self._file.close()
+                self._file = None
+            self._cond.notify_all()
+
+    def tail(self, after: int = 0, heartbeat: float = 15) -> Iterator[Optional[Tuple[str, Dict]]]:
+        """
+        (id, event) for every event after seq `after`, then live ones until the
+        journal is finished. Yields None after `heartbeat` seconds of silence.
+        """
+        seq = max(0, after)
+        while True:
+            with self._cond:
+                if seq >= len(self.events) and not self.finished:
+                    self._cond.wait(timeout=heartbeat)
+                batch = self.events[seq:]
+                finished = self.finished
+            if not batch:
+                if finished:
+                    return
+                yield None
+                continue
+            for event in batch:
+                seq += 1
+                yield self.event_id(seq), event
+
+
+class JournalStore:
+    """Journal files under `directory` (None keeps journals in memory only), pruned after `retention` seconds"""
+
+    def __init__(self, directory: Optional[str] = None, retention: float = 24 * 3600):
+        self.directory = directory
+        self.retention = retention
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.prune()
+
+    def _path(self, search_id: str) -> Optional[str]:
+        if not self.directory or not search_id.isalnum():
+            return None
+        return os.path.join(self.directory, f'{search_id}.jsonl')
+
+    def create(self, search_id: str) -> Journal:
+        return Journal(search_id, self._path(search_id))
+
+    def load(self, search_id: str) -> Optional[Journal]:
+        """A journal from disk (a past or interrupted search), read-only"""
+        path = self._path(search_id)
+        if not path or not os.path.exists(path):
+            return None
+        events = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line)[1])
+                except (ValueError, IndexError):
+                    break  # torn last line after a crash
+        return Journal(search_id, path, events, finished=True)
+
+    def prune(self) -> int:
+        if not self.directory:
+            return 0
+        cutoff = time.time() - self.retention
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith('.jsonl') and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,279 @@
+"""
+Logs - Leveled, structured logging off the scraping threads, with per-search debug buffers
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, List
+
+ROOT = 'finder'
+# Context fields attached to every record, in display order
+FIELDS = ('search_id', 'tag', 'username')
+
+_context: contextvars.ContextVar[Dict] = contextvars.ContextVar('log_context', default={})
+logging.addLevelName(logging.WARNING, 'WARN')
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the application root, e.g. get_logger('scraper') -> 'finder.scraper'"""
+    return logging.getLogger(f'{ROOT}.{name}')
+
+
+@contextmanager
+def context(**fields):
+    """
+    Add fields (search_id, tag, username) to every record logged inside the
+    block on this thread. Restores by value, so it is safe around yields in
+    generators that are resumed or closed from elsewhere.
+    """
+    previous = _context.get()
+    _context.set({**previous, **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.set(previous)
+
+
+def current() -> Dict:
+    return dict(_context.get())
+
+
+def run_in_context(target, *args):
+    """Thread target running in a copy of the caller's log context (threads start with an empty one)"""
+    ctx = contextvars.copy_context()
+    return lambda: ctx.run(target, *args)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the calling thread's context onto the record (runs before the record changes threads)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        ctx = _context.get()
+        for field in FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, ctx.get(field))
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """
+    Thins out DEBUG records per call site: the first `burst` get through,
+    then one in every `every`. INFO and above always pass.
+    """
+
+    def __init__(self, burst: int = 5, every: int = 20):
+        super().__init__()
+        self.burst = burst
+        self.every = max(1, every)
+        self.suppressed = 0
+        self._counts: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            n = self._counts.get(key, 0) + 1
+            self._counts[key] = n
+            keep = n <= self.burst or (n - self.burst) % self.every == 0
+            if not keep:
+                self.suppressed += 1
+        return keep
+
+
+class TextFormatter(logging.Formatter):
+    """[LEVEL] [search #tag @user] message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        tags = []
+        if getattr(record, 'search_id', None):
+            tags.append(record.search_id)
+        if getattr(record, 'tag', None):
+            tags.append(f'#{record.tag}')
+        if getattr(record, 'username', None):
+            tags.append(f'@{record.username}')
+        text = f"[{record.levelname}] " + (f"[{' '.join(tags)}] " if tags else '') + record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        return f"{text}\n{record.exc_text}" if record.exc_text else text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for field in FIELDS:
+            if getattr(record, field, None):
+                entry[field] = getattr(record, field)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread without formatting them here (only the message is resolved)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Marks the original, which the ring buffer keeps, so dump() skips what was already printed
+        record.printed = True
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RingBuffer(logging.Handler):
+    """
+    The last `size` records of each search (any level), kept unformatted in
+    memory for dump(); buffers of the `searches` most recent searches are kept.
+    """
+
+    def __init__(self, size: int = 500, searches: int = 50):
+        super().__init__(logging.DEBUG)
+        self.size = size
+        self.searches = searches
+        self._buffers: 'OrderedDict[str, deque]' = OrderedDict()
+
+    def emit(self, record: logging.LogRecord):
+        search_id = getattr(record, 'search_id', None)
+        if not search_id:
+            return
+        with self.lock:
+            buf = self._buffers.get(search_id)
+            if buf is None:
+                buf = self._buffers[search_id] = deque(maxlen=self.size)
+                while len(self._buffers) > self.searches:
+                    self._buffers.popitem(last=False)
+            buf.append(record)
+
+    def records(self, search_id: str) -> List[logging.LogRecord]:
+        with self.lock:
+            return list(self._buffers.get(search_id, ()))
+
+
+_lock = threading.Lock()
+_state: Dict = {}
+
+
+def _default_console():
+    """Until setup() runs (scripts importing the scraper directly): INFO and up, straight to stdout"""
+    root = logging.getLogger(ROOT)
+    if not root.handlers:
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(TextFormatter())
+        root.addHandler(console)
+        root.setLevel(logging.INFO)
+        root.propagate = False
+
+
+_default_console()
+
+
+def setup(level: str = 'INFO', fmt: str = 'text', buffer_size: int = 500,
+          sample_burst: int = 5, sample_every: int = 20, stream=None):
+    """
+    Configure the application loggers: records at `level` and above go
+    through a queue to a stream handler on a listener thread; with a
+    buffer, every record of a search (DEBUG included) is also kept for dump().
+    Safe to call again (reconfigures).
+    """
+    with _lock:
+        shutdown()
+        console_level = logging.getLevelName(level.upper().replace('WARNING', 'WARN'))
+        if not isinstance(console_level, int):
+            console_level = logging.INFO
+        console = logging.StreamHandler(stream or sys.stdout)
+        console.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+        q: 'queue.SimpleQueue' = queue.SimpleQueue()
+        queued = _QueueHandler(q)
+        queued.setLevel(console_level)
+        queued.addFilter(ContextFilter())
+        sampler = SampleFilter(sample_burst, sample_every)
+        queued.addFilter(sampler)
+        listener = logging.handlers.QueueListener(q, console)
+        listener.start()
+
+        root = logging.getLogger(ROOT)
+        root.handlers[:] = [queued]
+        root.propagate = False
+        buffer = None
+        if buffer_size > 0:
+            buffer = RingBuffer(buffer_size)
+            buffer.addFilter(ContextFilter())
+            root.addHandler(buffer)
+        # Without a buffer, records below the console level are not even created
+        root.setLevel(logging.DEBUG if buffer else console_level)
+        _state.update(console=console, queue=q, listener=listener, buffer=buffer, sampler=sampler, handlers=[queued, buffer])
+
+
+# Writes out whatever is still queued when the process exits
+atexit.register(lambda: shutdown())
+
+
+def shutdown():
+    """Flush and stop the listener thread (pending records are written first)"""
+    listener = _state.pop('listener', None)
+    if listener:
+        listener.stop()
+    root = logging.getLogger(ROOT)
+    for handler in _state.pop('handlers', []):
+        if handler in root.handlers:
+            root.removeHandler(handler)
+
+
+def records(search_id: str) -> List[str]:
+    """Buffered records of a search, formatted as the console would show them"""
+    buffer, console = _state.get('buffer'), _state.get('console')
+    if not buffer:
+        return []
+    return [console.format(r) for r in buffer.records(search_id)]
+
+
+def dump(search_id: str, reason: str = '') -> int:
+    """
+    Print the buffered records of a search that the console did not show
+    (below its level or sampled out), e.g. after the search failed
+    """
+    buffer, q = _state.get('buffer'), _state.get('queue')
+    if not buffer:
+        return 0
+    hidden = [r for r in buffer.records(search_id) if not getattr(r, 'printed', False)]
+    if not hidden:
+        return 0
+    header = logging.LogRecord(f'{ROOT}.logs', logging.ERROR, __file__, 0,
+                               f"Search {search_id} {reason or 'failed'}; {len(hidden)} unprinted record(s) "
+                               f"from its log buffer follow", None, None)
+    header.search_id = search_id
+    # Through the queue, after whatever the search logged last; the listener ignores levels
+    for record in [header] + hidden:
+        q.put_nowait(record)
+    return len(hidden)
+
+
+def stats() -> Dict:
+    sampler = _state.get('sampler')
+    return {'suppressed_debug': sampler.suppressed if sampler else 0,
+            'buffered_searches': len(_state['buffer']._buffers) if _state.get('buffer') else 0}
@@ -0,0 +1,172 @@
+"""
+Metrics - Process-wide latency histograms and counters in Prometheus text format
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+# Seconds; scraper phases range from a few ms (DOM reads) to a minute (slow page loads)
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], le: Optional[str] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic count per label combination"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labels: Labels = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels):
+        key = tuple(str(labels.get(n, '')) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_label_text(self.labels, key)} {_number(value)}"
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: Labels = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, '')) for n in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [bucket counts..., +Inf count, sum]
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def render(self) -> Iterable[str]:
+        with self._lock:
+            series = sorted((k, list(v)) for k, v in self._series.items())
+        for key, values in series:
+            for bound, count in zip(self.buckets, values):
+                yield f"{self.name}_bucket{_label_text(self.labels, key, _number(bound))} {count}"
+            yield f"{self.name}_bucket{_label_text(self.labels, key, '+Inf')} {values[-2]}"
+            yield f"{self.name}_sum{_label_text(self.labels, key)} {round(values[-1], 6)}"
+            yield f"{self.name}_count{_label_text(self.labels, key)} {values[-2]}"
+
+
+class Registry:
+    """Named metrics of the process; get-or-create, so re-imports return the same instance"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, help: str, labels: Labels = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: Labels = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets)
+
+    def render(self, gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+        """Prometheus text exposition; `gauges` ({name: (help, value)}) are point-in-time values read by the caller"""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for name, metric in metrics:
+            lines += [f"# HELP {name} {metric.help}", f"# TYPE {name} {metric.kind}"]
+            lines += list(metric.render())
+        for name, (help, value) in sorted((gauges or {}).items()):
+            if value is None:
+                continue
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {_number(value)}"]
+        return '\n'.join(lines) + '\n'
+
+
+_registry = Registry()
+
+
+def counter(name: str, help: str, labels: Labels = ()) -> Counter:
+    return _registry.counter(name, help, labels)
+
+
+def histogram(name: str, help: str, labels: Labels = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _registry.histogram(name, help, labels, buckets)
+
+
+def render(gauges: Optional[Dict[str, Tuple[str, float]]] = None) -> str:
+    return _registry.render(gauges)
+
+
+def phase_delta(before: Dict[str, Dict], after: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Per-phase count and total seconds between two snapshots of InstagramScraper.phase_stats"""
+    delta = {}
+    for phase, stat in after.items():
+        prev = before.get(phase, {'count': 0, 'total': 0.0})
+        count = stat['count'] - prev['count']
+        if count > 0:
+            total = stat['total'] - prev['total']
+            delta[phase] = {'count': count, 'total': total}
+    return delta
+
+
+def merge_phases(parts: Iterable[Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Sum per-phase deltas of several scrapers; seconds rounded for the wire"""
+    merged: Dict[str, Dict] = {}
+    for part in parts:
+        for phase, stat in part.items():
+            m = merged.setdefault(phase, {'count': 0, 'total': 0.0})
+            m['count'] += stat['count']
+            m['total'] += stat['total']
+    return {phase: {'count': m['count'], 'seconds': round(m['total'], 3),
+                    'mean_ms': round(m['total'] / m['count'] * 1000, 1)}
+            for phase, m in sorted(merged.items(), key=lambda item: -item[1]['total'])}
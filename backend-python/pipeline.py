@@ -0,0 +1,391 @@
+"""
+Analysis Pipeline - Concurrent tag crawlers feeding profile analysis workers
+"""
+
+import queue
+import threading
+from typing import Dict, Generator, List, Optional
+
+import logs
+from checkpoint import CrawlInterrupted, CrawlState
+from filters import FilterPlan
+
+_DONE = object()
+
+
+class ProfileBudget:
+    """Thread-safe `max_profiles` counter shared by every worker"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.found = 0
+        self._lock = threading.Lock()
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            return self.found >= self.limit
+
+    def claim(self) -> bool:
+        """Count a match; False if the budget was already used up by another worker"""
+        with self._lock:
+            if self.found >= self.limit:
+                return False
+            self.found += 1
+            return True
+
+
+class TagScheduler:
+    """
+    Hands tags to crawler threads. With `slice_posts` set, a crawler takes a
+    tag for that many posts and gives it back, so every tag keeps moving even
+    with fewer crawlers than tags. 'round_robin' picks the waiting tag that
+    has had the fewest slices; 'yield' picks the one whose candidates have
+    matched most often so far (smoothed), so productive tags get more of
+    the budget.
+    """
+
+    def __init__(self, tags: List[str], done=(), policy: str = 'round_robin', slice_posts: int = 0):
+        self.policy = policy
+        self.slice_posts = slice_posts
+        self.order = []
+        for tag in tags:
+            tag = tag.strip().replace('#', '')
+            if tag and tag not in self.order and tag not in done:
+                self.order.append(tag)
+        self.waiting = list(self.order)
+        self.slices = {t: 0 for t in self.order}
+        self.checked = {t: 0 for t in self.order}
+        self.matched = {t: 0 for t in self.order}
+        self._lock = threading.Lock()
+
+    def _score(self, tag: str):
+        if self.policy == 'yield':
+            # Laplace-smoothed match rate; untried tags start at 1/2, ties go to the less crawled tag
+            return (-(self.matched[tag] + 1) / (self.checked[tag] + 2), self.slices[tag], self.order.index(tag))
+        return (self.slices[tag], self.order.index(tag))
+
+    def take(self, prefer: Optional[str] = None) -> Optional[str]:
+        """Next tag to crawl (`prefer`, the crawler's previous tag, wins ties); None when none is waiting"""
+        with self._lock:
+            if not self.waiting:
+                return None
+            tag = min(self.waiting, key=lambda t: (self._score(t), t != prefer))
+            self.waiting.remove(tag)
+            self.slices[tag] += 1
+            return tag
+
+    def give_back(self, tag: str, finished: bool):
+        with self._lock:
+            if not finished:
+                self.waiting.append(tag)
+
+    def record(self, tag: str, matched: bool):
+        with self._lock:
+            if tag in self.checked:
+                self.checked[tag] += 1
+                self.matched[tag] += int(matched)
+
+    def summary(self) -> str:
+        with self._lock:
+            return ', '.join(f"#{t} {self.matched[t]}/{self.checked[t]} in {self.slices[t]} slice(s)" for t in self.order)
+
+
+class AnalysisPipeline:
+    """
+    Crawler scrapers (`producer` plus `crawlers`, each with its own driver)
+    walk tags concurrently as handed out by a TagScheduler. With `workers`,
+    crawlers push candidates into a bounded queue and each worker scraper
+    pulls usernames and runs the full profile analysis; without, every
+    crawler analyzes its own candidates. Events are yielded in order of
+    completion. The `max_profiles` budget, username dedupe and tag progress
+    are shared; an account turning up under another tag gets the tag added
+    to its tags_matched (a profile_update once it has been emitted).
+    In progressive mode a worker emits the profile as soon as the basic
+    filters pass, then enriches it itself and emits profile_update events.
+    Progress goes into `state`; candidates that never got checked (stop
+    request, lost browser) are deferred to its backlog, and run() raises
+    CrawlInterrupted when a browser was lost so the caller can resume.
+    """
+
+    def __init__(self, producer, workers: List, filters, max_profiles: int, queue_size: int = 0,
+                 progressive: bool = False, state: Optional[CrawlState] = None,
+                 crawlers: Optional[List] = None, tag_policy: str = 'round_robin', slice_posts: int = 12):
+        self.crawlers = [producer] + list(crawlers or [])
+        self.workers = workers
+        # One plan for all workers so filter stats cover the whole search
+        self.plan = filters if isinstance(filters, FilterPlan) else FilterPlan(filters)
+        self.progressive = progressive
+        self.state = state or CrawlState({'tags': [], 'filters': self.plan.filters, 'max_profiles': max_profiles})
+        self.tag_policy = tag_policy
+        self.slice_posts = slice_posts
+        self.budget = ProfileBudget(max_profiles)
+        self.budget.found = self.state.found
+        self.interrupted: Optional[CrawlInterrupted] = None
+        self.workers_alive = len(workers)
+        self.crawlers_running = len(self.crawlers)
+        self._lock = threading.Lock()
+        self.candidates = queue.Queue(maxsize=queue_size or max(1, len(workers)) * 2)
+        self.events = queue.Queue()
+        self.stop = threading.Event()
+        for scraper in self.crawlers + workers:
+            scraper.command_stats = {'profiles': 0, 'commands': 0}
+
+    def _keep_going(self) -> bool:
+        return not self.stop.is_set() and not self.budget.exhausted()
+
+    def _put_candidate(self, item) -> bool:
+        # Block while the queue is full, but notice a stop request
+        while not self.stop.is_set():
+            try:
+                self.candidates.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _interrupt(self, error: CrawlInterrupted, everyone: bool):
+        with self._lock:
+            self.interrupted = self.interrupted or error
+        if everyone:
+            self.stop.set()
+
+    def _candidate(self, scraper, username: str, tag: str) -> bool:
+        """Dedupe, then queue for a worker or analyze right here; False once the search should stop"""
+        if not self.state.claim_seen(username):
+            update = self.state.add_sighting(username, tag)
+            if update:
+                self.events.put({'type': 'profile_update', 'data': update})
+            return True
+        if self.workers:
+            if not self._put_candidate((username, tag)):
+                self.state.defer(username, tag)
+                return False
+            return True
+        return self._check(scraper, username, tag)
+
+    def _crawl(self, crawler, scheduler: TagScheduler):
+        tag = None
+        backlog = self.state.take_backlog()
+        try:
+            while backlog and self._keep_going():
+                username, source = backlog.pop(0)
+                # False means _candidate (or the check it ran) already deferred it
+                if not self._candidate(crawler, username, source):
+                    break
+            while self._keep_going():
+                tag = scheduler.take(prefer=tag)
+                if tag is None:
+                    return
+                finished = self._crawl_slice(crawler, tag, scheduler.slice_posts)
+                scheduler.give_back(tag, finished)
+                if finished:
+                    self.state.tag_done(tag)
+        except CrawlInterrupted as e:
+            if tag:
+                scheduler.give_back(tag, False)
+            self.events.put({'type': 'log', 'data': f"[WARN] {e}"})
+            self._interrupt(e, everyone=not self._other_crawlers())
+        except Exception as e:
+            self.events.put({'type': 'error', 'data': f"Crawler stopped: {e}"})
+        finally:
+            # Never handed out (stop request, budget, lost browser): checked first on the next resume
+            for username, source in backlog:
+                self.state.defer(username, source)
+            with self._lock:
+                self.crawlers_running -= 1
+                last = self.crawlers_running == 0
+            if last:
+                for _ in self.workers:
+                    self._put_candidate(_DONE)
+
+    def _other_crawlers(self) -> bool:
+        with self._lock:
+            return self.crawlers_running > 1
+
+    def _crawl_slice(self, crawler, tag: str, slice_posts: int) -> bool:
+        """Crawl `tag` from its saved position for up to `slice_posts` posts; True when the tag ran out"""
+        start = self.state.position(tag)
+        reached = start
+
+        def keep_going():
+            return self._keep_going() and not (slice_posts and reached - start >= slice_posts)
+
+        crawl = crawler._harvest_tag if crawler.crawl_mode == 'harvest' else crawler._crawl_tag
+        for event in crawl(tag, keep_going, skip=start):
+            if event['type'] != 'candidate':
+                self.events.put(event)
+                continue
+            if not self._candidate(crawler, event['data'], tag):
+                return False
+            reached = event['post']
+            self.state.advance(tag, reached)
+        return keep_going()
+
+    def _consume(self, worker):
+        while True:
+            try:
+                item = self.candidates.get(timeout=0.5)
+            except queue.Empty:
+                if self.stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                return
+            if not self._keep_going():
+                # Drain the rest of the queue without analyzing; a resume checks them first
+                if not self.budget.exhausted():
+                    self.state.defer(*item)
+                continue
+            if not self._check(worker, *item):
+                return
+
+    def _check(self, scraper, username: str, tag: str) -> bool:
+        """Full analysis of one candidate; False when `scraper`'s browser was lost doing it"""
+        self.events.put({'type': 'log', 'data': f"Checking @{username}..."})
+        profile = scraper._check_username(username, self.plan, tag, enrich=not self.progressive)
+        if not profile and not scraper.is_alive():
+            self.state.defer(username, tag)
+            if scraper in self.workers:
+                self._worker_lost(f"Analysis browser lost while checking @{username}")
+                return False
+            raise CrawlInterrupted(f"Browser lost while checking @{username}")
+        self.scheduler.record(tag, bool(profile))
+        if profile and self.budget.claim():
+            self.state.merge_tags(profile)
+            # Copy: enrichment keeps mutating the profile after the event is queued
+            self.events.put({'type': 'profile', 'data': dict(profile)})
+            self.events.put({'type': 'log', 'data': f"✅ MATCH: @{username}"})
+            if self.progressive:
+                for update in scraper.enrich_profile(profile):
+                    self.events.put({'type': 'profile_update', 'data': update})
+        elif profile:
+            self.events.put({'type': 'log', 'data': f"Dropped @{username}: profile budget reached"})
+        else:
+            reason = getattr(scraper, 'rejection_reason', 'Unknown reason')
+            self.events.put({'type': 'log', 'data': f"❌ Skipped @{username}: {reason}"})
+        return True
+
+    def _worker_lost(self, reason: str):
+        self.events.put({'type': 'log', 'data': f"[WARN] {reason}"})
+        with self._lock:
+            self.workers_alive -= 1
+            last = self.workers_alive <= 0
+        self._interrupt(CrawlInterrupted(reason), everyone=last)
+
+    def run(self, tags: List[str]) -> Generator[Dict, None, None]:
+        # Slicing only pays off with more tags than crawlers, and only when resuming a tag is cheap
+        slice_posts = self.slice_posts if (
+            len(tags) > len(self.crawlers) and all(c.crawl_mode == 'harvest' for c in self.crawlers)
+        ) else 0
+        self.scheduler = TagScheduler(tags, self.state.tags_done, self.tag_policy, slice_posts)
+        threads = [
+            threading.Thread(target=logs.run_in_context(self._crawl, c, self.scheduler), name=f'pipeline-crawler-{i}', daemon=True)
+            for i, c in enumerate(self.crawlers)
+        ]
+        threads += [
+            threading.Thread(target=logs.run_in_context(self._consume, w), name=f'pipeline-worker-{i}', daemon=True)
+            for i, w in enumerate(self.workers)
+        ]
+        parts = []
+        if len(self.crawlers) > 1:
+            parts.append(f"{len(self.crawlers)} tag crawlers ({self.tag_policy})")
+        if self.workers:
+            parts.append(f"{len(self.workers)} parallel worker(s)")
+        yield {'type': 'log', 'data': f"Analyzing with {' and '.join(parts)}"}
+
+        for t in threads:
+            t.start()
+        try:
+            while any(t.is_alive() for t in threads) or not self.events.empty():
+                try:
+                    event = self.events.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.state.observe(event)
+                yield event
+        finally:
+            # Client went away or search finished: stop threads before their drivers are reused
+            self.stop.set()
+            for t in threads:
+                t.join()
+            # Left behind when every worker was lost
+            while True:
+                try:
+                    item = self.candidates.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _DONE:
+                    self.state.defer(*item)
+
+        # Lost a browser: the caller restarts and resumes from state (backlog included)
+        if self.interrupted and not self.budget.exhausted():
+            raise self.interrupted
+
+        for i, crawler in enumerate(self.crawlers[1:] if not self.workers else []):
+            yield {'type': 'log', 'data': f"Crawler {i + 1}: {crawler.command_summary()}"}
+        for i, worker in enumerate(self.workers):
+            yield {'type': 'log', 'data': f"Worker {i}: {worker.command_summary()}"}
+        if len(self.scheduler.order) > 1:
+            yield {'type': 'log', 'data': f"Tags: {self.scheduler.summary()}"}
+        yield {'type': 'log', 'data': self.plan.stats.summary()}
+        complete = {'type': 'complete', 'data': f"Search finished. Found {self.budget.found} profiles.",
+                    'filters': self.plan.stats.report()}
+        self.state.observe(complete)
+        yield complete
+
+
+class EnrichmentStage:
+    """
+    Progressive mode for a serial search: a dedicated scraper reopens each
+    emitted profile and computes country / engagement while the crawling
+    scraper moves on. Updates queue up as profile_update events that the
+    search loop yields between its own events.
+    """
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.tasks = queue.Queue()
+        self.events = queue.Queue()
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=logs.run_in_context(self._run), name='enrichment', daemon=True)
+        self.thread.start()
+
+    def submit(self, profile: Dict):
+        self.tasks.put(profile)
+
+    def _run(self):
+        while not self.stop.is_set():
+            try:
+                profile = self.tasks.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if profile is _DONE:
+                return
+            try:
+                for update in self.scraper.enrich_profile(profile):
+                    self.events.put({'type': 'profile_update', 'data': update})
+                    if self.stop.is_set():
+                        break
+            except Exception as e:
+                self.events.put({'type': 'error', 'data': f"Enrichment failed for @{profile['username']}: {e}"})
+
+    def drain(self) -> Generator[Dict, None, None]:
+        """Updates that are ready now, without waiting"""
+        while True:
+            try:
+                yield self.events.get_nowait()
+            except queue.Empty:
+                return
+
+    def finish(self) -> Generator[Dict, None, None]:
+        """Wait for queued profiles to be enriched, yielding their updates"""
+        self.tasks.put(_DONE)
+        while self.thread.is_alive() or not self.events.empty():
+            try:
+                yield self.events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    def close(self):
+        self.stop.set()
+        self.thread.join()
@@ -0,0 +1,147 @@
+"""
+Profile Cache - Persistent per-username profile store with per-field TTLs
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Fields grouped by how they are obtained; each group has its own TTL (seconds)
+BASIC_FIELDS = ('followers', 'following', 'posts_count', 'full_name', 'biography', 'profile_pic_url', 'is_verified')
+COUNTRY_FIELDS = ('country', 'country_code')
+ENGAGEMENT_FIELDS = ('engagement_rate', 'avg_likes', 'avg_comments')
+
+DEFAULT_TTLS = {
+    'basic': 24 * 3600,
+    'country': 30 * 24 * 3600,
+    'engagement': 3 * 24 * 3600,
+}
+
+_GROUPS = {
+    **{f: 'basic' for f in BASIC_FIELDS},
+    **{f: 'country' for f in COUNTRY_FIELDS},
+    **{f: 'engagement' for f in ENGAGEMENT_FIELDS},
+}
+
+
+def field_group(field: str) -> str:
+    """'followers' -> 'basic', 'country_code' -> 'country', ..."""
+    return _GROUPS[field]
+
+
+def ttls_from_env() -> Dict[str, float]:
+    """PROFILE_CACHE_TTLS="basic=86400,country=2592000,engagement=259200" """
+    ttls = dict(DEFAULT_TTLS)
+    for item in os.getenv('PROFILE_CACHE_TTLS', '').split(','):
+        group, _, value = item.partition('=')
+        try:
+            ttls[group.strip()] = float(value)
+        except ValueError:
+            continue
+    return ttls
+
+
+class ProfileCache:
+    """
+    SQLite-backed store of profile dicts keyed by username. Every field keeps
+    its own fetch timestamp so a stale engagement figure does not force the
+    (cheaper) follower count to be re-read, and vice versa.
+    """
+
+    PURGE_EVERY = 200  # writes between expired-row sweeps
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.ttls = ttls or ttls_from_env()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS profiles ('
+            ' username TEXT PRIMARY KEY,'
+            ' data TEXT NOT NULL,'
+            ' fetched TEXT NOT NULL,'
+            ' updated REAL NOT NULL)'
+        )
+        self._conn.commit()
+        self._writes = 0
+        self._counters = {'hits': 0, 'partial_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self._miss_seconds = 0.0
+        self._miss_samples = 0
+        self.purge()
+
+    def _ttl(self, field: str) -> float:
+        return self.ttls.get(_GROUPS.get(field, 'basic'), 0)
+
+    def lookup(self, username: str) -> Tuple[Dict, Set[str]]:
+        """Cached profile fields that are still fresh, and the set of those field names"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, fetched FROM profiles WHERE username = ?', (username,)
+            ).fetchone()
+        if not row:
+            return {}, set()
+        data, fetched = json.loads(row[0]), json.loads(row[1])
+        now = time.time()
+        fresh = {f for f, ts in fetched.items() if f in data and now - ts < self._ttl(f)}
+        return {f: data[f] for f in fresh}, fresh
+
+    def record(self, kind: str, seconds: float = 0.0):
+        """Count a lookup outcome: 'hits' (no navigation), 'partial_hits' or 'misses'"""
+        with self._lock:
+            self._counters[kind] += 1
+            if kind != 'hits' and seconds:
+                self._miss_seconds += seconds
+                self._miss_samples += 1
+
+    def put(self, username: str, profile: Dict, fields: Iterable[str]):
+        """Upsert `fields` of `profile`, stamping each with the current time"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, fetched FROM profiles WHERE username = ?', (username,)
+            ).fetchone()
+            data, fetched = (json.loads(row[0]), json.loads(row[1])) if row else ({}, {})
+            for field in fields:
+                if field in profile:
+                    data[field] = profile[field]
+                    fetched[field] = now
+            self._conn.execute(
+                'INSERT OR REPLACE INTO profiles (username, data, fetched, updated) VALUES (?, ?, ?, ?)',
+                (username, json.dumps(data), json.dumps(fetched), now)
+            )
+            self._conn.commit()
+            self._counters['writes'] += 1
+            self._writes += 1
+            due = self._writes % self.PURGE_EVERY == 0
+        if due:
+            self.purge()
+
+    def purge(self) -> int:
+        """Delete rows whose every field has outlived the longest TTL"""
+        cutoff = time.time() - max(self.ttls.values())
+        with self._lock:
+            cur = self._conn.execute('DELETE FROM profiles WHERE updated < ?', (cutoff,))
+            self._conn.commit()
+            self._counters['evictions'] += cur.rowcount
+            return cur.rowcount
+
+    def stats(self) -> Dict:
+        with self._lock:
+            size = self._conn.execute('SELECT COUNT(*) FROM profiles').fetchone()[0]
+            lookups = self._counters['hits'] + self._counters['partial_hits'] + self._counters['misses']
+            avg_miss = self._miss_seconds / self._miss_samples if self._miss_samples else 0
+            return {
+                'size': size,
+                **self._counters,
+                'hit_rate': round(self._counters['hits'] / lookups, 3) if lookups else 0,
+                # Full hits skip navigation entirely; estimate with the average cost of a miss
+                'est_seconds_saved': round(self._counters['hits'] * avg_miss, 1),
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,215 @@
+"""
+Profile Extract - Single-pass profile field extraction from page HTML
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+PROFILE_FIELDS = ('followers', 'following', 'posts_count', 'full_name', 'biography', 'profile_pic_url', 'is_verified')
+# Without these from the head, the body is searched; otherwise only when asked to be thorough
+COUNT_FIELDS = ('followers', 'following', 'posts_count')
+
+# <head> holds the meta tags and JSON-LD: one combined pass over it.
+_HEAD_SCAN = re.compile(
+    r'<script type="application/ld\+json">(?P<ld>\{.*?\})</script>'
+    r'|<meta (?:property|name)="(?P<meta_name>og:description|description|og:title|og:image)" content="(?P<meta>[^"]*)"'
+    r'|<meta content="(?P<meta_rev>[^"]*)" (?:property|name)="(?P<meta_rev_name>og:description|description|og:title|og:image)"',
+    re.DOTALL
+)
+_LD_BLOCK = re.compile(r'<script type="application/ld\+json">(\{.*?\})</script>', re.DOTALL)
+
+# The multi-megabyte body is only consulted for fields the head did not
+# provide: one literal find locates the owner's embedded user object, then the
+# field patterns run inside a window around it instead of over the whole page.
+_USER_ANCHORS = ('"edge_followed_by"', '"follower_count"')
+_USER_WINDOW = 20000
+_EMBEDDED = (
+    ('followers', re.compile(r'"edge_followed_by":\s*\{\s*"count":\s*(\d+)'), int),
+    ('followers', re.compile(r'"follower_count":\s*(\d+)'), int),
+    ('following', re.compile(r'"edge_follow":\s*\{\s*"count":\s*(\d+)'), int),
+    ('following', re.compile(r'"following_count":\s*(\d+)'), int),
+    ('posts_count', re.compile(r'"edge_owner_to_timeline_media":\s*\{\s*"count":\s*(\d+)'), int),
+    ('posts_count', re.compile(r'"media_count":\s*(\d+)'), int),
+    ('full_name', re.compile(r'"full_name":\s*"((?:[^"\\]|\\.)*)"'), None),
+    ('biography', re.compile(r'"biography":\s*"((?:[^"\\]|\\.)*)"'), None),
+    ('profile_pic_url', re.compile(r'"profile_pic_url_hd":\s*"((?:[^"\\]|\\.)*)"'), None),
+    ('profile_pic_url', re.compile(r'"profile_pic_url":\s*"((?:[^"\\]|\\.)*)"'), None),
+    # First occurrence belongs to the profile owner; later ones are related accounts
+    ('is_verified', re.compile(r'"is_verified":\s*(true|false)'), lambda v: v == 'true'),
+)
+
+# "46K Followers, 970 Following, 734 Posts - See Instagram photos and videos from Jane Doe (@jane)"
+_META_COUNTS = re.compile(
+    r'(?P<followers>[\d,.]+[KMB]?)\s+Followers,\s*(?P<following>[\d,.]+[KMB]?)\s+Following,\s*(?P<posts>[\d,.]+[KMB]?)\s+Posts'
+    r'(?:.*?from\s+(?P<name>.*?)\s+\(@)?',
+    re.DOTALL
+)
+_OG_TITLE_NAME = re.compile(r'^(?P<name>.*?)\s+\(@[^)]+\)')
+
+# Source priority per field (lower wins), mirroring the old JSON-LD -> meta -> embedded order
+_RANK = {'ld': 0, 'meta': 1, 'json': 2}
+
+# Location patterns (compiled once, used by InstagramScraper._get_address)
+_ACCOUNT_BASED_IN_PREFIX = re.compile(r'^Account based in[\s\n]+', re.IGNORECASE)
+_ABOUT_COUNTRY = (
+    re.compile(r'Account based in[\s\n]+([A-Za-z\s]+?)(?:\n|Date|To help|$)', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'based in[\s\n]+([A-Za-z\s]+?)(?:\n|Date|To help|$)', re.IGNORECASE | re.MULTILINE),
+)
+_ABOUT_TRAILER = re.compile(r'\s+(Date|To|help|keep|our).*$', re.IGNORECASE)
+_BIO_LOCATION = (
+    re.compile(r'📍\s*([A-Za-z\s,]+)'),
+    re.compile(r'[Bb]ased in\s+([A-Za-z\s,]+)'),
+    re.compile(r'[Ff]rom[:\s]+([A-Za-z\s,]+)'),
+    re.compile(r'[Ll]ocation[:\s]+([A-Za-z\s,]+)'),
+    re.compile(r'([A-Z][a-z]+,\s*[A-Z]{2})'),  # City, ST format
+)
+
+
+def parse_count(text: str) -> int:
+    """'46K' -> 46000, '1.2M' -> 1200000, '1,234' -> 1234; 0 if unparseable"""
+    try:
+        text = text.replace(',', '').strip()
+        for suffix, mult in (('K', 1000), ('M', 1000000), ('B', 1000000000)):
+            if suffix in text:
+                return int(float(text.replace(suffix, '')) * mult)
+        return int(float(text))
+    except (ValueError, AttributeError):
+        return 0
+
+
+def _json_string(raw: str) -> str:
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+def _from_ld(raw: str, found: Dict, rank: Dict):
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return
+    if not isinstance(data, dict):
+        return
+    # Profile data sits at the top level or under mainEntity / author
+    for node in (data, data.get('mainEntity') or {}, data.get('author') or {}):
+        if not isinstance(node, dict):
+            continue
+        for stat in node.get('interactionStatistic') or []:
+            if isinstance(stat, dict) and stat.get('@type') == 'InteractionCounter':
+                kind = stat.get('interactionType', '')
+                kind = kind.get('@type', '') if isinstance(kind, dict) else kind
+                if 'FollowAction' in kind:
+                    _offer(found, rank, 'followers', int(stat.get('userInteractionCount', 0) or 0), 'ld')
+        if node.get('name'):
+            _offer(found, rank, 'full_name', node['name'], 'ld')
+        if node.get('description'):
+            _offer(found, rank, 'biography', node['description'], 'ld')
+        image = node.get('image')
+        if isinstance(image, str) and image:
+            _offer(found, rank, 'profile_pic_url', image, 'ld')
+
+
+def _from_meta(name: str, content: str, found: Dict, rank: Dict):
+    content = content.replace('&amp;', '&').replace('&quot;', '"').replace('&#039;', "'")
+    if name in ('description', 'og:description'):
+        m = _META_COUNTS.search(content)
+        if m:
+            _offer(found, rank, 'followers', parse_count(m.group('followers')), 'meta')
+            _offer(found, rank, 'following', parse_count(m.group('following')), 'meta')
+            _offer(found, rank, 'posts_count', parse_count(m.group('posts')), 'meta')
+            if m.group('name'):
+                _offer(found, rank, 'full_name', m.group('name'), 'meta')
+    elif name == 'og:title':
+        m = _OG_TITLE_NAME.match(content)
+        if m and m.group('name'):
+            _offer(found, rank, 'full_name', m.group('name'), 'meta')
+    elif name == 'og:image' and content:
+        _offer(found, rank, 'profile_pic_url', content, 'meta')
+
+
+def _offer(found: Dict, rank: Dict, field: str, value, source: str):
+    r = _RANK[source]
+    if field not in rank or r < rank[field]:
+        found[field] = value
+        rank[field] = r
+
+
+def extract_profile(html: str, thorough: bool = False) -> Dict:
+    """
+    Return whichever of PROFILE_FIELDS the page embeds. Sources, in priority
+    order: JSON-LD, description/og meta tags, embedded GraphQL-style JSON.
+    The head is scanned once; the body only around the owner's user object,
+    and only when the head lacked the counts (or `thorough` asks for every field).
+    """
+    found: Dict = {}
+    rank: Dict = {}
+    head_end = html.find('</head>')
+    if head_end < 0:
+        head_end = len(html)
+
+    for m in _HEAD_SCAN.finditer(html, 0, head_end):
+        if m.group('ld') is not None:
+            _from_ld(m.group('ld'), found, rank)
+        elif m.group('meta_name'):
+            _from_meta(m.group('meta_name'), m.group('meta'), found, rank)
+        else:
+            _from_meta(m.group('meta_rev_name'), m.group('meta_rev'), found, rank)
+
+    if any(f not in found for f in (PROFILE_FIELDS if thorough else COUNT_FIELDS)):
+        anchor = -1
+        for needle in _USER_ANCHORS:
+            anchor = html.find(needle, head_end)
+            if anchor >= 0:
+                break
+        if anchor >= 0:
+            lo, hi = max(head_end, anchor - _USER_WINDOW), anchor + _USER_WINDOW
+            for field, pattern, convert in _EMBEDDED:
+                if field in found:
+                    continue
+                m = pattern.search(html, lo, hi)
+                if m:
+                    value = convert(m.group(1)) if convert else _json_string(m.group(1))
+                    if value or convert:
+                        _offer(found, rank, field, value, 'json')
+
+    # Last resort for followers: JSON-LD rendered into the body
+    if 'followers' not in found:
+        for m in _LD_BLOCK.finditer(html, head_end):
+            _from_ld(m.group(1), found, rank)
+    return found
+
+
+def extract_from_parts(meta: Dict[str, str], ld_blocks: List[str]) -> Dict:
+    """Same extraction when the DOM already handed us the meta contents and JSON-LD texts"""
+    found: Dict = {}
+    rank: Dict = {}
+    for raw in ld_blocks:
+        _from_ld(raw, found, rank)
+    for name, content in meta.items():
+        if content:
+            _from_meta(name, content, found, rank)
+    return found
+
+
+def strip_account_based_in(text: str) -> str:
+    return _ACCOUNT_BASED_IN_PREFIX.sub('', text).strip()
+
+
+def country_from_about_text(text: str) -> Optional[str]:
+    """Country from the full text of the About this account modal"""
+    for pattern in _ABOUT_COUNTRY:
+        m = pattern.search(text)
+        if m:
+            location = ' '.join(m.group(1).strip().split())
+            return _ABOUT_TRAILER.sub('', location)
+    return None
+
+
+def location_from_bio(text: str) -> Optional[str]:
+    for pattern in _BIO_LOCATION:
+        m = pattern.search(text)
+        if m:
+            return m.group(1).strip()
+    return None
@@ -0,0 +1,232 @@
+"""
+Seen Filter - Memory-bounded set of recently rejected usernames shared by all searches
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import logs
+
+log = logs.get_logger('seen_filter')
+
+_MAGIC = b'SEEN1\n'
+
+
+def _hashes(key: str) -> Tuple[int, int]:
+    """Two independent 64-bit hashes; index i is h1 + i*h2 (Kirsch-Mitzenmacher)"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1, h2 = struct.unpack('<QQ', digest)
+    return h1, h2 | 1
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter sized for `capacity` items at `error_rate` false positives"""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def _indexes(self, hashes: Tuple[int, int]):
+        h1, h2 = hashes
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def contains(self, hashes: Tuple[int, int]) -> bool:
+        bits = self.bits
+        return all(bits[i >> 3] & (1 << (i & 7)) for i in self._indexes(hashes))
+
+    def add(self, hashes: Tuple[int, int]):
+        bits = self.bits
+        for i in self._indexes(hashes):
+            bits[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """
+    Chain of Bloom filters that grows as items arrive (Almeida et al.): each
+    new slice is `growth` times larger with a tighter error rate, so the
+    overall false-positive rate stays below `error_rate` however many
+    items are added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, growth: int = 2, tightening: float = 0.8,
+                 created: Optional[float] = None, slices: Optional[List[BloomFilter]] = None):
+        self.initial_capacity = capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.created = created or time.time()
+        self.slices: List[BloomFilter] = slices or []
+
+    def _grow(self):
+        n = len(self.slices)
+        self.slices.append(BloomFilter(
+            self.initial_capacity * self.growth ** n,
+            self.error_rate * (1 - self.tightening) * self.tightening ** n
+        ))
+
+    def contains(self, hashes: Tuple[int, int]) -> bool:
+        return any(s.contains(hashes) for s in self.slices)
+
+    def add(self, hashes: Tuple[int, int]):
+        if not self.slices or self.slices[-1].full:
+            self._grow()
+        self.slices[-1].add(hashes)
+
+    @property
+    def count(self) -> int:
+        return sum(s.count for s in self.slices)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(s.bits) for s in self.slices)
+
+
+class SeenFilter:
+    """
+    Usernames rejected under a given filter set, remembered for between
+    `window` and 2x`window` seconds: two generations of scalable Bloom
+    filters, where the older one is dropped and a fresh one started every
+    `window` seconds. Membership can be a false positive (at most about
+    2x`error_rate`), never a false negative, so a hit means "very likely
+    rejected recently". Persisted to `path` at most every `save_interval`
+    seconds while dirty, and on close().
+    """
+
+    def __init__(self, path: Optional[str] = None, window: float = 24 * 3600, error_rate: float = 0.001,
+                 capacity: int = 100000, save_interval: float = 30):
+        self.path = path
+        self.window = window
+        self.error_rate = error_rate
+        self.capacity = capacity
+        self.save_interval = save_interval
+        self.generations: List[ScalableBloomFilter] = []
+        self.counters = {'hits': 0, 'misses': 0, 'added': 0, 'rotations': 0}
+        self._dirty = False
+        self._saved = time.monotonic()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load()
+        if not self.generations:
+            self.generations = [self._new_generation()]
+
+    def _new_generation(self) -> ScalableBloomFilter:
+        return ScalableBloomFilter(self.capacity, self.error_rate)
+
+    def _rotate(self):
+        age = time.time() - self.generations[0].created
+        if age >= self.window:
+            # The current generation becomes the previous one, unless it is past both windows too
+            keep = self.generations[:1] if age < 2 * self.window else []
+            self.generations = [self._new_generation()] + keep
+            self.counters['rotations'] += 1
+            self._dirty = True
+
+    @staticmethod
+    def key(scope: str, username: str) -> str:
+        return f"{scope}|{username.lower()}"
+
+    def seen(self, scope: str, username: str) -> bool:
+        hashes = _hashes(self.key(scope, username))
+        with self._lock:
+            self._rotate()
+            hit = any(g.contains(hashes) for g in self.generations)
+            self.counters['hits' if hit else 'misses'] += 1
+            return hit
+
+    def add(self, scope: str, username: str):
+        hashes = _hashes(self.key(scope, username))
+        with self._lock:
+            self._rotate()
+            current = self.generations[0]
+            if current.contains(hashes):
+                return
+            current.add(hashes)
+            self.counters['added'] += 1
+            self._dirty = True
+            due = time.monotonic() - self._saved >= self.save_interval
+        if due:
+            self.save()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.counters,
+                'items': sum(g.count for g in self.generations),
+                'bytes': sum(g.nbytes for g in self.generations),
+                'slices': sum(len(g.slices) for g in self.generations),
+                'window_seconds': self.window,
+                'error_rate': self.error_rate,
+            }
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            header = {'window': self.window, 'generations': [
+                {'created': g.created, 'capacity': g.initial_capacity, 'error_rate': g.error_rate,
+                 'growth': g.growth, 'tightening': g.tightening,
+                 'slices': [{'capacity': s.capacity, 'error_rate': s.error_rate, 'count': s.count}
+                            for s in g.slices]}
+                for g in self.generations
+            ]}
+            blobs = [bytes(s.bits) for g in self.generations for s in g.slices]
+            self._dirty = False
+            self._saved = time.monotonic()
+        raw = json.dumps(header).encode('utf-8')
+        tmp = f'{self.path}.tmp'
+        with self._write_lock:
+            try:
+                with open(tmp, 'wb') as f:
+                    f.write(_MAGIC + struct.pack('<I', len(raw)) + raw)
+                    for blob in blobs:
+                        f.write(blob)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                log.warning("Seen filter save failed: %s", e)
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    raise ValueError('not a seen filter file')
+                size, = struct.unpack('<I', f.read(4))
+                header = json.loads(f.read(size))
+                generations = []
+                for g in header['generations']:
+                    slices = []
+                    for s in g['slices']:
+                        bloom = BloomFilter(s['capacity'], s['error_rate'], count=s['count'])
+                        bloom.bits = bytearray(f.read(len(bloom.bits)))
+                        if len(bloom.bits) != (bloom.num_bits + 7) // 8:
+                            raise ValueError('truncated file')
+                        slices.append(bloom)
+                    generations.append(ScalableBloomFilter(g['capacity'], g['error_rate'], g['growth'],
+                                                           g['tightening'], g['created'], slices))
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            log.warning("Seen filter not loaded, starting empty: %s", e)
+            return
+        self.generations = generations[:2]
+        self._rotate()
+        log.info("Seen filter loaded: %d entries", sum(g.count for g in self.generations))
+
+    def close(self):
+        self.save()
@@ -2,13 +2,24 @@
 Flask API Server - SSE Enabled
 """
 
+import boot
+import atexit
+import logs
+import metrics
 import os
 import json
 import time
 from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
-from instagram_scraper import InstagramScraper
+from driver_pool import DriverPool
+from checkpoint import CheckpointStore, CrawlInterrupted, CrawlState
+from coalesce import FilteredView, search_key
+from jobs import JobManager
+from journal import JournalStore, parse_event_id
+from profile_cache import ProfileCache
+from seen_filter import SeenFilter
+from session_store import SessionStore
 
 # Load environment variables
 load_dotenv()
@@ -22,66 +33,498 @@ INSTAGRAM_USERNAME = os.getenv('INSTAGRAM_USERNAME', '')
 INSTAGRAM_PASSWORD = os.getenv('INSTAGRAM_PASSWORD', '')
 PROXY_URL = os.getenv('PROXY_URL', None)
 HEADLESS = os.getenv('HEADLESS', 'false').lower() == 'true'
+# Site the scraper talks to; point it at a local stand-in (see benchmarks/standin.py) to run offline
+INSTAGRAM_BASE_URL = os.getenv('INSTAGRAM_BASE_URL', 'https://www.instagram.com')
+# Cookie jar the browsers log in with
+COOKIES_FILE = os.getenv('COOKIES_FILE') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'selenium_cookies.pkl')
+# Seconds a validated session is trusted before it is probed again (0 checks it on every browser start)
+SESSION_TTL = float(os.getenv('SESSION_TTL', 1800))
+# Persistent Chrome user-data directories, one per browser, reused across runs (empty = fresh profile each launch)
+CHROME_PROFILE_DIR = os.getenv('CHROME_PROFILE_DIR', '')
+# Lean browsing: no images / video / fonts / trackers and eager page loads (text, counts and attributes are all we read)
+LEAN_BROWSING = os.getenv('LEAN_BROWSING', 'true').lower() == 'true'
+# Comma-separated DevTools URL patterns blocked in lean mode (empty = built-in list)
+LEAN_BLOCKED_URLS = [u.strip() for u in os.getenv('LEAN_BLOCKED_URLS', '').split(',') if u.strip()]
+# Read profile counts over plain HTTP first; the browser is only used when needed
+HTTP_EXTRACT = os.getenv('HTTP_EXTRACT', 'true').lower() == 'true'
+# How tags are crawled: 'harvest' reads the grid in bulk and resolves post owners in batches, 'modal' clicks through posts
+CRAWL_MODE = os.getenv('CRAWL_MODE', 'harvest').lower()
+HARVEST_BATCH_SIZE = int(os.getenv('HARVEST_BATCH_SIZE', 12))
+# Grid posts considered per tag in harvest mode (modal mode steps through 30)
+HARVEST_MAX_POSTS = int(os.getenv('HARVEST_MAX_POSTS', 60))
+# Parallel post-page fetches per profile when computing engagement over HTTP
+ENGAGEMENT_CONCURRENCY = int(os.getenv('ENGAGEMENT_CONCURRENCY', 4))
+# Persistent profile store so repeat searches skip re-analysis (empty path disables it)
+PROFILE_CACHE_PATH = os.getenv('PROFILE_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profile_cache.db'))
+# Skip accounts rejected under the same filters by any search in the last window (empty path disables it)
+SEEN_FILTER_PATH = os.getenv('SEEN_FILTER_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seen_filter.bin'))
+SEEN_FILTER_WINDOW = float(os.getenv('SEEN_FILTER_WINDOW', 24 * 3600))
+SEEN_FILTER_ERROR_RATE = float(os.getenv('SEEN_FILTER_ERROR_RATE', 0.001))
+SEEN_FILTER_CAPACITY = int(os.getenv('SEEN_FILTER_CAPACITY', 100000))
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', 2))
+DRIVER_POOL_MAX = int(os.getenv('DRIVER_POOL_MAX', DRIVER_POOL_SIZE))
+DRIVER_LEASE_TIMEOUT = float(os.getenv('DRIVER_LEASE_TIMEOUT', 60))
+# Extra browsers per search that analyze profiles while the main one crawls tags (0 = serial)
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', 0))
+# Browsers crawling a multi-tag search's tags concurrently (1 = one tag at a time)
+TAG_CRAWLERS = int(os.getenv('TAG_CRAWLERS', 1))
+# How crawlers share tags: round_robin (even slices) or yield (tags with more matches get more slices)
+TAG_SCHEDULER = os.getenv('TAG_SCHEDULER', 'round_robin').lower()
+# Grid posts a crawler takes from a tag before handing it back when tags outnumber crawlers
+TAG_SLICE_POSTS = int(os.getenv('TAG_SLICE_POSTS', 12))
+# Emit profiles once followers/bio pass, then stream country / engagement as profile_update events
+PROGRESSIVE = os.getenv('PROGRESSIVE', 'true').lower() == 'true'
+# Background job workers (searches submitted via POST /api/jobs) and finished jobs kept for lookup
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 1))
+JOB_HISTORY = int(os.getenv('JOB_HISTORY', 100))
+# Per-search event journals for Last-Event-ID replay (empty path keeps them in memory only)
+JOURNAL_DIR = os.getenv('JOURNAL_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'journals'))
+JOURNAL_RETENTION = float(os.getenv('JOURNAL_RETENTION', 24 * 3600))
+# Seconds a /api/stream search keeps running with no viewer connected, waiting for a reconnect
+STREAM_GRACE_SECONDS = float(os.getenv('STREAM_GRACE_SECONDS', 30))
+# Crawl progress snapshots for automatic restart and POST /api/jobs/<id>/resume (empty path disables them)
+CHECKPOINT_DIR = os.getenv('CHECKPOINT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checkpoints'))
+CHECKPOINT_INTERVAL = float(os.getenv('CHECKPOINT_INTERVAL', 5))
+CHECKPOINT_RETENTION = float(os.getenv('CHECKPOINT_RETENTION', 24 * 3600))
+# Browser restarts per search before giving up (progress is kept either way)
+CHECKPOINT_MAX_RESTARTS = int(os.getenv('CHECKPOINT_MAX_RESTARTS', 2))
+# Identical concurrent /api/stream searches share one crawl
+COALESCE = os.getenv('COALESCE', 'true').lower() == 'true'
+# Narrower filter sets join a broader crawl; off by default, the crawl stops at its own budget so they can come up short
+COALESCE_OVERLAP = os.getenv('COALESCE_OVERLAP', 'false').lower() == 'true'
+# Listen immediately; defer Selenium import, driver resolution and pool warm-up to the first search
+FAST_BOOT = os.getenv('FAST_BOOT', 'false').lower() == 'true'
+# Console log level (DEBUG, INFO, WARN, ERROR) and format: text, or json (one object per line) for log shippers
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+# Records (DEBUG included) kept in memory per search, printed when it fails and served at /api/jobs/<id>/logs (0 disables)
+LOG_BUFFER = int(os.getenv('LOG_BUFFER', 500))
+# Console DEBUG sampling: each call site prints its first LOG_SAMPLE_BURST lines, then one in LOG_SAMPLE_EVERY
+LOG_SAMPLE_BURST = int(os.getenv('LOG_SAMPLE_BURST', 5))
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', 20))
+
+logs.setup(LOG_LEVEL, LOG_FORMAT, buffer_size=LOG_BUFFER, sample_burst=LOG_SAMPLE_BURST, sample_every=LOG_SAMPLE_EVERY)
+log = logs.get_logger('server')
+
+profile_cache = ProfileCache(PROFILE_CACHE_PATH) if PROFILE_CACHE_PATH else None
+seen_filter = SeenFilter(
+    SEEN_FILTER_PATH,
+    window=SEEN_FILTER_WINDOW,
+    error_rate=SEEN_FILTER_ERROR_RATE,
+    capacity=SEEN_FILTER_CAPACITY
+) if SEEN_FILTER_PATH else None
+if seen_filter:
+    atexit.register(seen_filter.close)
+# Login state shared by every browser: validated once per TTL, injected without page loads
+session_store = SessionStore(COOKIES_FILE, INSTAGRAM_BASE_URL, ttl=SESSION_TTL, profile_dir=CHROME_PROFILE_DIR)
+checkpoints = CheckpointStore(CHECKPOINT_DIR or None, interval=CHECKPOINT_INTERVAL, retention=CHECKPOINT_RETENTION)
+
+_scraper_cls = None
+
+def _scraper_class():
+    """Import the scraper (and Selenium with it) on first use"""
+    global _scraper_cls
+    if _scraper_cls is None:
+        with boot.phase('scraper_import'):
+            from instagram_scraper import InstagramScraper
+        _scraper_cls = InstagramScraper
+    return _scraper_cls
+
+def create_scraper():
+    return _scraper_class()(
+        username=INSTAGRAM_USERNAME,
+        password=INSTAGRAM_PASSWORD,
+        proxy=PROXY_URL,
+        headless=HEADLESS,
+        http_extract=HTTP_EXTRACT,
+        profile_cache=profile_cache,
+        engagement_concurrency=ENGAGEMENT_CONCURRENCY,
+        seen_filter=seen_filter,
+        crawl_mode=CRAWL_MODE,
+        harvest_batch=HARVEST_BATCH_SIZE,
+        harvest_max_posts=HARVEST_MAX_POSTS,
+        base_url=INSTAGRAM_BASE_URL,
+        cookies_file=COOKIES_FILE,
+        session_store=session_store,
+        lean=LEAN_BROWSING,
+        blocked_urls=LEAN_BLOCKED_URLS or None
+    )
+
+# Warm browsers shared across searches (DRIVER_POOL_SIZE=0 disables pooling)
+driver_pool = DriverPool(
+    create_scraper,
+    size=DRIVER_POOL_SIZE,
+    max_size=DRIVER_POOL_MAX,
+    lease_timeout=DRIVER_LEASE_TIMEOUT
+) if DRIVER_POOL_SIZE > 0 else None
+
+def release_scraper(scraper):
+    if driver_pool:
+        driver_pool.release(scraper)
+    else:
+        scraper.close()
+
+def open_worker():
+    """Best-effort extra logged-in browser for parallel analysis, or None"""
+    if driver_pool:
+        return driver_pool.acquire(timeout=0)
+    worker = create_scraper()
+    if worker.start_browser() and worker.login():
+        return worker
+    worker.close()
+    return None
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'OK', 'mode': 'SSE'})
 
-@app.route('/api/stream', methods=['GET'])
-def stream_search():
+@app.route('/api/pool', methods=['GET'])
+def pool_stats():
+    if not driver_pool:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **driver_pool.stats()})
+
+@app.route('/api/cache', methods=['GET'])
+def cache_stats():
+    if not profile_cache:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **profile_cache.stats()})
+
+@app.route('/api/seen', methods=['GET'])
+def seen_stats():
+    if not seen_filter:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **seen_filter.stats()})
+
+@app.route('/api/session', methods=['GET'])
+def session_stats():
+    """Last session verdict and how logins went (fast = injected without a page load)"""
+    return jsonify(session_store.stats())
+
+@app.route('/api/startup', methods=['GET'])
+def startup_report():
+    """Cold-start breakdown: server import, scraper import, driver resolution, Chrome launch"""
+    return jsonify({'fast_boot': FAST_BOOT, **boot.report()})
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text format: phase latency histograms and counters, plus pool / job / cache gauges"""
+    jobs = job_manager.list()
+    gauges = {
+        'uptime_seconds': ('Seconds since the server process started', boot.elapsed()),
+        'searches_running': ('Searches currently running', sum(1 for j in jobs if j.status == 'running')),
+        'searches_queued': ('Background jobs waiting for a worker', job_manager.stats()['queued']),
+        'stream_viewers': ('SSE connections attached to a search', sum(j.viewers for j in jobs)),
+    }
+    if driver_pool:
+        pool = driver_pool.stats()
+        gauges['browsers_idle'] = ('Warm pooled browsers waiting for a search', pool['idle'])
+        gauges['browsers_leased'] = ('Pooled browsers in use', pool['leased'])
+    if profile_cache:
+        cache = profile_cache.stats()
+        gauges['profile_cache_entries'] = ('Profiles in the persistent cache', cache['size'])
+        gauges['profile_cache_hit_ratio'] = ('Full cache hits over all lookups', cache['hit_rate'])
+    if seen_filter:
+        gauges['seen_filter_entries'] = ('Rejected accounts remembered by the seen filter', seen_filter.stats()['items'])
+    gauges['log_debug_suppressed'] = ('DEBUG lines dropped from the console by sampling', logs.stats()['suppressed_debug'])
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
+def parse_number(args, name: str, default, convert=int, minimum=0):
+    """Numeric search parameter (empty = default); ValueError naming the parameter when it is not a number"""
+    value = args.get(name, default)
+    if value is None or value == '':
+        return default
+    try:
+        number = convert(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+    if number < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return number
+
+def parse_search(args) -> dict:
     """
-    SSE Endpoint for Real-Time Search
-    Query Params: tags, gender, country, min_followers, max_followers, max_profiles
+    Search parameters from query args or a JSON body; tags as a list or comma-separated string.
+    Raises ValueError for a non-numeric or negative count (the routes answer 400 / an SSE error).
     """
-    def generate():
-        scraper = None
-        try:
-            # Parse Query Params
-            tags = request.args.get('tags', '').split(',')
-            tags = [t.strip() for t in tags if t.strip()]
-            
-            filters = {
-                'gender': request.args.get('gender', 'both'),
-                'country': request.args.get('country', ''),
-                'min_followers': request.args.get('min_followers', 0),
-                'max_followers': request.args.get('max_followers', 1000000000)
-            }
-            max_profiles = int(request.args.get('max_profiles', 20))
-            
-            if not tags:
-                yield f"data: {json.dumps({'type': 'error', 'data': 'No tags provided'})}\n\n"
-                return
+    tags = args.get('tags', '')
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    return {
+        'tags': [t.strip() for t in tags if t and t.strip()],
+        'filters': {
+            'gender': args.get('gender', 'both'),
+            'country': args.get('country', ''),
+            'min_followers': parse_number(args, 'min_followers', 0),
+            'max_followers': parse_number(args, 'max_followers', 1000000000),
+            'min_engagement': parse_number(args, 'min_engagement', 0, float),
+            # Re-check accounts the seen filter would skip
+            'recheck': str(args.get('recheck', '')).lower() in ('1', 'true', 'yes')
+        },
+        'max_profiles': parse_number(args, 'max_profiles', 20, minimum=1)
+    }
 
-            # Initialize Scraper
-            yield f"data: {json.dumps({'type': 'log', 'data': 'Initializing browser...'})}\n\n"
+def _search_once(params: dict, state: CrawlState):
+    """
+    One attempt at a search: leases (or starts) browsers, runs search_tags
+    from `state` and releases everything when exhausted or closed early.
+    CrawlInterrupted propagates after the browsers are released.
+    """
+    scraper = None
+    workers = []
+    crawlers = []
+    enricher = None
+    try:
+        # Initialize Scraper
+        if driver_pool:
+            yield {'type': 'log', 'data': 'Leasing browser from pool...'}
+            scraper = driver_pool.acquire()
+            if not scraper:
+                yield {'type': 'error', 'data': 'No browser available'}
+                return
+        else:
+            yield {'type': 'log', 'data': 'Initializing browser...'}
             
-            scraper = InstagramScraper(
-                username=INSTAGRAM_USERNAME,
-                password=INSTAGRAM_PASSWORD,
-                proxy=PROXY_URL,
-                headless=HEADLESS
-            )
+            scraper = create_scraper()
             
             if not scraper.start_browser():
-                yield f"data: {json.dumps({'type': 'error', 'data': 'Failed to start browser'})}\n\n"
+                yield {'type': 'error', 'data': 'Failed to start browser'}
                 return
                 
             if not scraper.login():
-                yield f"data: {json.dumps({'type': 'error', 'data': 'Login failed'})}\n\n"
+                yield {'type': 'error', 'data': 'Login failed'}
+                return
+        
+        # Analysis workers (each with its own browser)
+        for _ in range(ANALYSIS_WORKERS):
+            worker = open_worker()
+            if not worker:
+                break
+            workers.append(worker)
+        if ANALYSIS_WORKERS and not workers:
+            yield {'type': 'log', 'data': 'No spare browsers, analyzing serially'}
+        
+        # Extra tag crawlers (each with its own browser), never more than there are tags
+        for _ in range(min(TAG_CRAWLERS, len(params['tags'])) - 1):
+            crawler = open_worker()
+            if not crawler:
+                break
+            crawlers.append(crawler)
+        
+        # Serial progressive search: enrich in the background with a spare pooled browser if one is idle
+        if PROGRESSIVE and not workers and not crawlers and driver_pool:
+            enricher = driver_pool.acquire(timeout=0)
+        
+        # Run Search
+        yield from scraper.search_tags(params['tags'], params['filters'], params['max_profiles'], workers=workers,
+                                       progressive=PROGRESSIVE, enrich_with=enricher, state=state,
+                                       crawlers=crawlers, tag_policy=TAG_SCHEDULER, slice_posts=TAG_SLICE_POSTS)
+    finally:
+        for worker in workers + crawlers:
+            release_scraper(worker)
+        if enricher:
+            release_scraper(enricher)
+        if scraper:
+            release_scraper(scraper)
+
+def run_search(params: dict, search_id: str = None):
+    """
+    One search as a generator of event dicts. Progress is checkpointed under
+    `search_id`; when a browser dies mid-search it is replaced and the search
+    resumes from the checkpoint (up to CHECKPOINT_MAX_RESTARTS times).
+    params['resume_from'] continues the checkpoint of an earlier search.
+    """
+    try:
+        if not params['tags']:
+            yield {'type': 'error', 'data': 'No tags provided'}
+            return
+
+        state = checkpoints.load(params['resume_from']) if params.get('resume_from') else None
+        if state:
+            yield {'type': 'log', 'data': f"Resuming search {params['resume_from']} from its checkpoint"}
+            # This search's viewers have not seen them yet
+            for profile in state.profiles.values():
+                yield {'type': 'profile', 'data': dict(profile)}
+        else:
+            state = CrawlState({k: params[k] for k in ('tags', 'filters', 'max_profiles')})
+        checkpoints.track(search_id, state)
+
+        restarts = 0
+        while True:
+            try:
+                yield from _search_once(params, state)
                 return
+            except CrawlInterrupted as e:
+                if restarts >= CHECKPOINT_MAX_RESTARTS:
+                    yield {'type': 'error', 'data': f"{e}; giving up after {restarts} restart(s). "
+                                                    f"Resume with POST /api/jobs/{search_id}/resume"}
+                    return
+                restarts += 1
+                state.restarts += 1
+                log.warning("%s, restarting browser (%d/%d)", e, restarts, CHECKPOINT_MAX_RESTARTS)
+                yield {'type': 'log', 'data': f"{e}. Restarting browser and resuming "
+                                              f"({restarts}/{CHECKPOINT_MAX_RESTARTS})..."}
             
-            # Run Search
-            for event in scraper.search_tags(tags, filters, max_profiles):
-                yield f"data: {json.dumps(event)}\n\n"
-                
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'data': str(e)})}\n\n"
+    except Exception as e:
+        yield {'type': 'error', 'data': str(e)}
+
+# Every search runs here, outside the HTTP connection that started it; viewers tail its journal
+journal_store = JournalStore(JOURNAL_DIR or None, retention=JOURNAL_RETENTION)
+job_manager = JobManager(run_search, workers=JOB_WORKERS, history=JOB_HISTORY,
+                         journals=journal_store, grace=STREAM_GRACE_SECONDS,
+                         coalesce=COALESCE, overlap=COALESCE_OVERLAP)
+
+def sse(event: dict, event_id: str = None) -> str:
+    frame = f"id: {event_id}\n" if event_id else ""
+    return f"{frame}data: {json.dumps(event)}\n\n"
+
+def last_event_id(args) -> tuple:
+    """(search_id, seq) from the Last-Event-ID header an EventSource resends on reconnect, or ?last_event_id="""
+    return parse_event_id(request.headers.get('Last-Event-ID') or args.get('last_event_id'))
+
+def replay(search_id: str, after: int = 0, params: dict = None):
+    """
+    SSE frames of a search from seq `after` on, live until it ends; None if
+    the search is unknown. With `params` of a different (narrower) search,
+    the frames go through that subscriber's FilteredView.
+    """
+    job = job_manager.get(search_id)
+    journal = job.journal if job else journal_store.load(search_id)
+    if not journal:
+        return None
+    view = None
+    if params and params['tags'] and search_key(params) != search_key(job.params if job else params):
+        view = FilteredView(params)
+
+    def generate():
+        if job:
+            job.attach()
+        try:
+            frames = view.filter(journal.tail(), after) if view else journal.tail(after)
+            for item in frames:
+                # Keep-alive comment while the search is quiet
+                yield sse(item[1], item[0]) if item else ": keep-alive\n\n"
+            last = journal.events[-1].get('type') if journal.events else None
+            if not job and last != 'complete':
+                # Cut short by a restart: end the stream for good, or the EventSource reconnects forever
+                seq = journal.last_seq
+                if last != 'error':
+                    seq += 1
+                    yield sse({'type': 'error', 'data': 'Search interrupted (server restarted)'}, journal.event_id(seq))
+                yield sse({'type': 'complete', 'data': 'Search interrupted.'}, journal.event_id(seq + 1))
         finally:
-            if scraper:
-                scraper.close()
-                
-    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+            if job:
+                job.detach()
+
+    return generate()
+
+@app.route('/api/stream', methods=['GET'])
+def stream_search():
+    """
+    SSE Endpoint for Real-Time Search
+    Query Params: tags, gender, country, min_followers, max_followers, min_engagement, max_profiles
+    Reconnects (Last-Event-ID header) or ?search_id= attach to the running search instead of starting one;
+    a search matching one already running joins it
+    """
+    try:
+        params = parse_search(request.args)
+    except ValueError as e:
+        # An EventSource only reads the body of a 200; complete makes the client stop instead of reconnecting
+        frames = sse({'type': 'error', 'data': str(e)}) + sse({'type': 'complete', 'data': 'Search not started.'})
+        return Response(frames, mimetype='text/event-stream')
+    search_id, seq = last_event_id(request.args)
+    if not search_id and request.args.get('search_id'):
+        search_id, seq = request.args['search_id'], 0
+    if search_id:
+        frames = replay(search_id, seq, params)
+        if frames is None:
+            return jsonify({'error': 'Search not found'}), 404
+    else:
+        job = job_manager.start(params)
+        if job.params is params:
+            log.info("Search %s started", job.id)
+        else:
+            log.info("Search joined running search %s (%d shared)", job.id, job.shared)
+        frames = replay(job.id, 0, params)
+
+    return Response(stream_with_context(frames), mimetype='text/event-stream')
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a search; body: {tags, gender, country, min_followers, max_followers, min_engagement, max_profiles}"""
+    try:
+        params = parse_search(request.get_json(silent=True) or request.form)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if not params['tags']:
+        return jsonify({'error': 'No tags provided'}), 400
+    job = job_manager.submit(params)
+    return jsonify(job.to_dict(results=False)), 202
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    return jsonify({**job_manager.stats(), 'items': [job.to_dict(results=False) for job in job_manager.list()]})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>/logs', methods=['GET'])
+def job_logs(job_id):
+    """The search's buffered log records (DEBUG included), oldest first"""
+    if not job_manager.get(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'id': job_id, 'buffer': LOG_BUFFER, 'records': logs.records(job_id)})
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    if not job_manager.cancel(job_id):
+        return jsonify({'error': 'Job not found or already finished'}), 404
+    return jsonify(job_manager.get(job_id).to_dict(results=False))
+
+@app.route('/api/jobs/<job_id>/resume', methods=['POST'])
+def resume_job(job_id):
+    """Queue a new job continuing an interrupted search from its checkpoint"""
+    job = job_manager.get(job_id)
+    if job and not job.done:
+        return jsonify({'error': 'Search is still running'}), 409
+    state = checkpoints.load(job_id)
+    if not state:
+        return jsonify({'error': 'No checkpoint for this search'}), 404
+    if state.finished:
+        return jsonify({'error': 'Search already finished'}), 409
+    job = job_manager.submit(dict(state.params, resume_from=job_id))
+    return jsonify(job.to_dict(results=False)), 202
+
+@app.route('/api/checkpoints', methods=['GET'])
+def list_checkpoints():
+    return jsonify({'items': checkpoints.list()})
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """SSE: every event of the job so far (or after Last-Event-ID), then live ones until it finishes"""
+    search_id, seq = last_event_id(request.args)
+    frames = replay(job_id, seq if search_id == job_id else 0)
+    if frames is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return Response(stream_with_context(frames), mimetype='text/event-stream')
+
+boot.record('server_import', boot.elapsed())
 
 if __name__ == '__main__':
     print(f'Server running on http://localhost:{PORT}')
+    if FAST_BOOT:
+        print('Fast boot: browser setup deferred until the first search')
+    else:
+        try:
+            _scraper_class()
+            boot.resolve_driver_path()
+        except Exception as e:
+            print(f'[ERROR] Driver resolution failed: {e}')
+        if driver_pool:
+            print(f'Warming {DRIVER_POOL_SIZE} browser(s)...')
+            driver_pool.warm_async()
     app.run(host='0.0.0.0', port=PORT, threaded=True)
@@ -0,0 +1,228 @@
+"""
+Session Store - Validated login session shared by every browser (cookie jar + optional Chrome profiles)
+"""
+
+import json
+import os
+import pickle
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+import logs
+from http_extract import USER_AGENT
+
+log = logs.get_logger('session_store')
+
+
+class SessionStore:
+    """
+    The cookie jar browsers log in with, plus what we know about it: when it
+    was last validated, how, and whether it worked. The metadata lives next
+    to the jar (<jar>.session.json), so a restart within `ttl` trusts the
+    session without checking again. Cookies a browser login rotated go to a
+    jar of our own (<jar>.session.pkl), never over the user's, and are used
+    while they are newer than it. Checking is one HTTP request
+    (PROBE_PATH bounces to the login page when the session is dead) instead
+    of a home-page load, a refresh and a wait in Chrome.
+    With `profile_dir`, each browser also gets its own persistent Chrome
+    user-data directory (slot-0, slot-1, ...) so HTTP cache, local storage
+    and the login itself survive between runs.
+    """
+
+    PROBE_PATH = 'accounts/edit/'
+    # Cookies whose expiry bounds the session; an expired one fails validation without a request
+    AUTH_COOKIES = ('sessionid', 'ds_user_id')
+
+    def __init__(self, cookies_file: str, base_url: str = 'https://www.instagram.com', ttl: float = 1800,
+                 profile_dir: str = '', timeout: float = 10):
+        self.cookies_file = cookies_file
+        self.base_url = base_url.rstrip('/')
+        self.ttl = ttl
+        self.profile_dir = profile_dir
+        self.timeout = timeout
+        self._meta_file = f'{cookies_file}.session.json'
+        self.session_file = f'{cookies_file}.session.pkl'
+        self._lock = threading.Lock()
+        # Held while probing, so browsers starting together share one request
+        self._probe_lock = threading.Lock()
+        self._jar: Optional[List[Dict]] = None
+        self._jar_key = None
+        self._leased = set()
+        self._counters = {'probes': 0, 'cached': 0, 'fast_logins': 0, 'browser_logins': 0, 'invalid': 0}
+        self._meta = self._load_meta()
+
+    def _load_meta(self) -> Dict:
+        try:
+            with open(self._meta_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _file_mtime(path: str) -> Optional[float]:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def jar_file(self) -> str:
+        """The rotated jar while it is at least as new as the user's, else the user's (replacing it wins)"""
+        ours, theirs = self._file_mtime(self.session_file), self._file_mtime(self.cookies_file)
+        if ours is not None and (theirs is None or ours >= theirs):
+            return self.session_file
+        return self.cookies_file
+
+    def _mtime(self) -> Optional[float]:
+        return self._file_mtime(self.jar_file())
+
+    def cookies(self) -> List[Dict]:
+        """The jar's cookies (re-read when the file changes); [] when there is none"""
+        path = self.jar_file()
+        key = (path, self._file_mtime(path))
+        with self._lock:
+            if self._jar is None or key != self._jar_key:
+                self._jar, self._jar_key = [], key
+                if key[1] is not None:
+                    try:
+                        with open(path, 'rb') as f:
+                            self._jar = pickle.load(f)
+                    except Exception as e:
+                        log.warning("Could not read cookie jar %s: %s", path, e)
+            return list(self._jar)
+
+    def expires_at(self) -> Optional[float]:
+        """Earliest expiry among the auth cookies (None when they carry none)"""
+        expiries = [float(c['expiry']) for c in self.cookies() if c.get('name') in self.AUTH_COOKIES and c.get('expiry')]
+        return min(expiries) if expiries else None
+
+    def status(self) -> Optional[bool]:
+        """The last verdict while it is within the TTL and the jar is unchanged; None when it needs a probe"""
+        with self._lock:
+            meta = dict(self._meta)
+        if not meta or meta.get('jar_mtime') != self._mtime():
+            return None
+        if time.time() - meta.get('checked_at', 0) > self.ttl:
+            return None
+        expires = self.expires_at()
+        if expires and expires < time.time():
+            return False
+        return meta.get('valid')
+
+    def valid(self) -> Optional[bool]:
+        """
+        Is the jar logged in? Cached verdict when fresh, else one HTTP probe.
+        None when the probe was inconclusive (network error, unexpected
+        status): the caller falls back to logging in through the browser.
+        """
+        known = self.status()
+        if known is not None:
+            self._count('cached')
+            return known
+        with self._probe_lock:
+            # Another browser may have probed while we waited
+            known = self.status()
+            if known is not None:
+                self._count('cached')
+                return known
+            verdict = self.probe()
+            if verdict is not None:
+                self.record(verdict, 'probe')
+            return verdict
+
+    def probe(self) -> Optional[bool]:
+        if self._mtime() is None:
+            return False
+        expires = self.expires_at()
+        if expires and expires < time.time():
+            log.info("Session cookies expired at %s", time.strftime('%Y-%m-%d %H:%M', time.localtime(expires)))
+            return False
+        self._count('probes')
+        started = time.perf_counter()
+        try:
+            resp = requests.get(f'{self.base_url}/{self.PROBE_PATH}', timeout=self.timeout,
+                                headers={'User-Agent': USER_AGENT},
+                                cookies={c['name']: c['value'] for c in self.cookies() if 'name' in c})
+        except requests.RequestException as e:
+            log.warning("Session probe failed: %s", e)
+            return None
+        log.debug("Session probe: %s -> %s in %.2fs", resp.status_code, resp.url, time.perf_counter() - started)
+        if 'accounts/login' in resp.url:
+            return False
+        return True if resp.ok else None
+
+    def record(self, valid: bool, how: str):
+        """Store a verdict (from a probe or a browser login) for the TTL"""
+        meta = {'valid': valid, 'checked_at': time.time(), 'how': how,
+                'jar_mtime': self._mtime(), 'expires_at': self.expires_at()}
+        with self._lock:
+            self._meta = meta
+        if not valid:
+            self._count('invalid')
+        try:
+            tmp = f'{self._meta_file}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp, self._meta_file)
+        except OSError as e:
+            log.warning("Could not save session metadata: %s", e)
+
+    def save_cookies(self, cookies: List[Dict]):
+        """
+        Persist the cookies of a browser that just proved the session good
+        (rotated tokens included) to session_file; the user's jar is left as is
+        """
+        if not cookies:
+            return
+        try:
+            tmp = f'{self.session_file}.tmp'
+            with open(tmp, 'wb') as f:
+                pickle.dump(cookies, f)
+            os.replace(tmp, self.session_file)
+        except OSError as e:
+            log.warning("Could not save cookie jar: %s", e)
+            return
+        self.record(True, 'browser')
+
+    def count_login(self, fast: bool):
+        self._count('fast_logins' if fast else 'browser_logins')
+
+    def lease_profile(self) -> Optional[str]:
+        """A Chrome user-data directory no running browser uses (Chrome locks them), or None without profile_dir"""
+        if not self.profile_dir:
+            return None
+        with self._lock:
+            slot = 0
+            while os.path.join(self.profile_dir, f'slot-{slot}') in self._leased:
+                slot += 1
+            path = os.path.join(self.profile_dir, f'slot-{slot}')
+            self._leased.add(path)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def release_profile(self, path: Optional[str]):
+        with self._lock:
+            self._leased.discard(path)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            meta = dict(self._meta)
+            counters = dict(self._counters)
+            profiles = len(self._leased)
+        checked = meta.get('checked_at')
+        return {
+            **counters,
+            'valid': meta.get('valid'),
+            'validated_by': meta.get('how'),
+            'jar': os.path.basename(self.jar_file()),
+            'checked_seconds_ago': round(time.time() - checked, 1) if checked else None,
+            'expires_at': meta.get('expires_at'),
+            'ttl': self.ttl,
+            'profiles_leased': profiles,
+        }
@@ -11,8 +11,12 @@ if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
+import logs
 from instagram_scraper import InstagramScraper
 
+# Show the scraper's per-step DEBUG lines, unsampled
+logs.setup('DEBUG', buffer_size=0, sample_burst=10**9)
+
 def test_aria_label_extraction():
     """Test country extraction using aria-label approach"""
     
@@ -0,0 +1,97 @@
+"""
+Tests for crawl checkpoints: state round trips, the candidate backlog and how the pipeline resumes it
+Run: python -m pytest test_checkpoint.py
+"""
+
+import pytest
+
+from checkpoint import CheckpointStore, CrawlInterrupted, CrawlState
+from pipeline import AnalysisPipeline
+
+PARAMS = {'tags': ['fitness'], 'filters': {'min_followers': 0, 'max_followers': 1000000}, 'max_profiles': 5}
+
+
+def test_defer_releases_the_username_for_a_resume():
+    state = CrawlState(PARAMS)
+    assert state.claim_seen('alice')
+    assert not state.claim_seen('alice')
+    state.defer('alice', 'fitness')
+    assert state.take_backlog() == [['alice', 'fitness']]
+    assert state.take_backlog() == []
+    assert state.claim_seen('alice')
+
+
+def test_store_round_trip(tmp_path):
+    store = CheckpointStore(str(tmp_path), interval=0)
+    state = store.track('abc123', CrawlState(PARAMS))
+    state.advance('fitness', 7)
+    state.tag_done('travel')
+    state.defer('alice', 'fitness')
+    state.observe({'type': 'profile', 'data': {'username': 'bob', 'followers': 10}})
+    state.observe({'type': 'profile_update', 'data': {'username': 'bob', 'country': 'Japan'}})
+
+    loaded = store.load('abc123')
+    assert loaded.position('fitness') == 7
+    assert loaded.tags_done == ['travel']
+    assert loaded.backlog == [['alice', 'fitness']]
+    assert loaded.profiles['bob']['country'] == 'Japan'
+    assert loaded.remaining == 4
+    assert store.load('../etc') is None
+
+
+class FakeScraper:
+    """Checks usernames from a script: 'match', 'reject' or 'die' (browser lost)"""
+    crawl_mode = 'harvest'
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.checked = []
+        self.alive = True
+        self.rejection_reason = 'test'
+
+    def _check_username(self, username, plan, tag, enrich=True):
+        self.checked.append(username)
+        outcome = self.outcomes.get(username, 'reject')
+        if outcome == 'die':
+            self.alive = False
+            return None
+        return {'username': username, 'tags_matched': [tag]} if outcome == 'match' else None
+
+    def is_alive(self):
+        return self.alive
+
+    def command_summary(self):
+        return ''
+
+
+def resume(scraper, backlog, max_profiles=5):
+    state = CrawlState({**PARAMS, 'max_profiles': max_profiles})
+    for username in backlog:
+        state.defer(username, 'fitness')
+    pipeline = AnalysisPipeline(scraper, [], PARAMS['filters'], max_profiles, state=state)
+    return state, pipeline.run([])
+
+
+def test_backlog_is_checked_first_and_emptied():
+    scraper = FakeScraper({'b': 'match'})
+    state, events = resume(scraper, ['a', 'b', 'c'])
+    profiles = [e['data']['username'] for e in events if e['type'] == 'profile']
+    assert scraper.checked == ['a', 'b', 'c'] and profiles == ['b']
+    assert state.backlog == []
+
+
+def test_lost_browser_defers_each_unchecked_candidate_once():
+    scraper = FakeScraper({'b': 'die'})
+    state, events = resume(scraper, ['a', 'b', 'c'])
+    with pytest.raises(CrawlInterrupted):
+        list(events)
+    assert scraper.checked == ['a', 'b']
+    assert state.backlog == [['b', 'fitness'], ['c', 'fitness']]
+
+
+def test_budget_reached_defers_the_rest_once():
+    scraper = FakeScraper({'a': 'match'})
+    state, events = resume(scraper, ['a', 'b', 'c'], max_profiles=1)
+    list(events)
+    assert scraper.checked == ['a']
+    assert state.backlog == [['b', 'fitness'], ['c', 'fitness']]
@@ -0,0 +1,110 @@
+"""
+Tests for search coalescing: query normalization, coverage and a subscriber's filtered view
+Run: python -m pytest test_coalesce.py
+"""
+
+import threading
+
+from coalesce import FilteredView, covers, search_key
+from jobs import JobManager
+
+
+def search(tags=('fitness',), max_profiles=5, **filters):
+    return {'tags': list(tags), 'filters': {'gender': 'both', 'country': '', 'min_followers': 0,
+                                            'max_followers': 1000000, 'min_engagement': 0, **filters},
+            'max_profiles': max_profiles}
+
+
+def profile(username, followers=5000, pending=(), **fields):
+    return {'username': username, 'followers': followers, 'biography': '', 'tags_matched': ['fitness'],
+            'country': 'Unknown', 'country_code': '', 'engagement_rate': 0, 'avg_likes': 0, 'avg_comments': 0,
+            'pending': list(pending), **fields}
+
+
+def test_search_key_ignores_tag_case_hash_and_order():
+    assert search_key(search(tags=['#Fitness', 'travel'])) == search_key(search(tags=['travel', 'fitness']))
+    assert search_key(search(min_followers=1000)) != search_key(search(min_followers=2000))
+
+
+def test_covers_only_narrower_filters_on_the_same_tags():
+    broad = search(min_followers=1000)
+    assert covers(broad, search(min_followers=5000))
+    assert covers(broad, search(min_followers=5000, max_profiles=3))
+    assert not covers(search(min_followers=5000), broad)
+    assert not covers(broad, search(tags=['travel'], min_followers=5000))
+    assert not covers(broad, search(min_followers=5000, max_profiles=10))
+
+
+def test_view_rechecks_profiles_against_its_own_filters():
+    view = FilteredView(search(min_followers=10000, max_profiles=2))
+    assert list(view.feed({'type': 'profile', 'data': profile('small', followers=2000)})) == []
+    out = list(view.feed({'type': 'profile', 'data': profile('big', followers=20000)}))
+    assert [e['data']['username'] for e in out if e['type'] == 'profile'] == ['big']
+
+
+def test_view_holds_pending_profiles_until_their_fields_arrive():
+    view = FilteredView(search(min_engagement=2))
+    assert list(view.feed({'type': 'profile', 'data': profile('alice', pending=['engagement'])})) == []
+    out = list(view.feed({'type': 'profile_update',
+                          'data': {'username': 'alice', 'engagement_rate': 3.5, 'pending': []}}))
+    assert [e['type'] for e in out] == ['profile']
+    assert out[0]['data']['engagement_rate'] == 3.5
+
+    assert list(view.feed({'type': 'profile', 'data': profile('bob', pending=['engagement'])})) == []
+    out = list(view.feed({'type': 'profile_update', 'data': {'username': 'bob', 'engagement_rate': 1, 'pending': []}}))
+    assert out == []
+
+
+def test_view_completes_at_its_own_budget():
+    view = FilteredView(search(max_profiles=1))
+    out = list(view.feed({'type': 'profile', 'data': profile('alice')}))
+    assert out[-1]['type'] == 'complete' and 'shortfall' not in out[-1]
+    assert list(view.feed({'type': 'profile', 'data': profile('bob')})) == []
+
+
+def test_view_reports_a_shortfall_when_the_shared_crawl_ends_first():
+    view = FilteredView(search(min_followers=10000, max_profiles=3))
+    list(view.feed({'type': 'profile', 'data': profile('big', followers=20000)}))
+    list(view.feed({'type': 'profile', 'data': profile('small', followers=2000)}))
+    out = list(view.feed({'type': 'complete', 'data': 'Search finished. Found 2 profiles.'}))
+    assert out[-1]['type'] == 'complete'
+    assert out[-1]['shortfall'] == 2
+    assert 'Found 1 profiles' in out[-1]['data']
+
+
+def _blocking_manager(**kwargs):
+    release = threading.Event()
+
+    def runner(params, search_id):
+        release.wait(5)
+        yield {'type': 'complete', 'data': 'done'}
+
+    return JobManager(runner, grace=60, **kwargs), release
+
+
+def test_identical_searches_share_a_crawl():
+    manager, release = _blocking_manager()
+    try:
+        first = manager.start(search(min_followers=1000))
+        assert manager.start(search(tags=['#FITNESS'], min_followers=1000)) is first
+        assert first.shared == 1
+    finally:
+        release.set()
+
+
+def test_narrower_searches_run_their_own_crawl_by_default():
+    manager, release = _blocking_manager()
+    try:
+        first = manager.start(search(min_followers=1000))
+        assert manager.start(search(min_followers=5000)) is not first
+    finally:
+        release.set()
+
+
+def test_narrower_searches_join_with_overlap():
+    manager, release = _blocking_manager(overlap=True)
+    try:
+        first = manager.start(search(min_followers=1000))
+        assert manager.start(search(min_followers=5000)) is first
+    finally:
+        release.set()
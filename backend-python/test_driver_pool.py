@@ -0,0 +1,66 @@
+"""
+Tests for the driver pool: leasing, reuse and failed browser starts
+Run: python -m pytest test_driver_pool.py
+"""
+
+from driver_pool import DriverPool
+
+
+class FakeScraper:
+    def __init__(self, fail=None):
+        self.fail = fail
+        self.closed = False
+
+    def start_browser(self):
+        if self.fail == 'start':
+            raise RuntimeError('chrome not found')
+        return True
+
+    def login(self):
+        if self.fail == 'login':
+            raise RuntimeError('login page changed')
+        return self.fail != 'logged_out'
+
+    def is_alive(self):
+        return True
+
+    def reset(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+def test_released_scraper_is_reused():
+    pool = DriverPool(FakeScraper, size=1)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    assert pool.stats()['created'] == 1
+
+
+def test_failed_starts_free_their_slot():
+    outcomes = ['start', 'login', 'logged_out', None]
+    created = []
+
+    def factory():
+        created.append(FakeScraper(outcomes.pop(0)))
+        return created[-1]
+
+    pool = DriverPool(factory, size=1, max_size=1, lease_timeout=0.1)
+    for _ in range(3):
+        assert pool.acquire() is None
+    assert pool.stats()['starting'] == 0 and pool.stats()['failed_starts'] == 3
+    assert all(s.closed for s in created)
+    assert pool.acquire() is created[-1]
+
+
+def test_factory_exception_counts_as_a_failed_start():
+    def factory():
+        raise RuntimeError('no display')
+
+    pool = DriverPool(factory, size=1, max_size=1, lease_timeout=0.1)
+    pool.warm()
+    assert pool.acquire() is None
+    stats = pool.stats()
+    assert stats['starting'] == 0 and stats['failed_starts'] == 2
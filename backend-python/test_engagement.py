@@ -0,0 +1,46 @@
+"""
+Tests for engagement: embedded post counters, the shared summary and the scraper's source fallbacks
+Run: python -m pytest test_engagement.py
+"""
+
+from engagement import counts_from_html, summarize
+from instagram_scraper import InstagramScraper
+
+
+def test_counts_pair_likes_with_comments_of_the_same_post():
+    html = ('{"node":{"edge_liked_by":{"count":120},"edge_media_preview_like":{"count":120},'
+            '"edge_media_to_comment":{"count":8}}},{"node":{"like_count":80,"comment_count":2}}')
+    assert counts_from_html(html) == [(120, 8), (80, 2)]
+
+
+def test_summarize_counts_likes_and_comments():
+    summary = summarize([(90, 10), (110, 10)], followers=1000)
+    assert summary == {'avg_likes': 100, 'avg_comments': 10, 'engagement_rate': 11.0}
+    assert summarize([], followers=1000)['engagement_rate'] == 0
+
+
+class NoPosts:
+    """Engine whose bulk sources all come back empty"""
+
+    def compute(self, profile, **sources):
+        self.sources = sources
+        return None
+
+
+def test_modals_are_tried_when_the_snapshot_lists_no_posts():
+    scraper = InstagramScraper()
+    scraper.engagement = NoPosts()
+    scraper._snapshot = {'post_links': [], 'fields': {}, 'country': ''}
+    clicked = []
+
+    def modals(profile):
+        clicked.append(profile['username'])
+        profile.update(summarize([(50, 5)], profile['followers']))
+        return True
+
+    scraper._engagement_from_modals = modals
+    profile = {'username': 'alice', 'followers': 1000, 'avg_likes': 0, 'avg_comments': 0, 'engagement_rate': 0}
+    scraper._calculate_engagement(profile)
+    assert clicked == ['alice']
+    assert scraper.engagement.sources['post_links'] == []
+    assert profile['engagement_rate'] == 5.5
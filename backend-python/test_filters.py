@@ -0,0 +1,81 @@
+"""
+Tests for FilterPlan: active predicates, cheapest-first checks and loading groups on demand
+Run: python -m pytest test_filters.py
+"""
+
+from filters import FilterPlan, GroupCosts, infer_gender
+from profile_cache import BASIC_FIELDS, ENGAGEMENT_FIELDS, field_group
+
+
+def plan(costs=None, **filters):
+    values = {'gender': 'both', 'country': '', 'min_followers': 0, 'max_followers': 1000000, 'min_engagement': 0}
+    return FilterPlan({**values, **filters}, costs=costs or GroupCosts())
+
+
+def profile(**fields):
+    return {'username': 'alice', 'followers': 5000, 'biography': '', 'tags_matched': ['fitness'],
+            'country_code': '', 'engagement_rate': 0, **fields}
+
+
+def test_only_filters_with_values_are_active():
+    assert [p.name for p in plan().predicates] == ['followers']
+    names = [p.name for p in plan(gender='female', country='uk', min_engagement=2).predicates]
+    assert names == ['followers', 'gender', 'country', 'engagement']
+    assert plan(country='uk').filters['country_code'] == 'GB'
+
+
+def test_signature_ignores_inactive_filters():
+    assert plan(country='').signature == plan(gender='both').signature
+    assert plan(min_followers=1000).signature == plan(min_followers='1000').signature
+    assert plan(min_followers=1000).signature != plan(min_followers=2000).signature
+
+
+def test_signature_includes_tags_only_for_tag_dependent_filters():
+    assert plan().signature_for(['fitness']) == plan().signature_for(['travel']) == plan().signature
+    gendered = plan(gender='female')
+    assert gendered.signature_for(['#Fitness']) == gendered.signature_for(['fitness'])
+    assert gendered.signature_for(['fitness']) != gendered.signature_for(['gymboy'])
+
+
+def test_without_load_only_available_fields_are_checked():
+    check = plan(max_followers=1000, country='JP').start(profile())
+    check.add(BASIC_FIELDS)
+    assert 'not in range' in check.run()
+    assert check.groups_needed() == {'country'}
+
+
+def test_groups_load_on_demand_cheapest_first():
+    loaded = []
+    costs = GroupCosts({'basic': 1, 'country': 10, 'engagement': 2})
+    check = plan(costs, country='JP', min_engagement=5).start(profile())
+    check.add(BASIC_FIELDS)
+
+    def load(group):
+        loaded.append(group)
+        check.profile.update({'engagement_rate': 1.0} if group == 'engagement' else {'country_code': 'JP'})
+
+    assert 'below' in check.run(load)
+    # Engagement is cheaper to load than country, and rejecting on it skips the country lookup
+    assert loaded == ['engagement']
+    assert check.seconds_saved() == 10
+
+
+def test_passing_profile_reports_no_groups_needed():
+    check = plan(min_engagement=1).start(profile(engagement_rate=2.5))
+    check.add(BASIC_FIELDS + ENGAGEMENT_FIELDS)
+    assert check.run() is None
+    assert check.groups_needed() == set()
+    assert not check.group_ready('country')
+
+
+def test_fields_map_to_cache_groups():
+    assert field_group('followers') == 'basic'
+    assert field_group('country_code') == 'country'
+    assert field_group('avg_likes') == 'engagement'
+
+
+def test_infer_gender():
+    assert infer_gender('Mom of 2 | coach', []) == 'female'
+    assert infer_gender('', ['gymboy']) == 'male'
+    assert infer_gender('', ['womenfitness']) == 'female'
+    assert infer_gender('Coffee and code', ['travel']) == 'unknown'
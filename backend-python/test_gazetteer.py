@@ -0,0 +1,56 @@
+"""
+Tests for the gazetteer: location text and country filter values to ISO codes
+Run: python -m pytest test_gazetteer.py
+"""
+
+import pytest
+
+from gazetteer import get_gazetteer
+
+
+@pytest.mark.parametrize('text, code', [
+    ('📍 Los Angeles, CA | small business owner', 'US'),
+    ('Account based in United Kingdom', 'GB'),
+    ('London, Ontario', 'CA'),
+    ('Toronto 🇨🇦 → NYC', 'CA'),
+    ('Chef 👨‍🍳 Amman, Jordan', 'JO'),
+    ('Melbourne', 'AU'),
+    ('Melbourne FL', 'US'),
+    ('Melbourne, FL', 'US'),
+    ('Perth, WA', 'AU'),
+    ('London ON', 'CA'),
+    ('Mumbai, IN', 'IN'),
+    ('Springfield, IL', 'US'),
+])
+def test_normalize(text, code):
+    assert get_gazetteer().normalize(text) == code
+
+
+@pytest.mark.parametrize('text', [
+    'la vida loca | us against the world',
+    'mom of 3, fitness & wellness coach',
+    'DM ME',
+    'link in bio, OK',
+])
+def test_no_false_matches(text):
+    assert get_gazetteer().normalize(text) is None
+
+
+@pytest.mark.parametrize('value, code', [
+    ('US', 'US'), ('us', 'US'), ('usa', 'US'), ('United States', 'US'),
+    ('uk', 'GB'), ('UK', 'GB'), ('united kingdom', 'GB'), ('jordan', 'JO'),
+])
+def test_resolve_filter_values(value, code):
+    assert get_gazetteer().resolve(value) == code
+
+
+def test_classify_matches_normalize_line_by_line():
+    gazetteer = get_gazetteer()
+    texts = ['Melbourne FL', 'Perth, WA', 'DM ME', '', 'Dubai based content creator']
+    assert gazetteer.classify(texts) == [gazetteer.normalize(t) for t in texts] == ['US', 'AU', None, None, 'AE']
+
+
+def test_matches_uses_the_resolved_filter():
+    gazetteer = get_gazetteer()
+    assert gazetteer.matches('Account based in United Kingdom', 'uk')
+    assert not gazetteer.matches('Melbourne, FL', 'Australia')
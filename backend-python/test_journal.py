@@ -0,0 +1,76 @@
+"""
+Tests for the event journal: SSE ids, replay after a given event, reloading from disk and failed searches ending with complete
+Run: python -m pytest test_journal.py
+"""
+
+import threading
+
+from jobs import FAILED, JobManager
+from journal import Journal, JournalStore, parse_event_id
+
+
+def test_parse_event_id():
+    assert parse_event_id('abc123:7') == ('abc123', 7)
+    assert parse_event_id('abc123:x') == (None, 0)
+    assert parse_event_id(None) == (None, 0)
+
+
+def test_replay_after_the_last_event_seen():
+    journal = Journal('abc123')
+    for i in range(5):
+        journal.append({'type': 'log', 'data': i})
+    journal.finish()
+    replay = list(journal.tail(after=3))
+    assert replay == [('abc123:4', {'type': 'log', 'data': 3}), ('abc123:5', {'type': 'log', 'data': 4})]
+
+
+def test_tail_follows_live_events_until_finished():
+    journal = Journal('abc123')
+    journal.append({'type': 'log', 'data': 'first'})
+    received = []
+
+    def follow():
+        received.extend(item for item in journal.tail(heartbeat=0.05) if item)
+
+    reader = threading.Thread(target=follow)
+    reader.start()
+    journal.append({'type': 'complete', 'data': 'done'})
+    journal.finish()
+    reader.join(2)
+    assert [event['data'] for _, event in received] == ['first', 'done']
+
+
+def test_store_reloads_a_journal_and_skips_a_torn_line(tmp_path):
+    store = JournalStore(str(tmp_path))
+    journal = store.create('abc123')
+    journal.append({'type': 'profile', 'data': {'username': 'alice'}})
+    journal.append({'type': 'complete', 'data': 'done'})
+    journal.finish()
+    with open(tmp_path / 'abc123.jsonl', 'a', encoding='utf-8') as f:
+        f.write('[3,{"type":"lo')
+
+    loaded = store.load('abc123')
+    assert loaded.finished and loaded.last_seq == 2
+    assert [event['type'] for _, event in loaded.tail()] == ['profile', 'complete']
+    assert store.load('missing') is None
+    assert store.load('../abc123') is None
+
+
+def run(runner):
+    job = JobManager(runner).submit({'tags': ['fitness'], 'filters': {}, 'max_profiles': 5})
+    return job, [event for _, event in filter(None, job.tail(heartbeat=0.05))]
+
+
+def test_failed_job_journal_ends_with_complete():
+    def reports_error(params, search_id):
+        yield {'type': 'log', 'data': 'Starting'}
+        yield {'type': 'error', 'data': 'Login failed'}
+
+    def raises(params, search_id):
+        yield {'type': 'log', 'data': 'Starting'}
+        raise RuntimeError('browser crashed')
+
+    for runner in (reports_error, raises):
+        job, events = run(runner)
+        assert [event['type'] for event in events] == ['log', 'error', 'complete']
+        assert job.status == FAILED
@@ -0,0 +1,63 @@
+"""
+Tests for the profile cache: per-field-group freshness and persistence
+Run: python -m pytest test_profile_cache.py
+"""
+
+import time
+
+from profile_cache import BASIC_FIELDS, ProfileCache, ttls_from_env
+
+PROFILE = {'username': 'alice', 'followers': 5000, 'biography': 'Runner', 'country': 'Japan', 'engagement_rate': 3.2}
+
+
+def test_fields_expire_by_group(tmp_path, monkeypatch):
+    cache = ProfileCache(str(tmp_path / 'cache.db'), ttls={'basic': 100, 'country': 1000, 'engagement': 10})
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    cache.put('alice', PROFILE, ('followers', 'biography', 'country', 'engagement_rate'))
+
+    monkeypatch.setattr(time, 'time', lambda: now + 50)
+    data, fresh = cache.lookup('alice')
+    assert fresh == {'followers', 'biography', 'country'}
+    assert data['followers'] == 5000 and 'engagement_rate' not in data
+
+    monkeypatch.setattr(time, 'time', lambda: now + 500)
+    assert cache.lookup('alice')[1] == {'country'}
+
+
+def test_refreshing_one_group_keeps_the_others(tmp_path, monkeypatch):
+    cache = ProfileCache(str(tmp_path / 'cache.db'), ttls={'basic': 100, 'country': 1000, 'engagement': 10})
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    cache.put('alice', PROFILE, ('followers', 'country'))
+    monkeypatch.setattr(time, 'time', lambda: now + 90)
+    cache.put('alice', dict(PROFILE, followers=6000), ('followers',))
+    monkeypatch.setattr(time, 'time', lambda: now + 150)
+    data, fresh = cache.lookup('alice')
+    assert data == {'followers': 6000, 'country': 'Japan'}
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = ProfileCache(path, ttls={'basic': 100, 'country': 100, 'engagement': 100})
+    cache.put('alice', PROFILE, BASIC_FIELDS)
+    cache.close()
+    data, fresh = ProfileCache(path, ttls={'basic': 100, 'country': 100, 'engagement': 100}).lookup('alice')
+    assert data['biography'] == 'Runner' and 'followers' in fresh
+
+
+def test_purge_drops_rows_past_the_longest_ttl(tmp_path, monkeypatch):
+    cache = ProfileCache(str(tmp_path / 'cache.db'), ttls={'basic': 10, 'country': 20, 'engagement': 10})
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    cache.put('alice', PROFILE, ('followers',))
+    monkeypatch.setattr(time, 'time', lambda: now + 30)
+    assert cache.purge() == 1
+    assert cache.lookup('alice') == ({}, set())
+
+
+def test_ttls_from_env(monkeypatch):
+    monkeypatch.setenv('PROFILE_CACHE_TTLS', 'basic=60, engagement=bad')
+    ttls = ttls_from_env()
+    assert ttls['basic'] == 60
+    assert ttls['engagement'] == 3 * 24 * 3600
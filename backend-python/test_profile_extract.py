@@ -0,0 +1,184 @@
+"""
+Tests for profile field extraction from page HTML, the HTTP-first profile check and the DOM snapshot
+Run: python -m pytest test_profile_extract.py
+"""
+
+import os
+from contextlib import contextmanager
+
+from dom_extract import snapshot_profile
+from instagram_scraper import InstagramScraper
+from profile_cache import BASIC_FIELDS
+from profile_extract import extract_profile, parse_count
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'benchmarks', 'fixtures')
+
+POSTS = ('<script>{"items":[{"like_count": 900, "comment_count": 100},'
+         '{"like_count": 1100, "comment_count": 100}]}</script>')
+
+
+def fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_parse_count_suffixes_and_separators():
+    assert parse_count('1,234') == 1234
+    assert parse_count('12.5K') == 12500
+    assert parse_count('1.2M') == 1200000
+
+
+def test_extract_from_json_ld():
+    found = extract_profile(fixture('profile_ldjson.html'))
+    assert found['followers'] == 46213
+    assert found['full_name'] == 'Jane Doe'
+    assert 'Austin, TX' in found['biography']
+
+
+def test_extract_from_meta_tags():
+    found = extract_profile(fixture('profile_meta.html'))
+    assert found['followers'] == 1200000
+    assert found['posts_count'] == 2048
+
+
+def test_extract_from_embedded_json():
+    found = extract_profile(fixture('profile_shared_data.html'))
+    assert found['followers'] == 8812
+    assert found['is_verified'] is True
+    assert found['biography'].startswith('Tokyo')
+
+
+class FakeFetcher:
+    def __init__(self, html: str):
+        self.html = html
+
+    def fetch_profile(self, username: str) -> str:
+        return self.html
+
+
+class NoPacer:
+    def wait(self):
+        pass
+
+
+def scraper_for(html: str):
+    """Scraper whose profile HTML comes from `html`; records tabs opened and groups loaded in the browser"""
+    scraper = InstagramScraper(http_extract=False)
+    scraper.http_extract = True
+    scraper.pacer = NoPacer()
+    scraper._fetcher = lambda: FakeFetcher(html)
+    scraper.tabs, scraper.loaded = [], []
+
+    @contextmanager
+    def tab(username):
+        scraper.tabs.append(username)
+        yield
+
+    def load(profile, group):
+        scraper.loaded.append(group)
+        if group == 'country':
+            scraper._set_country(profile, 'United States')
+
+    scraper._profile_tab = tab
+    scraper._load_group = load
+    return scraper
+
+
+def filters(**overrides):
+    return {'gender': 'both', 'country': '', 'min_followers': 0, 'max_followers': 1000000,
+            'min_engagement': 0, **overrides}
+
+
+def test_follower_rejection_never_opens_a_tab():
+    scraper = scraper_for(fixture('profile_meta.html'))
+    assert scraper._check_profile('marco', filters(max_followers=100000), 'fitness') is None
+    assert scraper.tabs == []
+
+
+def test_http_fields_are_not_loaded_again_in_the_browser():
+    scraper = scraper_for(fixture('profile_shared_data.html'))
+    profile = scraper._check_profile('aiko', filters(country='US'), 'fitness', enrich=False)
+    assert profile['full_name'] == 'Aiko Tanaka'
+    assert scraper.tabs == ['aiko']
+    assert 'basic' not in scraper.loaded and 'country' in scraper.loaded
+
+
+def test_no_tab_when_the_filters_need_nothing_the_html_lacks():
+    scraper = scraper_for(fixture('profile_ldjson.html').replace('</body>', POSTS + '</body>'))
+    profile = scraper._check_profile('janedoe', filters(min_engagement=1), 'fitness', enrich=False)
+    assert scraper.tabs == []
+    assert profile['avg_likes'] == 1000 and profile['avg_comments'] == 100
+    assert profile['pending'] == ['country']
+
+
+def test_tab_for_engagement_only_when_the_html_has_no_posts():
+    scraper = scraper_for(fixture('profile_ldjson.html'))
+    scraper._check_profile('janedoe', filters(), 'fitness')
+    assert scraper.tabs == ['janedoe']
+    # The open tab also fills is_verified, which this HTML lacks
+    assert scraper.loaded == ['basic', 'country', 'engagement']
+
+
+def with_cache(scraper) -> dict:
+    cached = {}
+    scraper.profile_cache = type('Cache', (), {
+        'lookup': lambda self, username: ({}, set()),
+        'put': lambda self, username, profile, fields: cached.update({f: profile[f] for f in fields}),
+        'record': lambda self, *args: None,
+    })()
+    return cached
+
+
+def test_basic_fields_marked_fresh_from_http():
+    scraper = scraper_for(fixture('profile_shared_data.html'))
+    cached = with_cache(scraper)
+    scraper._check_profile('aiko', filters(), 'fitness', enrich=False)
+    assert set(cached).issuperset(BASIC_FIELDS)
+    assert scraper.tabs == []
+
+
+def test_fields_missing_from_the_html_are_not_cached_as_empty():
+    scraper = scraper_for(fixture('profile_meta.html'))
+    cached = with_cache(scraper)
+    scraper._check_profile('marco', filters(max_followers=5000000), 'fitness', enrich=False)
+    assert 'followers' in cached and 'full_name' in cached
+    assert 'biography' not in cached and 'is_verified' not in cached
+
+
+def test_tab_for_a_basic_field_a_filter_needs_and_the_html_lacks():
+    # No bio in the meta tags: the gender filter cannot run on the HTML alone
+    scraper = scraper_for(fixture('profile_meta.html'))
+    scraper._check_profile('marco', filters(gender='female', max_followers=5000000), 'fitness', enrich=False)
+    assert scraper.tabs == ['marco']
+    assert scraper.loaded[0] == 'basic'
+
+
+def test_unparsed_follower_count_does_not_reject_without_a_tab():
+    html = ('<head><script type="application/ld+json">{"name": "Nina", "interactionStatistic": [{"@type": '
+            '"InteractionCounter", "interactionType": "FollowAction", "userInteractionCount": 0}]}</script></head>')
+    scraper = scraper_for(html)
+    scraper._check_profile('nina', filters(min_followers=1000), 'fitness')
+    assert scraper.tabs == ['nina']
+
+
+class SnapshotDriver:
+    """Returns a canned PROFILE_SCRIPT result and counts script calls"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.scripts = 0
+
+    def execute_script(self, script):
+        self.scripts += 1
+        return self.raw
+
+
+def test_page_weight_comes_with_the_snapshot():
+    driver = SnapshotDriver({'meta': {'og:description': '46K Followers, 970 Following, 734 Posts'}, 'ld': [],
+                             'weight': {'bytes': 2048, 'resources': 12, 'dom_ready_ms': 300}})
+    scraper = InstagramScraper()
+    scraper._snapshot = snapshot_profile(driver)
+    assert scraper._snapshot['fields']['followers'] == 46000
+    scraper._record_page_weight()
+    assert scraper.page_stats['pages'] == 1 and scraper.page_stats['bytes'] == 2048
+    assert driver.scripts == 1
@@ -0,0 +1,112 @@
+"""
+Tests for the seen filter: Bloom membership, generations, persistence and which rejections it remembers
+Run: python -m pytest test_seen_filter.py
+"""
+
+import time
+from contextlib import contextmanager
+
+from filters import FilterPlan
+from instagram_scraper import InstagramScraper
+from seen_filter import SeenFilter
+
+FILTERS = {'gender': 'both', 'country': '', 'min_followers': 0, 'max_followers': 1000000, 'min_engagement': 0}
+
+
+def test_membership_is_scoped_by_filter_set():
+    seen = SeenFilter()
+    seen.add('min=1000', 'Alice')
+    assert seen.seen('min=1000', 'alice')
+    assert not seen.seen('min=5000', 'alice')
+    assert not seen.seen('min=1000', 'bob')
+
+
+def test_grows_past_capacity_without_false_negatives():
+    seen = SeenFilter(capacity=100, error_rate=0.01)
+    names = [f'user{i}' for i in range(1000)]
+    for name in names:
+        seen.add('f', name)
+    assert all(seen.seen('f', name) for name in names)
+    assert seen.stats()['slices'] > 1
+    false_hits = sum(seen.seen('f', f'other{i}') for i in range(2000))
+    assert false_hits < 2000 * 0.02 * 2
+
+
+def test_survives_a_restart(tmp_path):
+    path = str(tmp_path / 'seen.bin')
+    seen = SeenFilter(path, capacity=100)
+    for i in range(300):
+        seen.add('f', f'user{i}')
+    items = seen.stats()['items']
+    seen.close()
+
+    loaded = SeenFilter(path, capacity=100)
+    assert all(loaded.seen('f', f'user{i}') for i in range(300))
+    assert loaded.stats()['items'] == items
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / 'seen.bin'
+    path.write_bytes(b'garbage')
+    seen = SeenFilter(str(path))
+    assert not seen.seen('f', 'alice')
+
+
+def test_entries_are_forgotten_after_two_windows(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    seen = SeenFilter(window=100)
+    seen.add('f', 'alice')
+    monkeypatch.setattr(time, 'time', lambda: now + 150)
+    assert seen.seen('f', 'alice')
+    monkeypatch.setattr(time, 'time', lambda: now + 250)
+    assert not seen.seen('f', 'alice')
+
+
+def scraper_reading(seen, groups):
+    """Scraper whose profile tab yields `groups` ({group: fields}); a group left out fails to load"""
+    scraper = InstagramScraper(seen_filter=seen)
+
+    @contextmanager
+    def tab(username):
+        yield
+
+    def load(profile, group):
+        profile.update(groups.get(group, {}))
+        return group in groups
+
+    scraper._profile_tab = tab
+    scraper._load_group = load
+    return scraper
+
+
+def test_only_rejections_on_fields_read_are_remembered():
+    seen = SeenFilter()
+    plan = FilterPlan({**FILTERS, 'country': 'Japan'})
+    # About modal never loaded: "Country unknown" says nothing about the account
+    scraper = scraper_reading(seen, {'basic': {'followers': 5000}})
+    assert scraper._check_profile('alice', plan, 'fitness') is None
+    assert not seen.seen(plan.signature_for(['fitness']), 'alice')
+
+    scraper = scraper_reading(seen, {'basic': {'followers': 5000}, 'country': {'country_code': 'FR'}})
+    assert scraper._check_profile('alice', plan, 'fitness') is None
+    assert seen.seen(plan.signature_for(['fitness']), 'alice')
+
+
+def test_unparsed_follower_count_is_not_remembered():
+    seen = SeenFilter()
+    plan = FilterPlan({**FILTERS, 'min_followers': 1000})
+    scraper = scraper_reading(seen, {})
+    assert scraper._check_profile('bob', plan, 'fitness') is None
+    assert 'not in range' in scraper.rejection_reason
+    assert not seen.seen(plan.signature_for(['fitness']), 'bob')
+
+
+def test_gender_rejection_is_scoped_to_the_tag():
+    seen = SeenFilter()
+    plan = FilterPlan({**FILTERS, 'gender': 'female'})
+    scraper = scraper_reading(seen, {'basic': {'followers': 5000}})
+    # No bio keywords: the gender is guessed from the tag the account was found under
+    assert scraper._check_profile('carol', plan, 'gymboy') is None
+    assert seen.seen(plan.signature_for(['gymboy']), 'carol')
+    assert scraper._check_profile('carol', plan, 'fitness') is not None
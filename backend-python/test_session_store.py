@@ -0,0 +1,55 @@
+"""
+Tests for the session store: the user's cookie jar, the rotated jar and cached verdicts
+Run: python -m pytest test_session_store.py
+"""
+
+import os
+import pickle
+import time
+
+from session_store import SessionStore
+
+
+def write_jar(path, value: str, mtime: float):
+    with open(path, 'wb') as f:
+        pickle.dump([{'name': 'sessionid', 'value': value}], f)
+    os.utime(path, (mtime, mtime))
+
+
+def test_rotated_cookies_never_overwrite_the_users_jar(tmp_path):
+    jar = str(tmp_path / 'selenium_cookies.pkl')
+    write_jar(jar, 'original', time.time() - 60)
+    store = SessionStore(jar)
+    store.save_cookies([{'name': 'sessionid', 'value': 'rotated'}])
+    with open(jar, 'rb') as f:
+        assert pickle.load(f)[0]['value'] == 'original'
+    assert store.jar_file() == store.session_file
+    assert store.cookies()[0]['value'] == 'rotated'
+    assert store.status() is True
+
+
+def test_a_replaced_user_jar_wins_over_older_rotated_cookies(tmp_path):
+    jar = str(tmp_path / 'selenium_cookies.pkl')
+    write_jar(jar, 'original', time.time() - 60)
+    store = SessionStore(jar)
+    store.save_cookies([{'name': 'sessionid', 'value': 'rotated'}])
+    write_jar(jar, 'fresh login', time.time() + 60)
+    assert store.jar_file() == jar
+    assert store.cookies()[0]['value'] == 'fresh login'
+    # The verdict was about the other jar
+    assert store.status() is None
+
+
+def test_verdict_is_trusted_for_the_ttl_across_restarts(tmp_path):
+    jar = str(tmp_path / 'selenium_cookies.pkl')
+    write_jar(jar, 'original', time.time() - 60)
+    SessionStore(jar, ttl=60).record(True, 'probe')
+    assert SessionStore(jar, ttl=60).status() is True
+    assert SessionStore(jar, ttl=0).status() is None
+
+
+def test_expired_auth_cookie_fails_without_a_request(tmp_path):
+    jar = str(tmp_path / 'selenium_cookies.pkl')
+    with open(jar, 'wb') as f:
+        pickle.dump([{'name': 'sessionid', 'value': 'x', 'expiry': time.time() - 10}], f)
+    assert SessionStore(jar, base_url='http://127.0.0.1:9').probe() is False
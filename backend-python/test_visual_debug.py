@@ -11,9 +11,13 @@ if sys.platform == 'win32':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
+import logs
 from instagram_scraper import InstagramScraper
 from selenium.webdriver.common.by import By
 
+# Show the scraper's per-step DEBUG lines, unsampled
+logs.setup('DEBUG', buffer_size=0, sample_burst=10**9)
+
 def visual_debug():
     """Visual debugging with screenshots"""
     
@@ -0,0 +1,135 @@
+"""
+Waits - DOM readiness conditions with per-step timeouts & central request pacing
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Seconds each step may wait for its readiness condition.
+# Override with WAIT_TIMEOUTS="tag_page=15,about_modal=10"
+STEP_TIMEOUTS = {
+    'login': 10,
+    'tag_page': 10,
+    'grid_scroll': 5,
+    'post_modal': 6,
+    'next_post': 5,
+    'profile_page': 10,
+    'menu': 4,
+    'about_modal': 8,
+    'modal_close': 2,
+    'engagement_post': 4,
+}
+
+
+def _timeouts_from_env() -> Dict[str, float]:
+    timeouts = dict(STEP_TIMEOUTS)
+    for item in os.getenv('WAIT_TIMEOUTS', '').split(','):
+        step, _, value = item.partition('=')
+        try:
+            timeouts[step.strip()] = float(value)
+        except ValueError:
+            continue
+    return timeouts
+
+
+class Pacer:
+    """
+    Minimum spacing between requests to Instagram, shared by every driver in
+    the process. Each request waits until `min_interval` (+ random jitter up
+    to `max_interval`) has passed since the previous one was let through.
+    """
+
+    def __init__(self, min_interval: float = 1.0, max_interval: Optional[float] = None):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval if max_interval is not None else min_interval, min_interval)
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'Pacer':
+        return cls(float(os.getenv('DELAY_MIN_SECONDS', 1)), float(os.getenv('DELAY_MAX_SECONDS', 2)))
+
+    def wait(self):
+        """Block until this caller may send its next request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + random.uniform(self.min_interval, self.max_interval)
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+_default_pacer = None
+_default_pacer_lock = threading.Lock()
+
+
+def default_pacer() -> Pacer:
+    """Process-wide pacer (built lazily so .env has been loaded)"""
+    global _default_pacer
+    with _default_pacer_lock:
+        if _default_pacer is None:
+            _default_pacer = Pacer.from_env()
+        return _default_pacer
+
+
+# Conditions: callables taking the driver, returning a truthy value once ready
+
+def document_ready(driver):
+    return driver.execute_script('return document.readyState') in ('interactive', 'complete')
+
+
+def element_present(*xpaths: str) -> Callable:
+    def _check(driver):
+        for xpath in xpaths:
+            elements = driver.find_elements(By.XPATH, xpath)
+            if elements:
+                return elements[0]
+        return False
+    return _check
+
+
+def element_gone(xpath: str) -> Callable:
+    return lambda driver: not driver.find_elements(By.XPATH, xpath)
+
+
+def url_changed(old_url: str) -> Callable:
+    return lambda driver: driver.current_url != old_url
+
+
+def text_contains(xpath: str, needles: Sequence[str]) -> Callable:
+    """Element text (lower-cased) contains any of `needles` - e.g. a modal whose content swapped"""
+    def _check(driver):
+        for element in driver.find_elements(By.XPATH, xpath):
+            text = (element.text or '').lower()
+            if any(n in text for n in needles):
+                return element
+        return False
+    return _check
+
+
+class Waiter:
+    """Wait on readiness conditions with a per-step timeout instead of fixed sleeps"""
+
+    def __init__(self, driver, timeouts: Optional[Dict[str, float]] = None, poll: float = 0.2):
+        self.driver = driver
+        self.timeouts = timeouts or _timeouts_from_env()
+        self.poll = poll
+
+    def until(self, step: str, condition: Callable, timeout: Optional[float] = None):
+        """Return the condition's value, or None if the step timed out"""
+        timeout = timeout if timeout is not None else self.timeouts.get(step, 5)
+        try:
+            return WebDriverWait(
+                self.driver, timeout, poll_frequency=self.poll,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+            ).until(condition)
+        except TimeoutException:
+            return None
@@ -1,5 +1,6 @@
 let eventSource = null;
 let foundProfiles = [];
+let profileCards = {};
 
 function startSearch(event) {
     event.preventDefault();
@@ -19,6 +20,7 @@ function startSearch(event) {
     document.getElementById('searchBtn').textContent = 'Searching...';
     document.getElementById('exportBtn').disabled = true;
     foundProfiles = [];
+    profileCards = {};
 
     addLog('Starting search...', 'info');
 
@@ -41,9 +43,12 @@ function startSearch(event) {
     const url = `http://localhost:5000/api/stream?${params.toString()}`;
     eventSource = new EventSource(url);
 
+    let lastType = null;
+
     eventSource.onmessage = function (event) {
         try {
             const data = JSON.parse(event.data);
+            lastType = data.type;
 
             if (data.type === 'log') {
                 addLog(data.data, 'info');
@@ -51,6 +56,10 @@ function startSearch(event) {
                 addLog(data.data, 'error');
             } else if (data.type === 'profile') {
                 addProfile(data.data);
+            } else if (data.type === 'profile_update') {
+                updateProfile(data.data);
+            } else if (data.type === 'metrics') {
+                addLog(formatMetrics(data.data), 'info');
             } else if (data.type === 'complete') {
                 addLog(data.data, 'success');
                 stopSearch();
@@ -61,6 +70,12 @@ function startSearch(event) {
     };
 
     eventSource.onerror = function (err) {
+        // The browser retries on its own and resends Last-Event-ID, so the server resumes the same search.
+        // A stream that closed right after an error is a search that failed: there is nothing to resume.
+        if (eventSource && eventSource.readyState === EventSource.CONNECTING && lastType !== 'error') {
+            addLog('Connection dropped, reconnecting...', 'info');
+            return;
+        }
         console.error('EventSource failed:', err);
         addLog('Connection lost or search finished.', 'error');
         stopSearch();
@@ -79,6 +94,17 @@ function stopSearch() {
     }
 }
 
+// "Time: 84.2s - profile_analysis 51.0s (12x), tag_load 9.3s (2x), ... | 12 profile pages (lean): 310 KB avg"
+function formatMetrics(metrics) {
+    const phases = Object.entries(metrics.phases || {})
+        .slice(0, 5)
+        .map(([phase, stat]) => `${phase} ${stat.seconds.toFixed(1)}s (${stat.count}x)`);
+    const pages = metrics.pages && metrics.pages.count
+        ? ` | ${metrics.pages.count} profile pages (${metrics.pages.lean ? 'lean' : 'normal'}): ${metrics.pages.kb_per_page} KB avg`
+        : '';
+    return `Time: ${metrics.seconds.toFixed(1)}s - ${phases.join(', ')}${pages}`;
+}
+
 function addLog(message, type) {
     const panel = document.getElementById('logContent');
     const div = document.createElement('div');
@@ -95,8 +121,27 @@ function addProfile(profile) {
     const grid = document.getElementById('resultsGrid');
     const card = document.createElement('div');
     card.className = 'profile-card';
+    profileCards[profile.username] = card;
+    renderProfileCard(card, profile);
 
-    const engagement = profile.engagement_rate ? `${profile.engagement_rate}% ER` : 'N/A';
+    grid.prepend(card);
+}
+
+// Progressive mode: country / engagement arrive after the card is shown
+function updateProfile(update) {
+    const profile = foundProfiles.find(p => p.username === update.username);
+    const card = profileCards[update.username];
+    if (!profile || !card) return;
+    Object.assign(profile, update);
+    renderProfileCard(card, profile);
+}
+
+function renderProfileCard(card, profile) {
+    const pending = profile.pending || [];
+    const engagement = pending.includes('engagement') ? '…'
+        : profile.engagement_rate ? `${profile.engagement_rate}% ER` : 'N/A';
+    const country = pending.includes('country') ? '📍 …'
+        : profile.country ? `📍 ${profile.country}` : '';
 
     card.innerHTML = `
         <div class="profile-header">
@@ -104,6 +149,7 @@ function addProfile(profile) {
             <div class="profile-info">
                 <h3>@${profile.username}</h3>
                 <p>${profile.full_name || ''}</p>
+                <p>${country}</p>
             </div>
         </div>
         
@@ -132,8 +178,6 @@ function addProfile(profile) {
             <a href="https://instagram.com/${profile.username}" target="_blank" class="btn-link">Open Profile</a>
         </div>
     `;
-
-    grid.prepend(card);
 }
 
 function formatNumber(num) {
@@ -149,7 +193,7 @@ function clearLogs() {
 function exportCSV() {
     if (foundProfiles.length === 0) return;
 
-    const headers = ['Username', 'Full Name', 'Followers', 'Following', 'Posts', 'Engagement Rate', 'Avg Likes', 'Avg Comments', 'Bio', 'Profile URL'];
+    const headers = ['Username', 'Full Name', 'Followers', 'Following', 'Posts', 'Engagement Rate', 'Avg Likes', 'Avg Comments', 'Country', 'Bio', 'Profile URL'];
     const csvContent = [
         headers.join(','),
         ...foundProfiles.map(p => [
@@ -161,6 +205,7 @@ function exportCSV() {
             p.engagement_rate,
             p.avg_likes,
             p.avg_comments,
+            `"${(p.country || '').replace(/"/g, '""')}"`,
             `"${(p.biography || '').replace(/"/g, '""').replace(/\n/g, ' ')}"`,
             `https://instagram.com/${p.username}`
         ].join(','))